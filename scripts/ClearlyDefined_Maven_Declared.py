@@ -1,7 +1,6 @@
-import requests
-
-# ClearlyDefined API base URL
-BASE_URL = "https://api.clearlydefined.io/definitions/maven/mavencentral"
+from clearlydefined_utils.client import ClearlyDefinedClient
+from state_utils.checkpoint import open_checkpoint
+from state_utils.resolution_store import get_store
 
 # Example Maven packages with group, artifact, and version information
 maven_packages = [
@@ -9,35 +8,22 @@ maven_packages = [
     {"group": "org.apache.commons", "artifact": "commons-lang3", "version": "3.12.0"}
 ]
 
-# Function to fetch license information from ClearlyDefined
-def fetch_license_from_clearlydefined(group, artifact, version):
-    # Construct the ClearlyDefined API URL for the Maven package
-    url = f"{BASE_URL}/{group}/{artifact}/{version}"
-    print(f"Fetching URL: {url}")
-    try:
-        # Make the API request
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-
-        # Extract the declared license
-        declared_license = data.get("licensed", {}).get("declared", "No license info available")
-        return declared_license
-
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching license for {artifact}:{version} - {e}")
-        return "Error fetching license info"
-
 # Main function to process all Maven packages
 def get_maven_licenses(packages):
+    # Fetch license info for all packages from ClearlyDefined in batched requests
+    coordinates = [("maven", f"{package['group']}:{package['artifact']}", package["version"]) for package in packages]
+    # Packages resolved on an earlier run (within their TTL) are answered from the state store;
+    # an interrupted run resumes from its checkpoint log
+    with open_checkpoint("clearlydefined-maven-declared") as checkpoint:
+        client = ClearlyDefinedClient(store=get_store(), checkpoint=checkpoint)
+        results = client.get_licenses(coordinates)
+
     licenses = {}
-    for package in packages:
-        group, artifact, version = package["group"], package["artifact"], package["version"]
-        
-        # Fetch license info from ClearlyDefined
-        license_info = fetch_license_from_clearlydefined(group, artifact, version)
-        licenses[f"{group}:{artifact}:{version}"] = license_info
-    
+    for ecosystem, name, version in coordinates:
+        result = results[(ecosystem, name, version)]
+        # Extract the declared license
+        licenses[f"{name}:{version}"] = result.get("error") or result["declared"] or "No license info available"
+
     return licenses
 
 # Fetch and display licenses for all Maven packages
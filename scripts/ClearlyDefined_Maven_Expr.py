@@ -1,7 +1,6 @@
-import requests
-
-# ClearlyDefined API base URL
-BASE_URL = "https://api.clearlydefined.io/definitions/maven/mavencentral"
+from clearlydefined_utils.client import ClearlyDefinedClient
+from state_utils.checkpoint import open_checkpoint
+from state_utils.resolution_store import get_store
 
 # Example Maven packages with group, artifact, and version information
 maven_packages = [
@@ -9,43 +8,22 @@ maven_packages = [
     {"group": "org.apache.commons", "artifact": "commons-lang3", "version": "3.12.0"}
 ]
 
-# Function to fetch license information from ClearlyDefined
-def fetch_discovered_license_expression(group, artifact, version):
-    # Construct the ClearlyDefined API URL for the Maven package
-    url = f"{BASE_URL}/{group}/{artifact}/{version}"
-    print(f"Fetching license information from: {url}")
-    try:
-        # Make the API request
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-
-        print(data)  # Print the full response for debugging
-
-        # Extract the discovered license expressions if available
-        facets = data.get("licensed", {}).get("facets", {})
-        discovered_licenses = facets.get("core", {}).get("discovered", {}).get("expressions", [])
-
-        # Join the expressions with "AND" if there are multiple
-        if discovered_licenses:
-            return " AND ".join(discovered_licenses)
-        else:
-            return "No discovered license expression available"
-
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching license for {artifact}:{version} - {e}")
-        return "Error fetching license info"
-
 # Main function to process all Maven packages
 def get_maven_discovered_licenses(packages):
+    # Fetch discovered license expressions for all packages from ClearlyDefined in batched requests
+    coordinates = [("maven", f"{package['group']}:{package['artifact']}", package["version"]) for package in packages]
+    # Packages resolved on an earlier run (within their TTL) are answered from the state store;
+    # an interrupted run resumes from its checkpoint log
+    with open_checkpoint("clearlydefined-maven-discovered") as checkpoint:
+        client = ClearlyDefinedClient(store=get_store(), checkpoint=checkpoint)
+        results = client.get_licenses(coordinates)
+
     licenses = {}
-    for package in packages:
-        group, artifact, version = package["group"], package["artifact"], package["version"]
-        
-        # Fetch discovered license expression from ClearlyDefined
-        discovered_license_info = fetch_discovered_license_expression(group, artifact, version)
-        licenses[f"{group}:{artifact}:{version}"] = discovered_license_info
-    
+    for ecosystem, name, version in coordinates:
+        result = results[(ecosystem, name, version)]
+        # Multiple discovered expressions are joined with "AND"
+        licenses[f"{name}:{version}"] = result.get("error") or result["discovered"] or "No discovered license expression available"
+
     return licenses
 
 # Fetch and display discovered licenses for all Maven packages
@@ -0,0 +1,82 @@
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from state_utils.checkpoint import CheckpointLog
+
+# A run of ITEM_COUNT items is interrupted after CRASH_FRACTION of them and resumed
+ITEM_COUNT = 1000000
+CRASH_FRACTION = 0.6
+WORKERS = 16
+
+
+def item_key(index):
+    return ("maven", f"org.example.group{index % 1000}:artifact-{index}", f"1.{index % 50}.0")
+
+
+def item_result(index):
+    return {"declared": "Apache-2.0", "discovered": "Apache-2.0 AND MIT" if index % 3 else None}
+
+
+def record_items(checkpoint, indexes, workers=WORKERS):
+    """
+    Records items from a worker pool and returns the sorted per-call record() latencies.
+    """
+    def worker(chunk):
+        latencies = []
+        for index in chunk:
+            start = time.perf_counter()
+            checkpoint.record(item_key(index), item_result(index))
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+    indexes = list(indexes)
+    chunks = [indexes[offset::workers] for offset in range(workers)]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        latencies = [latency for chunk in executor.map(worker, chunks) for latency in chunk]
+    latencies.sort()
+    return latencies
+
+
+def run_benchmark(item_count=ITEM_COUNT):
+    crash_at = int(item_count * CRASH_FRACTION)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "run.jsonl")
+
+        # First run: stopped (as by Ctrl-C) after crash_at items; the log is kept
+        start = time.perf_counter()
+        checkpoint = CheckpointLog(path)
+        latencies = record_items(checkpoint, range(crash_at))
+        recorded = time.perf_counter() - start
+        checkpoint.close()
+        drained = time.perf_counter() - start
+        print(f"Items recorded:       {crash_at} of {item_count} before the interruption")
+        print(f"record() mean / p99:  {sum(latencies) / len(latencies) * 1e6:.1f} / {latencies[int(len(latencies) * 0.99)] * 1e6:.1f} us")
+        print(f"Workers finished in:  {recorded:.2f} s (log drained and closed after {drained:.2f} s)")
+        print(f"fsyncs:               {checkpoint.stats['fsyncs']}")
+        print(f"Log size:             {os.path.getsize(path) / 1e6:.1f} MB")
+
+        # Simulate a crash mid-write: a torn last line must be dropped on replay
+        with open(path, "ab") as log_file:
+            log_file.write(b'[["maven","torn"')
+
+        # Resume: replay the log, then skip completed items
+        start = time.perf_counter()
+        checkpoint = CheckpointLog(path)
+        replayed = time.perf_counter() - start
+        start = time.perf_counter()
+        remaining = [index for index in range(item_count) if item_key(index) not in checkpoint]
+        skipped = time.perf_counter() - start
+        record_items(checkpoint, remaining)
+        checkpoint.close()
+        print(f"Replayed:             {checkpoint.stats['replayed']} items in {replayed:.2f} s")
+        print(f"Skip check:           {item_count} items in {skipped:.2f} s, {len(remaining)} left to run")
+        print(f"Completed after resume: {len(checkpoint.completed) == item_count}")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else ITEM_COUNT)
@@ -0,0 +1,110 @@
+import base64
+import importlib.util
+import json
+import os
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+from http_utils.cache import ResponseCache, set_cache
+from git_utils.graphql_backend import get_licenses_graphql
+
+# Simulated GitHub round-trip time in seconds
+STUB_LATENCY = 0.02
+REPOSITORY_COUNT = 200
+LICENSE_TEXT = "MIT License\n\nCopyright (c) Example\n"
+
+
+class StubGitHubHandler(BaseHTTPRequestHandler):
+    """
+    Local stand-in for the GitHub REST endpoints used by git-tag-basic.py and for the GraphQL endpoint.
+    """
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    calls = 0
+
+    def _send_json(self, data):
+        StubGitHubHandler.calls += 1
+        time.sleep(STUB_LATENCY)
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        base = f"http://127.0.0.1:{self.server.server_port}"
+        tree = re.match(r"/repos/([^/]+)/([^/]+)/git/trees/", self.path)
+        if tree:
+            owner, repo = tree.groups()
+            self._send_json({"tree": [
+                {"path": "README.md", "url": f"{base}/repos/{owner}/{repo}/git/blobs/readme"},
+                {"path": "LICENSE", "url": f"{base}/repos/{owner}/{repo}/git/blobs/license"},
+            ]})
+        elif "/git/blobs/" in self.path:
+            self._send_json({"content": base64.b64encode(LICENSE_TEXT.encode("utf-8")).decode("ascii")})
+        else:
+            self._send_json({"license": {"name": "MIT License", "spdx_id": "MIT"}})
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        variables = payload["variables"]
+        data = {}
+        index = 0
+        while f"owner{index}" in variables:
+            data[f"r{index}"] = {
+                "licenseInfo": {"spdxId": "MIT", "name": "MIT License"},
+                "tagRef": {"target": {"oid": "0" * 40}},
+                "file0": {"text": LICENSE_TEXT},
+                "file1": None, "file2": None, "file3": None,
+            }
+            index += 1
+        self._send_json({"data": data})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def load_rest_script():
+    """
+    Imports git-tag-basic.py (its file name is not a valid module name).
+    """
+    spec = importlib.util.spec_from_file_location("git_tag_basic", os.path.join(SCRIPTS_DIR, "git-tag-basic.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_benchmark():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubGitHubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    repositories = [("owner", f"repo-{i}", "v1.0.0") for i in range(REPOSITORY_COUNT)]
+
+    rest = load_rest_script()
+    rest.GITHUB_API_URL = base_url
+
+    try:
+        set_cache(ResponseCache(path=":memory:"))
+        StubGitHubHandler.calls = 0
+        start = time.perf_counter()
+        for owner, repo, tag in repositories:
+            rest.get_license_from_tag_and_repo(owner, repo, tag, "stub-token")
+        print(f"REST     repos={REPOSITORY_COUNT}  calls={StubGitHubHandler.calls}  elapsed={time.perf_counter() - start:.2f}s")
+
+        StubGitHubHandler.calls = 0
+        start = time.perf_counter()
+        get_licenses_graphql(repositories, "stub-token", graphql_url=f"{base_url}/graphql")
+        print(f"GraphQL  repos={REPOSITORY_COUNT}  calls={StubGitHubHandler.calls}  elapsed={time.perf_counter() - start:.2f}s")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    run_benchmark()
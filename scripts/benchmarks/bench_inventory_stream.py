@@ -0,0 +1,81 @@
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inventory_utils import json_stream
+from inventory_utils.inventory import read_inventory
+
+# Generated CycloneDX SBOM: COMPONENT_COUNT components drawn from UNIQUE_PACKAGES coordinates,
+# each padded with hashes, licenses and a description like real scanner output (~100 MB)
+COMPONENT_COUNT = 120000
+UNIQUE_PACKAGES = 20000
+SEED = 42
+
+PURL_TYPES = ("maven", "npm", "pypi", "nuget")
+
+
+def build_component(rng, index):
+    purl_type = PURL_TYPES[index % len(PURL_TYPES)]
+    name = f"package-{index}"
+    namespace = {"maven": "org.example/", "npm": "%40scope/" if index % 3 == 0 else ""}.get(purl_type, "")
+    return {
+        "type": "library",
+        "bom-ref": f"ref-{rng.getrandbits(64):x}",
+        "name": name,
+        "version": f"1.{index % 50}.0",
+        "purl": f"pkg:{purl_type}/{namespace}{name}@1.{index % 50}.0",
+        "hashes": [{"alg": "SHA-256", "content": f"{rng.getrandbits(256):064x}"} for _ in range(3)],
+        "licenses": [{"license": {"id": "MIT"}}],
+        "description": " ".join(f"word{rng.randint(0, 999)}" for _ in range(40)),
+    }
+
+
+def write_sbom(path, component_count, unique_packages):
+    rng = random.Random(SEED)
+    with open(path, "w", encoding="utf-8") as sbom_file:
+        sbom_file.write('{"bomFormat": "CycloneDX", "specVersion": "1.5", "components": [\n')
+        for index in range(component_count):
+            if index:
+                sbom_file.write(",\n")
+            json.dump(build_component(rng, rng.randrange(unique_packages)), sbom_file)
+        sbom_file.write("\n]}\n")
+
+
+def measure(path):
+    stats = {}
+    tracemalloc.start()
+    start = time.perf_counter()
+    unique = sum(1 for _ in read_inventory([path], stats))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return unique, stats, elapsed, peak
+
+
+def run_benchmark(component_count=COMPONENT_COUNT, unique_packages=UNIQUE_PACKAGES):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bom.cdx.json")
+        write_sbom(path, component_count, unique_packages)
+        size_mb = os.path.getsize(path) / 1e6
+        print(f"SBOM:                 {size_mb:.1f} MB, {component_count} components")
+
+        readers = [("built-in", None)]
+        if json_stream.ijson is not None:
+            readers.insert(0, ("ijson", json_stream.ijson))
+        for label, module in readers:
+            json_stream.ijson = module
+            unique, stats, elapsed, peak = measure(path)
+            print(f"{label} reader:")
+            print(f"  Coordinates:        {stats['read']} read, {stats['duplicates']} duplicates, {unique} unique")
+            print(f"  Throughput:         {size_mb / elapsed:.1f} MB/s ({elapsed:.2f} s)")
+            print(f"  Peak traced memory: {peak / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else COMPONENT_COUNT)
@@ -0,0 +1,91 @@
+import os
+import random
+import sys
+import textwrap
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from license_utils.identify import CORPUS_DIR, LicenseIndex
+
+# Generated LICENSE files: a bundled text with a project copyright line, random line width,
+# an optional missing title and a few altered words; every UNRELATED_EVERY-th file is
+# unrelated text that must not be identified
+FILE_COUNT = 5000
+UNRELATED_EVERY = 10
+TYPO_RATE = 0.02
+SEED = 42
+
+UNRELATED_WORDS = (
+    "install run build the project with make and then configure your environment variables "
+    "before starting the server see docs for details contributions are welcome open an issue"
+).split()
+
+
+def load_corpus():
+    corpus = {}
+    for file_name in sorted(os.listdir(CORPUS_DIR)):
+        with open(os.path.join(CORPUS_DIR, file_name), encoding="utf-8") as license_file:
+            corpus[file_name[:-len(".txt")]] = license_file.read()
+    return corpus
+
+
+def build_file(rng, spdx_id, text):
+    lines = text.strip().splitlines()
+    if rng.random() < 0.5:
+        lines = lines[1:]  # many LICENSE files start straight with the terms
+    words = " ".join(lines).split()
+    for i in range(len(words)):
+        if rng.random() < TYPO_RATE:
+            words[i] = rng.choice(UNRELATED_WORDS)
+    body = textwrap.fill(" ".join(words), width=rng.randint(60, 100))
+    return f"Copyright (c) {rng.randint(1995, 2024)} Example Project {rng.randint(1, 999)}\n\n{body}\n"
+
+
+def build_unrelated(rng):
+    return textwrap.fill(" ".join(rng.choice(UNRELATED_WORDS) for _ in range(rng.randint(50, 400))))
+
+
+def run_benchmark(file_count=FILE_COUNT):
+    rng = random.Random(SEED)
+    corpus = load_corpus()
+    ids = list(corpus)
+
+    files = []
+    for index in range(file_count):
+        if index % UNRELATED_EVERY == 0:
+            files.append((None, build_unrelated(rng)))
+        else:
+            spdx_id = rng.choice(ids)
+            files.append((spdx_id, build_file(rng, spdx_id, corpus[spdx_id])))
+
+    start = time.perf_counter()
+    index = LicenseIndex()
+    build_ms = (time.perf_counter() - start) * 1000
+
+    timings = []
+    correct = 0
+    misses = {}
+    for expected, text in files:
+        start = time.perf_counter()
+        match = index.identify(text)
+        timings.append(time.perf_counter() - start)
+        found = match["spdx_id"] if match else None
+        if found == expected:
+            correct += 1
+        else:
+            misses[(expected, found)] = misses.get((expected, found), 0) + 1
+
+    timings.sort()
+    print(f"Index build:          {build_ms:.1f} ms ({len(index.license_ids)} licenses, {sum(map(len, index.ngrams))} n-grams)")
+    print(f"Files classified:     {len(files)}")
+    print(f"Accuracy:             {correct / len(files):.2%}")
+    print(f"Mean per file:        {sum(timings) / len(timings) * 1000:.3f} ms")
+    print(f"p99 per file:         {timings[int(len(timings) * 0.99)] * 1000:.3f} ms")
+    print(f"Total:                {sum(timings):.2f} s")
+    for (expected, found), count in sorted(misses.items(), key=lambda item: -item[1]):
+        print(f"  misclassified {expected} -> {found}: {count}")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else FILE_COUNT)
@@ -0,0 +1,81 @@
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+# Generated POMs per run; every FALLBACK_EVERY-th one has no <licenses>/<scm> and needs the model
+POM_COUNT = 2000
+FALLBACK_EVERY = 10
+DISTINCT_FALLBACK_FILES = 20
+
+
+class StubChatHandler(BaseHTTPRequestHandler):
+    """
+    Local stand-in for the OpenAI chat completions endpoint that counts the calls it receives.
+    """
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    calls = 0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        StubChatHandler.calls += 1
+        body = json.dumps({
+            "id": "stub",
+            "object": "chat.completion",
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": '{"repository": null, "license": null}'}}],
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def build_pom(index):
+    if index % FALLBACK_EVERY == 0:
+        # Same few files repeat across "versions", as shared POMs do
+        return f"<project><artifactId>bare-{(index // FALLBACK_EVERY) % DISTINCT_FALLBACK_FILES}</artifactId></project>"
+    return (
+        "<project xmlns=\"http://maven.apache.org/POM/4.0.0\">"
+        f"<artifactId>lib-{index}</artifactId>"
+        "<licenses><license><name>Apache-2.0</name></license></licenses>"
+        f"<scm><url>https://github.com/example/lib-{index}</url></scm>"
+        "</project>"
+    )
+
+
+def run_benchmark():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubChatHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["OPENAI_API_BASE"] = f"http://127.0.0.1:{server.server_port}/v1"
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        os.environ["OPENAI_CACHE_PATH"] = os.path.join(cache_dir, "openai_parse_cache")
+        import parse_pom
+
+        try:
+            for run in (1, 2):
+                calls_before = StubChatHandler.calls
+                start = time.perf_counter()
+                for index in range(POM_COUNT):
+                    parse_pom.extract_repository_and_license(build_pom(index), "pom.xml")
+                elapsed = time.perf_counter() - start
+                print(f"run={run}  files={POM_COUNT}  elapsed={elapsed:.2f}s  "
+                      f"model calls={StubChatHandler.calls - calls_before}  "
+                      f"fallback fraction={parse_pom.get_fallback_fraction():.1%}  stats={parse_pom.extraction_stats}")
+        finally:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,65 @@
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+import manager
+from http_utils.cache import ResponseCache, set_cache
+
+# Simulated registry round-trip time in seconds
+STUB_LATENCY = 0.02
+PACKAGE_COUNT = 400
+POOL_SIZES = [1, 4, 16, 64]
+
+
+class StubRegistryHandler(BaseHTTPRequestHandler):
+    """
+    Answers every request with a minimal npm-style version document after a fixed delay.
+    """
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        time.sleep(STUB_LATENCY)
+        body = json.dumps({
+            "name": self.path.strip("/").split("/")[0],
+            "license": "MIT",
+            "repository": {"url": "git+https://github.com/example/example.git"}
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run_benchmark():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubRegistryHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    manager.NPM_BASE_URL = f"http://127.0.0.1:{server.server_port}"
+
+    # Keep benchmark responses out of the shared on-disk cache
+    cache = ResponseCache(path=":memory:")
+    set_cache(cache)
+
+    coordinates = [("npm", f"package-{i}", "1.0.0") for i in range(PACKAGE_COUNT)]
+    try:
+        for pool_size in POOL_SIZES:
+            cache.clear()
+            start = time.perf_counter()
+            resolved = sum(1 for _ in manager.resolve_many(coordinates, max_workers=pool_size, per_host_limit=pool_size))
+            elapsed = time.perf_counter() - start
+            print(f"pool={pool_size:>3}  packages={resolved}  elapsed={elapsed:.2f}s  packages/sec={resolved / elapsed:.1f}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,170 @@
+import json
+
+import requests
+
+from http_utils.cache import get_cache, normalize_url
+from http_utils.client import CLEARLYDEFINED_PROFILE, http_post
+from license_utils.expression import combine_expressions, normalize_expression
+
+CLEARLYDEFINED_API_URL = "https://api.clearlydefined.io"
+
+# Coordinates sent per POST /definitions request
+BATCH_SIZE = 100
+
+
+def build_coordinates(ecosystem, name, version):
+    """
+    Builds the ClearlyDefined coordinates string (type/provider/namespace/name/revision) for a package.
+
+    Args:
+        ecosystem (str): 'maven', 'nuget', 'npm' or 'pypi'.
+        name (str): Package name; "group:artifact" for Maven, "@scope/name" for scoped npm packages.
+        version (str): Package version.
+    """
+    ecosystem = ecosystem.lower()
+    if ecosystem == "maven":
+        group, artifact = name.split(":")
+        return f"maven/mavencentral/{group}/{artifact}/{version}"
+    elif ecosystem == "nuget":
+        return f"nuget/nuget/-/{name}/{version}"
+    elif ecosystem == "npm":
+        namespace, _, package = name.rpartition("/")
+        return f"npm/npmjs/{namespace or '-'}/{package}/{version}"
+    elif ecosystem == "pypi":
+        return f"pypi/pypi/-/{name}/{version}"
+    else:
+        raise ValueError(f"Unsupported ecosystem: {ecosystem}. Supported: maven, nuget, npm, pypi.")
+
+
+def extract_licenses(definition):
+    """
+    Reads the declared license and the discovered license expressions from one definition.
+
+    Returns:
+        dict: {"declared": str or None, "discovered": str or None} with normalized SPDX expressions;
+        multiple discovered expressions are combined with AND (duplicates dropped).
+    """
+    licensed = definition.get("licensed", {})
+    expressions = licensed.get("facets", {}).get("core", {}).get("discovered", {}).get("expressions", [])
+    return {
+        "declared": normalize_expression(licensed.get("declared")),
+        "discovered": combine_expressions(expressions),
+    }
+
+
+def is_empty(licenses):
+    """
+    Tells whether extracted licenses carry no information, as for a package ClearlyDefined has
+    not harvested yet (or does not know); such answers are not kept, so they are asked again.
+    """
+    return licenses.get("declared") is None and licenses.get("discovered") is None
+
+
+class ClearlyDefinedClient:
+    """
+    Looks up ClearlyDefined definitions in batches through POST /definitions.
+
+    Each definition is parsed once and stored in the shared HTTP cache under its
+    GET /definitions/{coordinates} URL, so re-runs only send coordinates not seen recently.
+    With a ResolutionStore, extracted licenses are kept per package as well and packages
+    resolved within their TTL are not looked up at all. Definitions without any license
+    information are not cached or stored. With a CheckpointLog, each batch's results are
+    logged as soon as it returns, and packages already in the log are skipped.
+    """
+    def __init__(self, base_url=CLEARLYDEFINED_API_URL, batch_size=BATCH_SIZE, store=None, checkpoint=None):
+        self.base_url = base_url
+        self.batch_size = batch_size
+        self.store = store
+        self.checkpoint = checkpoint
+
+    def _definition_url(self, coordinates):
+        return normalize_url(f"{self.base_url}/definitions/{coordinates}")
+
+    def fetch_definitions(self, coordinates_list):
+        """
+        Returns {coordinates: definition} for a list of coordinates strings.
+
+        Raises:
+            requests.RequestException: If a batch request fails.
+        """
+        cache = get_cache()
+        definitions = {}
+        missing = []
+        for coordinates in dict.fromkeys(coordinates_list):
+            entry = cache.get(self._definition_url(coordinates))
+            if entry is not None:
+                cache.record("hit")
+                definitions[coordinates] = json.loads(entry["content"])
+            else:
+                missing.append(coordinates)
+
+        for start in range(0, len(missing), self.batch_size):
+            batch = missing[start:start + self.batch_size]
+            response = http_post(f"{self.base_url}/definitions", json=batch, profile=CLEARLYDEFINED_PROFILE)
+            response.raise_for_status()
+            cache.record("downloaded")
+
+            # The service may normalize the case of coordinates in its answer
+            returned = {key.lower(): definition for key, definition in response.json().items()}
+            for coordinates in batch:
+                definition = returned.get(coordinates.lower())
+                if definition is None:
+                    continue
+                definitions[coordinates] = definition
+                if is_empty(extract_licenses(definition)):
+                    continue  # not harvested yet; ask again next time
+                cache.store(self._definition_url(coordinates), json.dumps(definition).encode("utf-8"),
+                            {"Content-Type": "application/json"})
+        return definitions
+
+    def get_licenses(self, packages):
+        """
+        Looks up declared and discovered licenses for many packages at once.
+
+        Args:
+            packages (iterable): (ecosystem, name, version) tuples.
+
+        Returns:
+            dict: {(ecosystem, name, version): {"declared", "discovered"}}. If a batch request
+            fails, its packages map to {"error": message} instead.
+        """
+        results = {}
+        packages = list(dict.fromkeys(packages))
+        if self.store is not None:
+            for package, entry in self.store.get_many("clearlydefined", packages).items():
+                results[package] = entry["result"]
+            packages = [package for package in packages if package not in results]
+        if self.checkpoint is not None:
+            for package in packages:
+                if package in self.checkpoint:
+                    results[package] = self.checkpoint.completed[package]
+
+        pending = [package for package in packages if package not in results]
+        coordinates_by_package = {package: build_coordinates(*package) for package in pending}
+        coordinates_list = list(coordinates_by_package.values())
+
+        for start in range(0, len(coordinates_list), self.batch_size):
+            batch = coordinates_list[start:start + self.batch_size]
+            try:
+                definitions = self.fetch_definitions(batch)
+            except requests.exceptions.RequestException as e:
+                print(f"Error fetching ClearlyDefined definitions - {e}")
+                definitions = None
+
+            for package in pending[start:start + self.batch_size]:
+                coordinates = coordinates_by_package[package]
+                if definitions is None:
+                    results[package] = {"error": "Error fetching license info"}
+                    continue
+                if coordinates in definitions:
+                    results[package] = extract_licenses(definitions[coordinates])
+                else:
+                    results[package] = {"declared": None, "discovered": None}
+                if self.checkpoint is not None:
+                    self.checkpoint.record(package, results[package])
+
+        if self.store is not None:
+            self.store.put_many("clearlydefined", [(package, results[package], "clearlydefined")
+                                                   for package in packages
+                                                   if "error" not in results[package] and not is_empty(results[package])])
+        return results
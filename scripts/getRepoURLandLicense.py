@@ -1,4 +1,5 @@
-import requests
+from git_utils.rate_limit import github_get
+from git_utils.repo_url import get_repo_license, parse_repo_url
 
 # GitHub access token
 github_token = 'token'
@@ -23,7 +24,7 @@ headers = {
 }
 
 # Make the request to GitHub API
-response = requests.get(github_search_url, headers=headers, params=params)
+response = github_get(github_search_url, headers=headers, params=params)
 
 if response.status_code == 200:
     search_results = response.json().get("items", [])
@@ -45,25 +46,20 @@ else:
 
 repository_url = repo_url
 
-# Extract owner and repo name from the URL
-if "github.com" in repository_url:
-    parts = repository_url.strip().split("/")
-    owner = parts[-2]
-    repo = parts[-1]
-
-    # GitHub API URL for license information
-    github_api_url = f"https://api.github.com/repos/{owner}/{repo}/license"
+# Extract owner and repo name from the URL (any form: .git suffix, /tree/master, ...)
+repo_key = parse_repo_url(repository_url)
+if repo_key and repo_key[0] == "github.com":
+    _, owner, repo = repo_key
 
     # Set up headers with the GitHub token
     headers = {
         "Authorization": f"Bearer {github_token}"
     }
 
-    # Step 1: Get the primary license using the GitHub license API
-    response = requests.get(github_api_url, headers=headers)
+    # Step 1: Get the primary license using the GitHub license API (once per repository)
+    data = get_repo_license(repo_key, headers=headers)
 
-    if response.status_code == 200:
-        data = response.json()
+    if data is not None:
         primary_license = data.get("license", {}).get("spdx_id", "No SPDX license info available")
         license_name = data.get("license", {}).get("name", "No license name available")
 
@@ -72,7 +68,7 @@ if "github.com" in repository_url:
 
         # Step 2: Check for multiple license files in the root directory
         contents_url = f"https://api.github.com/repos/{owner}/{repo}/contents/"
-        contents_response = requests.get(contents_url, headers=headers)
+        contents_response = github_get(contents_url, headers=headers)
 
         if contents_response.status_code == 200:
             contents = contents_response.json()
@@ -89,8 +85,7 @@ if "github.com" in repository_url:
         else:
             print("Failed to retrieve repository contents.")
     else:
-        print(f"Failed to retrieve primary license information from GitHub. Status code: {response.status_code}")
-        print(response.text)
+        print("Failed to retrieve primary license information from GitHub.")
 else:
     print("The repository URL is not hosted on GitHub.")
 
@@ -1,5 +1,10 @@
 import requests
 import base64
+from git_utils.rate_limit import github_get
+from license_utils.identify import get_license_name
+
+# GitHub API base URL
+GITHUB_API_URL = 'https://api.github.com'
 
 def get_license_from_tag_and_repo(repo_owner, repo_name, tag, github_token):
     headers = {
@@ -24,11 +29,11 @@ def get_license_at_tag(repo_owner, repo_name, tag, headers):
     Fetches the license content from a specified tag in the GitHub repository.
     """
     # GitHub API URL to get the tree structure for the specific tag
-    url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/git/trees/{tag}?recursive=1"
+    url = f"{GITHUB_API_URL}/repos/{repo_owner}/{repo_name}/git/trees/{tag}?recursive=1"
     
     try:
         # Get the tree structure for the tag
-        response = requests.get(url, headers=headers)
+        response = github_get(url, headers=headers)
         response.raise_for_status()
         tree = response.json().get("tree", [])
 
@@ -38,13 +43,13 @@ def get_license_at_tag(repo_owner, repo_name, tag, headers):
         if license_file:
             # Fetch the license file content using its URL
             license_url = license_file['url']
-            license_response = requests.get(license_url, headers=headers)
+            license_response = github_get(license_url, headers=headers)
             license_response.raise_for_status()
             license_content = license_response.json().get("content", "")
             
             # Decode base64 content
             decoded_content = base64.b64decode(license_content).decode("utf-8")
-            return decoded_content.splitlines()[0]  # Return the first line as the license name
+            return get_license_name(decoded_content)  # SPDX ID if recognised, else the first line
         else:
             return "No LICENSE file found at the specified tag."
     
@@ -55,10 +60,10 @@ def get_license_at_repo(repo_owner, repo_name, headers):
     """
     Fetches the license information at the repository level.
     """
-    url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/license"
+    url = f"{GITHUB_API_URL}/repos/{repo_owner}/{repo_name}/license"
     
     try:
-        response = requests.get(url, headers=headers)
+        response = github_get(url, headers=headers)
         response.raise_for_status()
         license_info = response.json()
         license_name = license_info.get("license", {}).get("name", "No license found at repo level.")
@@ -66,12 +71,18 @@ def get_license_at_repo(repo_owner, repo_name, headers):
     except requests.RequestException as e:
         return f"An error occurred while fetching the license at repo level: {e}"
 
-# Example usage
-repo_owner = "junit-team"
-repo_name = "junit5"
-tag = "r5.10.5"
-github_token = "kk"  # Replace with your GitHub token
+if __name__ == "__main__":
+    # Example usage
+    repo_owner = "junit-team"
+    repo_name = "junit5"
+    tag = "r5.10.5"
+    github_token = "kk"  # Replace with your GitHub token
+
+    licenses = get_license_from_tag_and_repo(repo_owner, repo_name, tag, github_token)
+    print(f"License at tag: {licenses['license_at_tag']}")
+    print(f"License at repo level: {licenses['license_at_repo']}")
 
-licenses = get_license_from_tag_and_repo(repo_owner, repo_name, tag, github_token)
-print(f"License at tag: {licenses['license_at_tag']}")
-print(f"License at repo level: {licenses['license_at_repo']}")
+    # Alternative backend: one GraphQL request covers up to 50 (owner, repo, tag) triples
+    from git_utils.graphql_backend import get_licenses_graphql
+    batch_licenses = get_licenses_graphql([(repo_owner, repo_name, tag)], github_token)
+    print(f"License at tag (GraphQL): {batch_licenses[(repo_owner, repo_name, tag)]['license_at_tag']}")
@@ -1,5 +1,8 @@
 import requests
-import base64
+from http_utils.cache import get_cache_stats
+from git_utils.license_discovery import DEFAULT_EXCLUDES, DEFAULT_MAX_DEPTH, discover_licenses, get_bytes_fetched
+from git_utils.rate_limit import github_get
+from license_utils.identify import get_license_name
 
 def get_licenses_from_tag_and_repo(repo_owner, repo_name, tag, github_token):
     headers = {
@@ -19,33 +22,24 @@ def get_licenses_from_tag_and_repo(repo_owner, repo_name, tag, github_token):
         "license_at_repo": license_at_repo
     }
 
-def get_licenses_at_tag(repo_owner, repo_name, tag, headers):
+def get_licenses_at_tag(repo_owner, repo_name, tag, headers, max_depth=DEFAULT_MAX_DEPTH, excludes=DEFAULT_EXCLUDES):
     """
     Fetches the license contents from a specified tag in the GitHub repository.
     Returns a list of license names or contents if multiple are found.
+
+    The whole tree is searched by default. For a bounded search, pass max_depth=BOUNDED_MAX_DEPTH
+    and excludes=VENDORED_DIRECTORIES: license files deeper than `max_depth` directories or under
+    a directory matching one of `excludes` (vendored dependencies) are then skipped.
     """
-    url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/git/trees/{tag}?recursive=1"
-    
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        tree = response.json().get("tree", [])
+        license_files = discover_licenses(repo_owner, repo_name, tag, headers,
+                                          max_depth=max_depth, excludes=excludes)
 
-        # Find all potential license files
-        license_files = [item for item in tree if "license" in item['path'].lower()]
+        # If multiple license files are found, identify each one (SPDX ID, falling back to its first line)
+        licenses_content = [get_license_name(text) for _, text in license_files if text.strip()]
 
-        # If multiple license files are found, decode and return their contents
-        licenses_content = []
-        for license_file in license_files:
-            license_url = license_file['url']
-            license_response = requests.get(license_url, headers=headers)
-            license_response.raise_for_status()
-            license_content = license_response.json().get("content", "")
-            decoded_content = base64.b64decode(license_content).decode("utf-8")
-            licenses_content.append(decoded_content.splitlines()[0])  # First line as license name/identifier
-            
         return licenses_content if licenses_content else ["No LICENSE file found at the specified tag."]
-    
+
     except requests.RequestException as e:
         return [f"An error occurred while fetching licenses at tag: {e}"]
 
@@ -56,7 +50,7 @@ def get_license_at_repo(repo_owner, repo_name, headers):
     url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/license"
     
     try:
-        response = requests.get(url, headers=headers)
+        response = github_get(url, headers=headers)
         response.raise_for_status()
         license_info = response.json()
         license_name = license_info.get("license", {}).get("name", "No license found at repo level.")
@@ -64,12 +58,17 @@ def get_license_at_repo(repo_owner, repo_name, headers):
     except requests.RequestException as e:
         return f"An error occurred while fetching the license at repo level: {e}"
 
-# Example usage
-repo_owner = "junit-team"
-repo_name = "junit5"
-tag = "r5.10.5"
-github_token = "mmm"  # Replace with your GitHub token
+if __name__ == "__main__":
+    # Example usage
+    repo_owner = "junit-team"
+    repo_name = "junit5"
+    tag = "r5.10.5"
+    github_token = "mmm"  # Replace with your GitHub token
+
+    licenses = get_licenses_from_tag_and_repo(repo_owner, repo_name, tag, github_token)
+    print("Licenses at tag level:", licenses['licenses_at_tag'])
+    print("License at repo level:", licenses['license_at_repo'])
 
-licenses = get_licenses_from_tag_and_repo(repo_owner, repo_name, tag, github_token)
-print("Licenses at tag level:", licenses['licenses_at_tag'])
-print("License at repo level:", licenses['license_at_repo'])
+    # Report how many GitHub calls were answered from cache, revalidated (304) or downloaded
+    print("HTTP cache stats:", get_cache_stats())
+    print("License bytes fetched per repo:", get_bytes_fetched())
@@ -1,10 +1,10 @@
 import requests
-import re
-from collections import Counter
+from git_utils.tag_index import get_tag_index
 
 def get_tag_prefix(repo_owner, repo_name, github_token):
     """
     Fetches tags from a GitHub repo and determines the most common prefix format.
+    All tag pages are fetched once per repo and reused for every version.
 
     Args:
         repo_owner (str): Owner of the GitHub repo.
@@ -14,23 +14,17 @@ def get_tag_prefix(repo_owner, repo_name, github_token):
     Returns:
         str: The most common prefix (like 'v', 'r', or '').
     """
-    url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/tags"
     headers = {
         "Authorization": f"token {github_token}",
         "Accept": "application/vnd.github.v3+json"
     }
 
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        tags = response.json()
-
-        # Extract prefixes (e.g., 'v', 'r', or no prefix)
-        prefixes = [re.match(r"^(v|r)?\d+", tag['name']).group(1) or '' for tag in tags if 'name' in tag]
+        # Prefixes (e.g., 'v', 'r', or no prefix) are counted when the tag index is built
+        tag_index = get_tag_index(repo_owner, repo_name, headers)
 
         # Find the most common prefix
-        most_common_prefix = Counter(prefixes).most_common(1)[0][0]
-        return most_common_prefix
+        return tag_index.most_common_prefix()
 
     except requests.RequestException as e:
         print(f"An error occurred: {e}")
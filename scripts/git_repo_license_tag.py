@@ -1,4 +1,5 @@
 import requests
+from git_utils.rate_limit import github_get
 
 def get_license_for_repo_tag(owner, repo, tag, github_token):
     # GitHub API URL to fetch tags
@@ -9,7 +10,7 @@ def get_license_for_repo_tag(owner, repo, tag, github_token):
     }
     
     # Fetch all tags to get the commit SHA for the specified tag
-    response = requests.get(tags_url, headers=headers)
+    response = github_get(tags_url, headers=headers)
     if response.status_code != 200:
         raise Exception(f"Failed to fetch tags: {response.json().get('message')}")
     
@@ -27,7 +28,7 @@ def get_license_for_repo_tag(owner, repo, tag, github_token):
     license_url = f"https://api.github.com/repos/{owner}/{repo}/contents/LICENSE?ref={tag_commit_sha}"
     
     # Fetch the license content at the tag's commit SHA
-    license_response = requests.get(license_url, headers=headers)
+    license_response = github_get(license_url, headers=headers)
     if license_response.status_code != 200:
         raise Exception(f"Failed to fetch license: {license_response.json().get('message')}")
     
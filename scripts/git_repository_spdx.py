@@ -1,6 +1,13 @@
-import requests
-import base64
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
+from http_utils.cache import get_cache_stats
+from git_utils.blobs import get_blob_cache
+from git_utils.local_clone import LocalClone
+from git_utils.rate_limit import github_get
+from license_utils.expression import normalize_expression
+from license_utils.identify import find_spdx_identifier, identify_license
+from state_utils.checkpoint import open_checkpoint
+from state_utils.resolution_store import get_store
 
 # Replace these variables with your GitHub details
 GITHUB_TOKEN = 'your_github_token'  # Add your GitHub token here
@@ -10,75 +17,145 @@ REPO_NAME = 'repo_name'  # Replace with the repository name
 # GitHub API base URL
 GITHUB_API_URL = 'https://api.github.com'
 
+# Number of tag trees looked up concurrently
+MAX_WORKERS = 16
+
+# Path to a local bare/partial clone of the repository; when set, tags and licenses are read
+# with git cat-file instead of the GitHub API
+REPO_PATH = None
+
 def get_tags():
-    """Fetches tags for the repository."""
-    url = f"{GITHUB_API_URL}/repos/{REPO_OWNER}/{REPO_NAME}/tags"
+    """Fetches all tags for the repository, following the Link header across pages."""
+    url = f"{GITHUB_API_URL}/repos/{REPO_OWNER}/{REPO_NAME}/tags?per_page=100"
     headers = {"Authorization": f"Bearer {GITHUB_TOKEN}"}
-    response = requests.get(url, headers=headers)
-    
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print(f"Failed to fetch tags: {response.status_code}")
-        return []
+    tags = []
+    while url:
+        response = github_get(url, headers=headers)
+        if response.status_code != 200:
+            print(f"Failed to fetch tags: {response.status_code}")
+            break
+        tags.extend(response.json())
+        url = response.links.get("next", {}).get("url")
+    return tags
 
-def get_license_for_tag(tag_sha):
-    """Fetches the license information for a specific commit SHA."""
+def fetch_license_for_tag(tag_sha):
+    """
+    Fetches the license text for a specific commit SHA.
+
+    The license blob is looked up by its SHA in the shared blob cache, so a LICENSE file that
+    did not change between tags is only downloaded once.
+
+    Returns:
+        tuple: (fetched, license_text); fetched is False if the tree, or the LICENSE blob it
+        lists, could not be read, and license_text is None if there is no LICENSE file.
+        Only fetched answers are definite enough to be stored.
+    """
     url = f"{GITHUB_API_URL}/repos/{REPO_OWNER}/{REPO_NAME}/git/trees/{tag_sha}"
     headers = {"Authorization": f"Bearer {GITHUB_TOKEN}"}
-    response = requests.get(url, headers=headers)
+    response = github_get(url, headers=headers)
     
     if response.status_code == 200:
         tree = response.json().get('tree', [])
         for item in tree:
             if item['path'].lower() == 'license':
-                license_url = item['url']
-                license_response = requests.get(license_url, headers=headers)
-                
-                if license_response.status_code == 200:
-                    license_data = license_response.json()
-                    if 'content' in license_data:
-                        # License content is base64 encoded; decode to get the license text
-                        license_text = base64.b64decode(license_data['content']).decode('utf-8')
-                        return license_text
-    else:
-        print(f"Failed to fetch license for SHA {tag_sha}: {response.status_code}")
-    return None
+                license_text = get_blob_cache().get(item['sha'], item['url'], headers=headers)
+                if license_text is None:
+                    # 403 / 5xx / abuse limit on the blob: not the same as having no license
+                    print(f"Failed to fetch the LICENSE blob for SHA {tag_sha}")
+                    return False, None
+                return True, license_text
+        return True, None
+    print(f"Failed to fetch license for SHA {tag_sha}: {response.status_code}")
+    return False, None
+
+def get_license_for_tag(tag_sha):
+    """Fetches the license text for a specific commit SHA, or None if there is none."""
+    return fetch_license_for_tag(tag_sha)[1]
 
 def extract_spdx_expression(license_text):
-    """Parses and extracts SPDX expression from the license text."""
-    spdx_lines = [line for line in license_text.splitlines() if 'SPDX-License-Identifier:' in line]
-    if spdx_lines:
-        # Extract the SPDX identifier
-        spdx_expression = spdx_lines[0].split('SPDX-License-Identifier:')[-1].strip()
-        return spdx_expression
+    """
+    Parses and extracts SPDX expression from the license text.
+
+    An explicit SPDX-License-Identifier line wins; otherwise the text itself is identified
+    against the bundled SPDX license corpus. Either way the result is a normalized expression.
+    """
+    spdx_expression = find_spdx_identifier(license_text)
+    if spdx_expression:
+        return normalize_expression(spdx_expression)
+    match = identify_license(license_text)
+    if match:
+        return normalize_expression(match["spdx_id"])
     return "No SPDX identifier found"
 
-def extract_licenses():
-    tags = get_tags()
+def extract_licenses(max_workers=MAX_WORKERS, repo_path=REPO_PATH, store=None):
+    # Expressions are stored per commit SHA, so only tags that are new (or past their TTL)
+    # since the last run are scanned; the tag list itself is always fetched
+    store = store or get_store()
+    repo = f"{REPO_OWNER}/{REPO_NAME}"
+    expressions_by_text = {}
+
+    # Each scanned tag is appended to a checkpoint log as it finishes, so an interrupted
+    # scan resumes with the tags it had not reached; the log is removed once the scan completes
+    with open_checkpoint(f"git_tags-{REPO_OWNER}-{REPO_NAME}") as checkpoint:
+        def unscanned(tags):
+            stored = store.get_many("git_tags", [("git", repo, tag['commit']['sha']) for tag in tags])
+            done = {coordinate[2] for coordinate in stored} | set(checkpoint.completed)
+            return stored, [sha for sha in dict.fromkeys(tag['commit']['sha'] for tag in tags) if sha not in done]
+
+        def scan(sha, fetch):
+            fetched, license_text = fetch(sha)
+            if not fetched:
+                # The tree or the LICENSE blob could not be read; not checkpointed, so a
+                # resumed or later run retries the tag
+                return "Failed to fetch license"
+            # SPDX expressions are parsed once per distinct license text
+            if license_text:
+                if license_text not in expressions_by_text:
+                    expressions_by_text[license_text] = extract_spdx_expression(license_text)
+                expression = expressions_by_text[license_text]
+            else:
+                expression = "No license file found"
+            checkpoint.record(sha, expression)
+            return expression
+
+        if repo_path:
+            # Offline scan: every tree and blob is streamed through one git cat-file process
+            with LocalClone(repo_path) as clone:
+                tags = clone.get_tags()
+                stored, pending = unscanned(tags)
+                expressions = [scan(sha, clone.fetch_license_for_tag) for sha in pending]
+        else:
+            tags = get_tags()
+            stored, pending = unscanned(tags)
+
+            # Tree lookups are independent per tag; blob downloads are shared through the blob cache
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                expressions = list(executor.map(lambda sha: scan(sha, fetch_license_for_tag), pending))
+
+        # Tags finished by this or an interrupted earlier run go into the resolution store
+        source = "local clone" if repo_path else "github"
+        store.put_many("git_tags", [(("git", repo, sha), expression, source)
+                                    for sha, expression in checkpoint.completed.items()])
+
+    expressions_by_sha = {coordinate[2]: entry["result"] for coordinate, entry in stored.items()}
+    expressions_by_sha.update(checkpoint.completed)
+    expressions_by_sha.update(zip(pending, expressions))
+
     license_expressions = []
-    
     for tag in tags:
-        tag_name = tag['name']
-        tag_sha = tag['commit']['sha']
-        license_text = get_license_for_tag(tag_sha)
-        
-        if license_text:
-            spdx_expression = extract_spdx_expression(license_text)
-            license_expressions.append({
-                'Tag': tag_name,
-                'SPDX License Expression': spdx_expression
-            })
-        else:
-            license_expressions.append({
-                'Tag': tag_name,
-                'SPDX License Expression': "No license file found"
-            })
-    
+        license_expressions.append({
+            'Tag': tag['name'],
+            'SPDX License Expression': expressions_by_sha[tag['commit']['sha']]
+        })
+
     # Convert results to DataFrame for display
     df = pd.DataFrame(license_expressions)
     return df
 
-# Display the result in a DataFrame
-license_df = extract_licenses()
-license_df
+if __name__ == "__main__":
+    # Display the result in a DataFrame
+    license_df = extract_licenses()
+    print("HTTP cache stats:", get_cache_stats())  # cached / revalidated (304) / downloaded
+    print("License blob stats:", get_blob_cache().stats)  # blobs reused by SHA vs downloaded
+    print("Resolution state stats:", get_store().stats)  # tags answered from the store vs scanned
+    print(license_df)
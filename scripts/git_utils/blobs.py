@@ -0,0 +1,71 @@
+import base64
+import threading
+
+from git_utils.rate_limit import github_get
+
+
+class BlobCache:
+    """
+    Content-addressed cache of decoded git blobs, keyed by blob SHA.
+
+    A LICENSE file that is unchanged across hundreds of tags has the same blob SHA in every
+    tree, so it is downloaded and decoded once. Concurrent requests for the same SHA share
+    one fetch.
+    """
+    def __init__(self):
+        self.stats = {"hits": 0, "fetches": 0, "bytes_fetched": 0}
+        self._blobs = {}
+        self._key_locks = {}
+        self._lock = threading.Lock()
+
+    def get(self, sha, url, headers=None, stats=None):
+        """
+        Returns the decoded text of a blob, fetching it from `url` only the first time its SHA is seen.
+        Returns None if the blob cannot be fetched.
+
+        If `stats` is given, its "bytes_fetched" entry is increased by the size of the response
+        whenever this call actually downloads the blob.
+        """
+        with self._lock:
+            if sha in self._blobs:
+                self.stats["hits"] += 1
+                return self._blobs[sha]
+            key_lock = self._key_locks.setdefault(sha, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                if sha in self._blobs:
+                    self.stats["hits"] += 1
+                    return self._blobs[sha]
+
+            response = github_get(url, headers=headers)
+            text = None
+            if response.status_code == 200:
+                content = response.json().get("content", "")
+                # License content is base64 encoded; decode to get the license text
+                text = base64.b64decode(content).decode("utf-8", errors="replace")
+
+            with self._lock:
+                self.stats["fetches"] += 1
+                self.stats["bytes_fetched"] += len(response.content)
+                if stats is not None:
+                    stats["bytes_fetched"] = stats.get("bytes_fetched", 0) + len(response.content)
+                if text is not None:
+                    self._blobs[sha] = text
+                self._key_locks.pop(sha, None)
+        return text
+
+
+_default_blob_cache = None
+_default_blob_cache_lock = threading.Lock()
+
+
+def get_blob_cache():
+    """
+    Returns the process-wide BlobCache, creating it on first use.
+    """
+    global _default_blob_cache
+    with _default_blob_cache_lock:
+        if _default_blob_cache is None:
+            _default_blob_cache = BlobCache()
+        return _default_blob_cache
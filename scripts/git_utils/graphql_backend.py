@@ -0,0 +1,142 @@
+import requests
+
+from git_utils.rate_limit import github_post
+from license_utils.identify import get_license_name
+
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+
+# Repositories per GraphQL request; each one adds a few aliased fields to the query
+BATCH_SIZE = 50
+
+# File names tried (in order) for the LICENSE blob at the tag
+LICENSE_FILE_NAMES = ("LICENSE", "LICENSE.md", "LICENSE.txt", "COPYING")
+
+
+def _repository_fragment(i):
+    """
+    Returns the aliased query fragment for the i-th repository of a batch.
+    """
+    license_files = "\n".join(
+        f"    file{index}: object(expression: $expression{i}_{index}) {{ ... on Blob {{ text }} }}"
+        for index in range(len(LICENSE_FILE_NAMES))
+    )
+    return (
+        f"  r{i}: repository(owner: $owner{i}, name: $name{i}) {{\n"
+        f"    licenseInfo {{ spdxId name }}\n"
+        f"    tagRef: ref(qualifiedName: $tag{i}) {{ target {{ oid ... on Tag {{ target {{ oid }} }} }} }}\n"
+        f"{license_files}\n"
+        f"  }}"
+    )
+
+
+def build_query(repositories):
+    """
+    Builds one aliased GraphQL query (and its variables) covering many (owner, repo, tag) triples.
+    """
+    declarations = []
+    fragments = []
+    variables = {}
+    for i, (owner, repo, tag) in enumerate(repositories):
+        declarations += [f"$owner{i}: String!", f"$name{i}: String!", f"$tag{i}: String!"]
+        variables.update({f"owner{i}": owner, f"name{i}": repo, f"tag{i}": f"refs/tags/{tag}"})
+        for index, file_name in enumerate(LICENSE_FILE_NAMES):
+            declarations.append(f"$expression{i}_{index}: String!")
+            variables[f"expression{i}_{index}"] = f"{tag}:{file_name}"
+        fragments.append(_repository_fragment(i))
+
+    query = f"query({', '.join(declarations)}) {{\n" + "\n".join(fragments) + "\n}"
+    return query, variables
+
+
+def _parse_repository(data, error=None):
+    """
+    Converts one aliased repository result into the shape returned by the REST scripts.
+    A missing result reports the GraphQL error for its alias, if there is one.
+    """
+    if data is None:
+        message = error or "Repository not found or not accessible."
+        return {
+            "license_at_tag": message,
+            "license_at_repo": message,
+            "spdx_id": None,
+            "commit": None,
+            "license_text": None,
+        }
+
+    license_info = data.get("licenseInfo") or {}
+    tag_target = (data.get("tagRef") or {}).get("target") or {}
+    # Annotated tags point at a tag object whose own target is the commit
+    commit = (tag_target.get("target") or {}).get("oid") or tag_target.get("oid")
+
+    license_text = None
+    for index in range(len(LICENSE_FILE_NAMES)):
+        blob = data.get(f"file{index}")
+        if blob and blob.get("text"):
+            license_text = blob["text"]
+            break
+
+    if commit is None:
+        license_at_tag = "Tag not found in the repository."
+    elif license_text is None:
+        license_at_tag = "No LICENSE file found at the specified tag."
+    else:
+        license_at_tag = get_license_name(license_text)
+
+    return {
+        "license_at_tag": license_at_tag,
+        "license_at_repo": license_info.get("name", "No license found at repo level."),
+        "spdx_id": license_info.get("spdxId"),
+        "commit": commit,
+        "license_text": license_text,
+    }
+
+
+def get_licenses_graphql(repositories, github_token=None, batch_size=BATCH_SIZE, graphql_url=GITHUB_GRAPHQL_URL):
+    """
+    Fetches repo-level license info, tag commit and LICENSE text for many repositories,
+    batching up to `batch_size` repositories into one GraphQL request.
+
+    Args:
+        repositories (iterable): (owner, repo, tag) tuples.
+        github_token (str): Token added to the shared pool (optional if GITHUB_TOKENS is set).
+
+    Returns:
+        dict: {(owner, repo, tag): {"license_at_tag", "license_at_repo", "spdx_id", "commit",
+        "license_text"}}. If a batch request fails, or GraphQL rejects the whole query (errors
+        with no data), its entries hold {"error": message}.
+    """
+    requested = list(dict.fromkeys(repositories))
+    # GitHub owner/repo names are case-insensitive, so "JamesNK/Newtonsoft.Json" is queried once
+    unique = list(dict.fromkeys((owner.lower(), repo.lower(), tag) for owner, repo, tag in requested))
+    headers = {"Authorization": f"bearer {github_token}"} if github_token else None
+    results = {}
+
+    for start in range(0, len(unique), batch_size):
+        batch = unique[start:start + batch_size]
+        query, variables = build_query(batch)
+        try:
+            response = github_post(graphql_url, headers=headers, json={"query": query, "variables": variables})
+            response.raise_for_status()
+            payload = response.json()
+        except (requests.RequestException, ValueError) as e:
+            for repository in batch:
+                results[repository] = {"error": f"An error occurred while fetching licenses via GraphQL: {e}"}
+            continue
+
+        errors = payload.get("errors") or []
+        data = payload.get("data")
+        if data is None:
+            message = "; ".join(error.get("message", "Unknown error") for error in errors) or "No data returned"
+            for repository in batch:
+                results[repository] = {"error": f"GraphQL error: {message}"}
+            continue
+
+        # Errors for a single repository are reported against its alias, e.g. path ["r3"]
+        alias_errors = {}
+        for error in errors:
+            path = error.get("path") or []
+            if len(path) == 1:
+                alias_errors.setdefault(path[0], error.get("message"))
+        for i, repository in enumerate(batch):
+            results[repository] = _parse_repository(data.get(f"r{i}"), alias_errors.get(f"r{i}"))
+    return {(owner, repo, tag): results[(owner.lower(), repo.lower(), tag)] for owner, repo, tag in requested}
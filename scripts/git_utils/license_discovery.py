@@ -0,0 +1,173 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatch
+
+from git_utils.blobs import get_blob_cache
+from git_utils.rate_limit import github_get
+
+GITHUB_API_URL = "https://api.github.com"
+
+# Bounded discovery mode, opted into with max_depth=BOUNDED_MAX_DEPTH, excludes=VENDORED_DIRECTORIES:
+# the deepest directory level searched (0 = repository root only) and the directories whose
+# license files belong to vendored dependencies, not the project itself
+BOUNDED_MAX_DEPTH = 3
+VENDORED_DIRECTORIES = ("node_modules", "vendor", "third_party")
+
+# By default the whole tree is searched
+DEFAULT_MAX_DEPTH = None
+DEFAULT_EXCLUDES = ()
+
+# REUSE-style directories holding one file per license (LICENSES/MIT.txt), matched case-insensitively
+LICENSE_DIRECTORIES = ("licenses",)
+
+# Concurrent blob / subtree requests per discovery
+DEFAULT_MAX_WORKERS = 8
+
+
+def is_license_path(path):
+    """
+    Returns True if the path looks like a license file: the file name mentions "license"
+    (LICENSE, LICENSE.md, COPYING.LICENSE, ...) or the file sits in a LICENSES/ directory.
+    """
+    *directories, file_name = path.lower().split("/")
+    return "license" in file_name or any(directory in LICENSE_DIRECTORIES for directory in directories)
+
+
+def path_depth(path):
+    """
+    Returns the directory depth of a path: 0 for "LICENSE", 1 for "docs/LICENSE", ...
+    """
+    return path.count("/")
+
+
+def is_excluded(path, excludes=DEFAULT_EXCLUDES):
+    """
+    Returns True if any directory in the path matches one of the exclude patterns.
+    """
+    directories = path.split("/")[:-1]
+    return any(fnmatch(directory, pattern) for directory in directories for pattern in excludes)
+
+
+class LicenseDiscovery:
+    """
+    Finds and fetches the license files of one repository tree.
+
+    The recursive tree is requested first; if GitHub truncates it, the tree is walked one
+    level at a time instead, never descending into excluded directories or below `max_depth`.
+    Blobs are fetched concurrently through the shared SHA-keyed blob cache.
+    """
+    def __init__(self, repo_owner, repo_name, headers=None, max_depth=DEFAULT_MAX_DEPTH,
+                 excludes=DEFAULT_EXCLUDES, max_workers=DEFAULT_MAX_WORKERS, api_url=GITHUB_API_URL):
+        self.repo_owner = repo_owner
+        self.repo_name = repo_name
+        self.headers = headers
+        self.max_depth = max_depth
+        self.excludes = tuple(excludes)
+        self.max_workers = max_workers
+        self.api_url = api_url
+        self.stats = {"bytes_fetched": 0, "tree_requests": 0, "truncated": False}
+        self._lock = threading.Lock()
+
+    def _get_tree(self, tree_ish, recursive=False):
+        url = f"{self.api_url}/repos/{self.repo_owner}/{self.repo_name}/git/trees/{tree_ish}"
+        if recursive:
+            url += "?recursive=1"
+        response = github_get(url, headers=self.headers)
+        response.raise_for_status()
+        with self._lock:
+            self.stats["tree_requests"] += 1
+            self.stats["bytes_fetched"] += len(response.content)
+        return response.json()
+
+    def _wanted(self, path):
+        if self.max_depth is not None and path_depth(path) > self.max_depth:
+            return False
+        return not is_excluded(path, self.excludes)
+
+    def find_license_files(self, tree_ish):
+        """
+        Returns the blob entries of license files under `tree_ish`, with "path" relative to the root.
+
+        Raises:
+            requests.RequestException: If a tree request fails.
+        """
+        tree = self._get_tree(tree_ish, recursive=True)
+        if not tree.get("truncated"):
+            return [item for item in tree.get("tree", [])
+                    if item["type"] == "blob" and is_license_path(item["path"]) and self._wanted(item["path"])]
+
+        self.stats["truncated"] = True
+        return self._walk(tree_ish)
+
+    def _walk(self, tree_ish):
+        """
+        Breadth-first walk of a truncated tree, fetching each level's subtrees concurrently.
+        """
+        license_files = []
+        level = [("", tree_ish)]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while level:
+                trees = executor.map(lambda entry: self._get_tree(entry[1]), level)
+                next_level = []
+                for (prefix, _), tree in zip(level, trees):
+                    for item in tree.get("tree", []):
+                        path = prefix + item["path"]
+                        if item["type"] == "tree":
+                            if self._wanted(path + "/"):
+                                next_level.append((path + "/", item["sha"]))
+                        elif item["type"] == "blob" and is_license_path(path) and self._wanted(path):
+                            license_files.append(dict(item, path=path))
+                level = next_level
+        return license_files
+
+    def fetch_texts(self, license_files):
+        """
+        Returns the decoded text of each license file, in order. Files sharing a blob SHA are fetched once.
+        """
+        cache = get_blob_cache()
+        blob_stats = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            texts = list(executor.map(
+                lambda item: cache.get(item["sha"], item["url"], headers=self.headers, stats=blob_stats),
+                license_files))
+        self.stats["bytes_fetched"] += blob_stats.get("bytes_fetched", 0)
+        return texts
+
+    def discover(self, tree_ish):
+        """
+        Returns (path, text) pairs for every license file found under `tree_ish`.
+
+        Raises:
+            requests.RequestException: If a tree request fails.
+        """
+        license_files = self.find_license_files(tree_ish)
+        texts = self.fetch_texts(license_files)
+        return [(item["path"], text) for item, text in zip(license_files, texts) if text is not None]
+
+
+_bytes_by_repo = {}
+_bytes_lock = threading.Lock()
+
+
+def discover_licenses(repo_owner, repo_name, tree_ish, headers=None, **options):
+    """
+    Returns (path, text) pairs for the license files of a repository at a tag, branch or tree SHA.
+
+    Keyword options are passed to LicenseDiscovery. Bytes fetched are added to the per-repo totals
+    reported by get_bytes_fetched().
+    """
+    discovery = LicenseDiscovery(repo_owner, repo_name, headers=headers, **options)
+    try:
+        return discovery.discover(tree_ish)
+    finally:
+        with _bytes_lock:
+            key = f"{repo_owner}/{repo_name}"
+            _bytes_by_repo[key] = _bytes_by_repo.get(key, 0) + discovery.stats["bytes_fetched"]
+
+
+def get_bytes_fetched():
+    """
+    Returns {"owner/repo": bytes} for all license discoveries made so far.
+    """
+    with _bytes_lock:
+        return dict(_bytes_by_repo)
@@ -0,0 +1,191 @@
+import subprocess
+import threading
+
+from git_utils.license_discovery import DEFAULT_EXCLUDES, DEFAULT_MAX_DEPTH, is_excluded, is_license_path, path_depth
+from license_utils.identify import get_license_name
+
+# Tree entry modes that denote a subdirectory / a submodule commit
+TREE_MODE = b"40000"
+COMMIT_MODE = b"160000"
+
+
+def parse_tree(data):
+    """
+    Parses a raw git tree object into a list of {"mode", "type", "path", "sha"} entries.
+
+    Each entry is stored as "<mode> <name>\\0<20-byte binary sha>".
+    """
+    entries = []
+    position = 0
+    while position < len(data):
+        space = data.index(b" ", position)
+        nul = data.index(b"\0", space)
+        mode = data[position:space]
+        sha = data[nul + 1:nul + 21].hex()
+        if mode == TREE_MODE:
+            entry_type = "tree"
+        elif mode == COMMIT_MODE:
+            entry_type = "commit"
+        else:
+            entry_type = "blob"
+        entries.append({
+            "mode": mode.decode(),
+            "type": entry_type,
+            "path": data[space + 1:nul].decode("utf-8", errors="replace"),
+            "sha": sha,
+        })
+        position = nul + 21
+    return entries
+
+
+class LocalClone:
+    """
+    Reads tags, trees and license blobs from a local (bare or partial) clone.
+
+    All objects are read through one long-lived `git cat-file --batch` process, so scanning
+    hundreds of tags costs no API calls and no rate limit. In a partial (blobless) clone,
+    git fetches missing blobs from the promisor remote on demand.
+    """
+    def __init__(self, repo_path, git="git"):
+        self.repo_path = repo_path
+        self.git = git
+        self.stats = {"objects_read": 0, "bytes_read": 0, "blob_hits": 0}
+        self._blobs = {}
+        self._process = None
+        self._lock = threading.Lock()
+
+    def _start(self):
+        if self._process is None or self._process.poll() is not None:
+            self._process = subprocess.Popen(
+                [self.git, "-C", self.repo_path, "cat-file", "--batch"],
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            )
+        return self._process
+
+    def read_object(self, name):
+        """
+        Returns (sha, type, content) for any object name git understands ("v1.0^{tree}", a SHA, ...),
+        or None if the object does not exist.
+        """
+        with self._lock:
+            process = self._start()
+            process.stdin.write(name.encode() + b"\n")
+            process.stdin.flush()
+            header = process.stdout.readline()
+            if not header:
+                raise RuntimeError(f"git cat-file exited while reading {name!r} in {self.repo_path}")
+            fields = header.split()
+            if len(fields) != 3:  # "<name> missing" / "<name> ambiguous"
+                return None
+            size = int(fields[2])
+            content = process.stdout.read(size + 1)[:size]  # drop the trailing newline
+            self.stats["objects_read"] += 1
+            self.stats["bytes_read"] += size
+        return fields[0].decode(), fields[1].decode(), content
+
+    def read_tree(self, tree_ish):
+        """
+        Returns the entries of a tree (a tag, commit or tree SHA is peeled to its tree).
+        """
+        obj = self.read_object(f"{tree_ish}^{{tree}}")
+        return parse_tree(obj[2]) if obj else []
+
+    def read_blob_text(self, sha):
+        """
+        Returns the decoded text of a blob; blobs shared between tags are read once.
+        """
+        if sha in self._blobs:
+            self.stats["blob_hits"] += 1
+            return self._blobs[sha]
+        obj = self.read_object(sha)
+        text = obj[2].decode("utf-8", errors="replace") if obj else None
+        if text is not None:
+            self._blobs[sha] = text
+        return text
+
+    def get_tags(self):
+        """
+        Returns the repository's tags in the shape of the GitHub tags API: [{"name", "commit": {"sha"}}].
+        Annotated tags are peeled to the commit they point to.
+        """
+        output = subprocess.run(
+            [self.git, "-C", self.repo_path, "for-each-ref", "refs/tags",
+             "--format=%(refname:strip=2)%00%(objectname)%00%(*objectname)"],
+            check=True, capture_output=True,
+        ).stdout.decode()
+        tags = []
+        for line in output.splitlines():
+            name, sha, peeled = line.split("\0")
+            tags.append({"name": name, "commit": {"sha": peeled or sha}})
+        return tags
+
+    def fetch_license_for_tag(self, tag):
+        """
+        Returns (fetched, license_text) for the top-level LICENSE file at a tag or commit, like
+        git_repository_spdx.fetch_license_for_tag: fetched is False if the tree or the LICENSE
+        blob could not be read (e.g. a blob a partial clone failed to fetch from its remote).
+        """
+        tree = self.read_object(f"{tag}^{{tree}}")
+        if tree is None:
+            return False, None
+        for item in parse_tree(tree[2]):
+            if item["type"] == "blob" and item["path"].lower() == "license":
+                text = self.read_blob_text(item["sha"])
+                return text is not None, text
+        return True, None
+
+    def get_license_for_tag(self, tag):
+        """
+        Returns the text of the top-level LICENSE file at a tag or commit, or None if there is none.
+        """
+        return self.fetch_license_for_tag(tag)[1]
+
+    def discover(self, tag, max_depth=DEFAULT_MAX_DEPTH, excludes=DEFAULT_EXCLUDES):
+        """
+        Returns (path, text) pairs for every license file at a tag. The whole tree is searched
+        unless `excludes` or `max_depth` bound it (see license_discovery.BOUNDED_MAX_DEPTH).
+        """
+        def wanted(path):
+            if max_depth is not None and path_depth(path) > max_depth:
+                return False
+            return not is_excluded(path, excludes)
+
+        found = []
+        level = [("", tag)]
+        while level:
+            next_level = []
+            for prefix, tree_ish in level:
+                for item in self.read_tree(tree_ish):
+                    path = prefix + item["path"]
+                    if item["type"] == "tree":
+                        if wanted(path + "/"):
+                            next_level.append((path + "/", item["sha"]))
+                    elif item["type"] == "blob" and is_license_path(path) and wanted(path):
+                        text = self.read_blob_text(item["sha"])
+                        if text is not None:
+                            found.append((path, text))
+            level = next_level
+        return found
+
+    def get_licenses_at_tag(self, tag, max_depth=DEFAULT_MAX_DEPTH, excludes=DEFAULT_EXCLUDES):
+        """
+        Same result as git-tag-license.py's get_licenses_at_tag: the identified name of each license file.
+        """
+        licenses_content = [get_license_name(text) for _, text in self.discover(tag, max_depth, excludes) if text.strip()]
+        return licenses_content if licenses_content else ["No LICENSE file found at the specified tag."]
+
+    def close(self):
+        """
+        Stops the cat-file process.
+        """
+        with self._lock:
+            if self._process is not None:
+                self._process.stdin.close()
+                self._process.wait()
+                self._process = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,231 @@
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+from http_utils.cache import cached_get
+from http_utils.client import GITHUB_PROFILE, http_get, http_post
+
+# Comma-separated GitHub tokens shared by every script (tokens passed to the scripts are added too)
+GITHUB_TOKENS_ENV = "GITHUB_TOKENS"
+
+# Extra seconds slept past X-RateLimit-Reset to absorb clock skew
+RESET_MARGIN = 1
+
+
+def resource_for(url):
+    """
+    Returns the GitHub rate-limit resource a request URL is counted against.
+    """
+    path = urlsplit(url).path
+    if path.startswith("/search/code"):
+        return "code_search"
+    if path.startswith("/search/"):
+        return "search"
+    if path.startswith("/graphql"):
+        return "graphql"
+    return "core"
+
+
+def retry_after_seconds(value):
+    """
+    Parses a Retry-After header, given either as delay-seconds or as an HTTP-date.
+    Returns the seconds to wait from now (never negative), or None if the value is unusable.
+    """
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def token_from_headers(headers):
+    """
+    Extracts the token from an "Authorization: token X" or "Authorization: Bearer X" header.
+    """
+    authorization = (headers or {}).get("Authorization", "")
+    _, _, token = authorization.partition(" ")
+    return token.strip() or None
+
+
+class TokenPool:
+    """
+    Spreads GitHub API requests over a pool of tokens while tracking each token's budget.
+
+    X-RateLimit-Remaining / X-RateLimit-Reset are recorded per token and per resource
+    (core, search, code_search, graphql). Each request goes to the token with the most
+    budget left for its resource; tokens whose budget is not known yet are used first, in
+    turn, so the first requests are spread over the pool. The caller only sleeps when every
+    token is exhausted, and then only until the earliest reset.
+    """
+    def __init__(self, tokens=()):
+        self._tokens = []
+        self._rejected = set()
+        self._budgets = {}
+        self._next = 0
+        self._condition = threading.Condition()
+        self.stats = {"requests": 0, "rate_limited": 0, "sleeps": 0, "slept_seconds": 0.0}
+        for token in tokens:
+            self.add_token(token)
+
+    def add_token(self, token):
+        """
+        Adds a token to the pool (no-op if it is already there or was rejected as invalid).
+        """
+        with self._condition:
+            if token and token not in self._tokens and token not in self._rejected:
+                self._tokens.append(token)
+                self._condition.notify_all()
+
+    def remove_token(self, token):
+        """
+        Drops a token from the pool, e.g. after GitHub rejects it as invalid.
+        """
+        with self._condition:
+            self._rejected.add(token)
+            if token in self._tokens:
+                self._tokens.remove(token)
+
+    def acquire(self, resource):
+        """
+        Returns the token with the most remaining budget for a resource, sleeping until the
+        earliest reset if every token is exhausted.
+        """
+        with self._condition:
+            while True:
+                if not self._tokens:
+                    raise ValueError(f"No GitHub tokens available; pass a token or set {GITHUB_TOKENS_ENV}.")
+
+                now = time.time()
+                best_token, best_remaining, earliest_reset = None, -1, None
+                # Start from a different token each time, so ties (e.g. unknown budgets) rotate
+                start = self._next % len(self._tokens)
+                self._next += 1
+                for token in self._tokens[start:] + self._tokens[:start]:
+                    budget = self._budgets.get((token, resource))
+                    if budget is not None and budget["reset"] <= now:
+                        # The window has rolled over; the next response reports the new budget
+                        del self._budgets[(token, resource)]
+                        budget = None
+                    remaining = float("inf") if budget is None else budget["remaining"]
+                    if remaining > best_remaining:
+                        best_token, best_remaining = token, remaining
+                    if budget is not None and (earliest_reset is None or budget["reset"] < earliest_reset):
+                        earliest_reset = budget["reset"]
+
+                if best_remaining > 0:
+                    budget = self._budgets.get((best_token, resource))
+                    if budget is not None:
+                        # Reserve one call so concurrent threads spread over the pool
+                        budget["remaining"] -= 1
+                    return best_token
+
+                wait_seconds = max(earliest_reset - now, 0) + RESET_MARGIN
+                print(f"All GitHub tokens exhausted for '{resource}', sleeping {wait_seconds:.0f}s until reset")
+                self.stats["sleeps"] += 1
+                self.stats["slept_seconds"] += wait_seconds
+                self._condition.wait(wait_seconds)
+
+    def update(self, token, resource, response):
+        """
+        Records the budget reported by a response's rate-limit headers.
+        """
+        headers = response.headers
+        resource = headers.get("X-RateLimit-Resource", resource)
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        retry_after = headers.get("Retry-After")
+
+        with self._condition:
+            self.stats["requests"] += 1
+            if remaining is not None and reset is not None:
+                self._budgets[(token, resource)] = {"remaining": int(remaining), "reset": float(reset)}
+            if response.status_code in (403, 429) and (remaining == "0" or retry_after is not None):
+                # Primary limit hit, or a secondary limit asking us to back off this token
+                self.stats["rate_limited"] += 1
+                delay = retry_after_seconds(retry_after) if retry_after is not None else None
+                reset_at = time.time() + delay if delay is not None else float(reset or time.time() + 60)
+                self._budgets[(token, resource)] = {"remaining": 0, "reset": reset_at}
+            self._condition.notify_all()
+
+    def is_rate_limited(self, response):
+        """
+        Returns True if a response was rejected because of a (primary or secondary) rate limit.
+        """
+        return response.status_code in (403, 429) and (
+            response.headers.get("X-RateLimit-Remaining") == "0" or "Retry-After" in response.headers
+        )
+
+    def request(self, url, headers=None, method="GET", **kwargs):
+        """
+        Sends a GET (or a POST, for GraphQL) with the best available token, retrying on
+        another token (or after the reset) when GitHub answers with a rate-limit error.
+        Requests go through the "github" session, which leaves 429s to this method.
+        """
+        send = http_post if method == "POST" else http_get
+        resource = resource_for(url)
+        while True:
+            token = self.acquire(resource)
+            request_headers = dict(headers or {})
+            request_headers["Authorization"] = f"Bearer {token}"
+            response = send(url, headers=request_headers, profile=GITHUB_PROFILE, **kwargs)
+            self.update(token, resource, response)
+
+            if response.status_code == 401 and len(self._tokens) > 1:
+                print("Dropping a GitHub token rejected as invalid")
+                self.remove_token(token)
+                continue
+            if self.is_rate_limited(response):
+                continue
+            return response
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_token_pool():
+    """
+    Returns the process-wide TokenPool, seeded from the GITHUB_TOKENS environment variable.
+    """
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            tokens = [token.strip() for token in os.environ.get(GITHUB_TOKENS_ENV, "").split(",")]
+            _default_pool = TokenPool(token for token in tokens if token)
+        return _default_pool
+
+
+def github_request(url, headers=None, **kwargs):
+    """
+    Uncached GitHub GET through the shared token pool. A token in the Authorization header
+    is added to the pool; the pool decides which token the request actually uses.
+    """
+    pool = get_token_pool()
+    pool.add_token(token_from_headers(headers))
+    return pool.request(url, headers=headers, **kwargs)
+
+
+def github_post(url, headers=None, **kwargs):
+    """
+    Uncached GitHub POST (used for GraphQL queries) through the shared token pool.
+    """
+    pool = get_token_pool()
+    pool.add_token(token_from_headers(headers))
+    return pool.request(url, headers=headers, method="POST", **kwargs)
+
+
+def github_get(url, headers=None, params=None, **kwargs):
+    """
+    Cached GitHub GET (with ETag revalidation) through the shared token pool.
+
+    The pool replaces the caller's Authorization header with whichever token it picks, so
+    entries are keyed on Accept only and shared by every token in the pool.
+    """
+    pool = get_token_pool()
+    pool.add_token(token_from_headers(headers))
+    return cached_get(url, headers=headers, params=params, fetch=pool.request, vary_headers=("Accept",), **kwargs)
@@ -0,0 +1,148 @@
+import re
+import threading
+from functools import lru_cache
+
+from git_utils.rate_limit import github_get
+
+GITHUB_API_URL = "https://api.github.com"
+
+# Distinct repository URL strings remembered by parse_repo_url
+REPO_URL_CACHE_SIZE = 16384
+
+# npm / package.json shorthands ("github:owner/repo"); a bare "owner/repo" means GitHub
+SHORTHAND_HOSTS = {"github": "github.com", "gitlab": "gitlab.com", "bitbucket": "bitbucket.org"}
+BARE_SHORTHAND_HOST = "github.com"
+
+# Hosts that allow nested groups (/group/subgroup/repo); elsewhere a repository is exactly
+# /owner/repo and anything after it is a page inside the repository
+NESTED_GROUP_HOSTS = ("gitlab.com",)
+
+# Pages inside a GitLab repository that older URLs reach without the "/-/" separator
+# (gitlab.com/group/repo/tree/main); they end the group path once owner and repo are seen
+NESTED_GROUP_PAGES = {
+    "tree", "blob", "raw", "blame", "commits", "commit", "compare", "tags", "branches",
+    "releases", "issues", "merge_requests", "wikis", "pipelines",
+}
+
+SCM_PREFIX = re.compile(r"^scm:([a-z0-9]+):", re.IGNORECASE)
+BARE_SHORTHAND = re.compile(r"^[a-z0-9-]+/[\w.-]+$", re.IGNORECASE)
+SCP_LIKE = re.compile(r"^(?:[\w.-]+@)?([\w.-]+\.[a-z]{2,}):(?!\d+/)(.+)$", re.IGNORECASE)
+URL = re.compile(r"^(?:[a-z][a-z0-9+.-]*://)?(?:[^@/]+@)?([^/:]+)(?::\d+)?(/.*)?$", re.IGNORECASE)
+
+
+@lru_cache(maxsize=REPO_URL_CACHE_SIZE)
+def parse_repo_url(url):
+    """
+    Maps any form of a source repository URL to a (host, owner, repo) key, all lowercased.
+
+    Handles git+https://...git, git://, ssh and scp-like git@host:owner/repo (also behind
+    ssh://, as in git+ssh://git@host:owner/repo.git), Maven scm:git:... URLs, npm
+    "github:owner/repo" and bare "owner/repo" shorthands and browser URLs that point inside
+    a repository (/tree/master, /blob/..., #readme). GitLab subgroups are kept in the owner;
+    GitLab pages are recognised with or without the "/-/" separator.
+
+    Returns:
+        tuple: (host, owner, repo), or None if the value is not a recognisable repository URL.
+    """
+    if not url:
+        return None
+    scm = SCM_PREFIX.match(url.strip())
+    if scm and scm.group(1).lower() != "git":  # scm:svn:, scm:hg:, ...
+        return None
+    value = SCM_PREFIX.sub("", url.strip())
+    value = re.sub(r"^git\+", "", value, flags=re.IGNORECASE)
+    value = re.split(r"[?#]", value, maxsplit=1)[0]
+
+    shorthand = re.match(r"^(github|gitlab|bitbucket):([^/]+/[^/]+)$", value, re.IGNORECASE)
+    # "ssh://git@host:owner/repo" mixes the URL and scp-like forms; a numeric "host:22/" is a port
+    scp_value = re.sub(r"^ssh://", "", value, flags=re.IGNORECASE)
+    scp = SCP_LIKE.match(scp_value) if "://" not in scp_value else None
+    if shorthand:
+        host, path = SHORTHAND_HOSTS[shorthand.group(1).lower()], shorthand.group(2)
+    elif BARE_SHORTHAND.match(value):
+        host, path = BARE_SHORTHAND_HOST, value
+    elif scp:
+        host, path = scp.group(1), scp.group(2)
+    else:
+        match = URL.match(value)
+        if not match or not match.group(2):
+            return None
+        host, path = match.group(1), match.group(2)
+
+    host = host.lower()
+    if host.startswith("www."):
+        host = host[len("www."):]
+    segments = [segment for segment in path.split("/") if segment]
+    if "-" in segments:  # GitLab: /group/sub/repo/-/tree/main
+        segments = segments[:segments.index("-")]
+    if host not in NESTED_GROUP_HOSTS:
+        segments = segments[:2]
+    else:
+        page = next((index for index, segment in enumerate(segments)
+                     if index >= 2 and segment.lower() in NESTED_GROUP_PAGES), None)
+        if page is not None:  # GitLab without "/-/": /group/repo/tree/main
+            segments = segments[:page]
+    if len(segments) < 2 or "$" in "".join(segments):  # unresolved Maven ${...} placeholders
+        return None
+    repo = re.sub(r"\.git$", "", segments[-1], flags=re.IGNORECASE)
+    if not repo:
+        return None
+    return host, "/".join(segments[:-1]).lower(), repo.lower()
+
+
+def canonical_repo_url(url):
+    """
+    Returns "https://host/owner/repo" for any recognisable repository URL, else None.
+    """
+    key = parse_repo_url(url)
+    return f"https://{key[0]}/{key[1]}/{key[2]}" if key else None
+
+
+def group_by_repo(urls):
+    """
+    Groups items by repository so each repository is looked up once.
+
+    Args:
+        urls (dict): {item: repository URL}, e.g. {("npm", "@babel/core", "7.24.0"): "git+https://..."}.
+
+    Returns:
+        dict: {(host, owner, repo): [items]}; items without a recognisable URL are under None.
+    """
+    groups = {}
+    for item, url in urls.items():
+        groups.setdefault(parse_repo_url(url), []).append(item)
+    return groups
+
+
+_repo_licenses = {}
+_key_locks = {}
+_repo_licenses_lock = threading.Lock()
+
+
+def get_repo_license(repo_key, headers=None):
+    """
+    Returns the GitHub /repos/{owner}/{repo}/license document for a (host, owner, repo) key,
+    fetched once per run however many packages map to the repository.
+
+    Returns:
+        dict: The license document, or None if the repository is not on GitHub or has no license.
+    """
+    if not repo_key or repo_key[0] != "github.com":
+        return None
+    with _repo_licenses_lock:
+        if repo_key in _repo_licenses:
+            return _repo_licenses[repo_key]
+        key_lock = _key_locks.setdefault(repo_key, threading.Lock())
+
+    with key_lock:
+        with _repo_licenses_lock:
+            if repo_key in _repo_licenses:
+                return _repo_licenses[repo_key]
+        _, owner, repo = repo_key
+        response = github_get(f"{GITHUB_API_URL}/repos/{owner}/{repo}/license", headers=headers)
+        license_info = response.json() if response.status_code == 200 else None
+        # Only definite answers are remembered; errors are retried on the next lookup
+        if response.status_code in (200, 404):
+            with _repo_licenses_lock:
+                _repo_licenses[repo_key] = license_info
+    return license_info
@@ -1,5 +1,12 @@
+import os
+import sys
+
 import requests
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from git_utils.rate_limit import github_request
+
 def search_git_repository(package_name, ecosystem, github_token):
     """
     Search for a Git repository for a package using GitHub's search API.
@@ -29,7 +36,7 @@ def search_git_repository(package_name, ecosystem, github_token):
 
         # GitHub API search endpoint
         url = f"https://api.github.com/search/code?q={query}&per_page=1"
-        response = requests.get(url, headers=headers)
+        response = github_request(url, headers=headers)
         response.raise_for_status()
 
         # Process results
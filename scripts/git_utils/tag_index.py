@@ -0,0 +1,171 @@
+import re
+import threading
+from collections import Counter
+
+from git_utils.rate_limit import github_get
+
+GITHUB_API_URL = "https://api.github.com"
+
+# Tags per page requested from the tags endpoint (GitHub's maximum)
+TAGS_PER_PAGE = 100
+
+SEPARATORS = re.compile(r"[\.\_\-]")
+COMMON_PREFIX = re.compile(r"^(v|r)?\d+")
+
+# Tag prefixes (separators removed) that only mark a release; any other prefix names a module,
+# as in the "foo-1.2" / "bar-1.2" tags of a monorepo
+RELEASE_PREFIXES = {"", "v", "r", "release", "rel", "version", "ver"}
+
+
+def clean_tag(name):
+    """
+    Removes '.', '_' and '-' separators, so "5_0_7" and "5.0.7" compare equal.
+    """
+    return SEPARATORS.sub("", name)
+
+
+def strip_prefix(name):
+    """
+    Removes everything before the first digit ("v1.2", "r1.2", "release-1.2" -> "1.2").
+    """
+    return re.sub(r"^[^\d]*", "", name)
+
+
+def tag_prefix(name):
+    """
+    Returns the lowercased part of a tag before its first digit, separators removed ("release-1.2" -> "release").
+    """
+    return clean_tag(name[:len(name) - len(strip_prefix(name))]).lower()
+
+
+def semver_key(name):
+    """
+    Returns the numeric version parts of a tag or version with trailing zeros dropped, so
+    "v1.2" and "1.2.0" share a key. Returns None if any part is not numeric.
+    """
+    parts = [part for part in SEPARATORS.split(strip_prefix(name)) if part]
+    if not parts or not all(part.isdigit() for part in parts):
+        return None
+    numbers = [int(part) for part in parts]
+    while len(numbers) > 1 and numbers[-1] == 0:
+        numbers.pop()
+    return tuple(numbers)
+
+
+class TagIndex:
+    """
+    All tags of one repository with precomputed lookup keys.
+
+    Built from one paginated fetch of the tags endpoint; every version lookup after that is
+    a few dictionary probes: exact name, separator-stripped, prefix-stripped, then numeric.
+
+    The prefix-stripped and numeric keys remember the tag for each prefix, so in a monorepo
+    "bar-1.2" is never answered with "foo-1.2", and a bare "1.2" only matches a module's tag
+    when no other module has the same version.
+    """
+    def __init__(self, tags):
+        self.tags = [tag["name"] for tag in tags if "name" in tag]
+        self.commits = {tag["name"]: tag.get("commit", {}).get("sha") for tag in tags if "name" in tag}
+        self.by_cleaned = {}
+        self.by_stripped = {}
+        self.by_semver = {}
+        prefixes = []
+
+        for name in self.tags:
+            # Keep the first tag seen for each key, as the linear scan did
+            self.by_cleaned.setdefault(clean_tag(name), name)
+            prefix = tag_prefix(name)
+            self.by_stripped.setdefault(clean_tag(strip_prefix(name)), {}).setdefault(prefix, name)
+            key = semver_key(name)
+            if key is not None:
+                self.by_semver.setdefault(key, {}).setdefault(prefix, name)
+            match = COMMON_PREFIX.match(name)
+            if match:
+                prefixes.append(match.group(1) or "")
+        self.prefix_counts = Counter(prefixes)
+
+    def match(self, version):
+        """
+        Returns the tag name that best matches a version, or None.
+        """
+        if version in self.commits:
+            return version
+        key = clean_tag(version)
+        if key in self.by_cleaned:
+            return self.by_cleaned[key]
+        prefix = tag_prefix(version)
+        for index, key in (
+            (self.by_stripped, clean_tag(strip_prefix(version))),
+            (self.by_semver, semver_key(version)),
+        ):
+            if key is not None and key in index:
+                tag_name = self._pick(index[key], prefix)
+                if tag_name is not None:
+                    return tag_name
+        return None
+
+    @staticmethod
+    def _pick(tags_by_prefix, prefix):
+        """
+        Chooses among the tags sharing a version key: the tag with the version's own prefix, else
+        (for a version without a module prefix) a release-style tag, else the only module's tag.
+        """
+        if prefix in tags_by_prefix:
+            return tags_by_prefix[prefix]
+        if prefix not in RELEASE_PREFIXES:
+            return None
+        release_tags = [name for other, name in tags_by_prefix.items() if other in RELEASE_PREFIXES]
+        if release_tags:
+            return release_tags[0]
+        return next(iter(tags_by_prefix.values())) if len(tags_by_prefix) == 1 else None
+
+    def most_common_prefix(self):
+        """
+        Returns the most common tag prefix ('v', 'r' or ''), or '' if no tag looks like a version.
+        """
+        return self.prefix_counts.most_common(1)[0][0] if self.prefix_counts else ""
+
+
+def fetch_all_tags(repo_owner, repo_name, headers=None):
+    """
+    Fetches every tag of a repository, following the Link header across pages.
+
+    Raises:
+        requests.RequestException: If a page request fails.
+    """
+    tags = []
+    url = f"{GITHUB_API_URL}/repos/{repo_owner}/{repo_name}/tags?per_page={TAGS_PER_PAGE}"
+    while url:
+        response = github_get(url, headers=headers)
+        response.raise_for_status()
+        tags.extend(response.json())
+        url = response.links.get("next", {}).get("url")
+    return tags
+
+
+_indexes = {}
+_key_locks = {}
+_indexes_lock = threading.Lock()
+
+
+def get_tag_index(repo_owner, repo_name, headers=None):
+    """
+    Returns the TagIndex of a repository, fetching its tags once per run.
+
+    Raises:
+        requests.RequestException: If fetching the tags fails.
+    """
+    key = (repo_owner.lower(), repo_name.lower())
+    with _indexes_lock:
+        if key in _indexes:
+            return _indexes[key]
+        key_lock = _key_locks.setdefault(key, threading.Lock())
+
+    with key_lock:
+        with _indexes_lock:
+            if key in _indexes:
+                return _indexes[key]
+        index = TagIndex(fetch_all_tags(repo_owner, repo_name, headers))
+        with _indexes_lock:
+            _indexes[key] = index
+    return index
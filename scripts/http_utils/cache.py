@@ -0,0 +1,328 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from urllib.parse import urlencode, urlsplit, urlunsplit, parse_qsl
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from http_utils.client import http_get
+
+# Location of the shared cache database (override with HTTP_CACHE_PATH)
+DEFAULT_CACHE_PATH = os.environ.get(
+    "HTTP_CACHE_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "python-scripts", "http_cache.sqlite")
+)
+
+# Upper bound on the compressed bytes kept on disk before least-recently-used entries are evicted
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Seconds a cached response stays fresh, per host. Published POMs and nuspecs never change,
+# registry metadata changes occasionally, GitHub data changes often.
+HOST_TTLS = {
+    "repo1.maven.org": 30 * 24 * 3600,
+    "api.nuget.org": 7 * 24 * 3600,
+    "registry.npmjs.org": 24 * 3600,
+    "pypi.org": 24 * 3600,
+    "api.clearlydefined.io": 7 * 24 * 3600,
+    "api.github.com": 3600,
+}
+DEFAULT_TTL = 24 * 3600
+
+# Per-URL overrides of HOST_TTLS as (host, path pattern, seconds). NuGet's registration and
+# flat-container indexes list a package's versions (and so answer "latest version" lookups),
+# which change whenever a version is published.
+PATH_TTLS = (
+    ("api.nuget.org", re.compile(r"/index\.json$"), 24 * 3600),
+)
+
+# Request headers that select a different response for the same URL, and so are part of the
+# cache key; Authorization is only kept as a hash
+VARY_HEADERS = ("Accept", "Authorization")
+HASHED_HEADERS = ("Authorization",)
+
+
+def normalize_url(url, params=None):
+    """
+    Normalizes a URL (and optional query params) into the key used by the cache.
+
+    Lower-cases the scheme and host, drops default ports and fragments, and sorts the
+    query string so equivalent requests share one cache entry.
+    """
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and not ((scheme == "http" and parts.port == 80) or (scheme == "https" and parts.port == 443)):
+        host = f"{host}:{parts.port}"
+
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        items = params.items() if isinstance(params, dict) else params
+        query.extend((str(key), str(value)) for key, value in items)
+
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(sorted(query)), ""))
+
+
+def cache_key(url, params=None, headers=None, vary_headers=VARY_HEADERS):
+    """
+    Returns the cache key of a request: its normalized URL, followed (as a fragment, which
+    normalize_url never keeps) by the `vary_headers` it sends, so a response fetched with one
+    Accept type or one token is not served for another.
+    """
+    key = normalize_url(url, params)
+    headers = CaseInsensitiveDict(headers or {})
+    varied = []
+    for name in vary_headers:
+        value = headers.get(name)
+        if value:
+            if name in HASHED_HEADERS:
+                value = hashlib.sha256(value.encode("utf-8")).hexdigest()[:16]
+            varied.append((name.lower(), value))
+    return f"{key}#{urlencode(varied)}" if varied else key
+
+
+class ResponseCache:
+    """
+    SQLite-backed cache of successful HTTP GET responses, shared by all fetcher scripts.
+
+    Bodies are stored zlib-compressed, freshness is decided by a per-host TTL, and the
+    least recently used entries are evicted once the stored size exceeds `max_bytes`.
+    """
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES, host_ttls=None, default_ttl=DEFAULT_TTL):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.max_bytes = max_bytes
+        self.host_ttls = dict(HOST_TTLS if host_ttls is None else host_ttls)
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self.stats = {"hit": 0, "revalidated": 0, "downloaded": 0}
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                encoding TEXT,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def ttl_for(self, url):
+        """
+        Returns the freshness lifetime in seconds for a URL, based on its host (and PATH_TTLS).
+        """
+        parts = urlsplit(url)
+        host = (parts.hostname or "").lower()
+        for ttl_host, pattern, ttl in PATH_TTLS:
+            if host == ttl_host and pattern.search(parts.path):
+                return ttl
+        return self.host_ttls.get(host, self.default_ttl)
+
+    def get(self, url, include_stale=False):
+        """
+        Returns the cached entry for a normalized URL, or None if missing.
+
+        Expired entries are only returned when `include_stale` is set, so the caller can
+        revalidate them with the stored ETag / Last-Modified validators.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, headers, encoding, body, fetched_at FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            fresh = now - row[4] <= self.ttl_for(url)
+            if not fresh and not include_stale:
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (now, url))
+
+        status, headers, encoding, body, fetched_at = row
+        return {
+            "status": status,
+            "headers": json.loads(headers),
+            "encoding": encoding,
+            "content": zlib.decompress(body),
+            "fetched_at": fetched_at,
+            "fresh": fresh,
+        }
+
+    def refresh(self, url, headers):
+        """
+        Marks a revalidated (304) entry fresh again and merges in the new response headers.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT headers FROM responses WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                return
+            merged = json.loads(row[0])
+            merged.update(dict(headers))
+            self._conn.execute(
+                "UPDATE responses SET headers = ?, fetched_at = ?, accessed_at = ? WHERE url = ?",
+                (json.dumps(merged), now, now, url)
+            )
+
+    def record(self, outcome):
+        """
+        Counts a lookup outcome: "hit", "revalidated" or "downloaded".
+        """
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def put(self, url, response):
+        """
+        Stores a response under a normalized URL and evicts old entries if over budget.
+        """
+        self.store(url, response.content, response.headers, response.status_code, response.encoding)
+
+    def store(self, url, content, headers=None, status=200, encoding="utf-8"):
+        """
+        Stores a body under a normalized URL as if it had been fetched with GET, e.g. to
+        record one definition out of a batch POST answer.
+        """
+        body = zlib.compress(content)
+        now = time.time()
+        with self._lock:
+            previous = self._conn.execute("SELECT size FROM responses WHERE url = ?", (url,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, status, json.dumps(dict(headers or {})), encoding, body, len(body), now, now)
+            )
+            self._total_bytes += len(body) - (previous[0] if previous else 0)
+            self._evict()
+
+    def _evict(self):
+        """
+        Deletes least recently used entries until the cache is back under its size budget.
+        """
+        while self._total_bytes > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT url, size FROM responses ORDER BY accessed_at LIMIT 100"
+            ).fetchall()
+            if not rows:
+                break
+            for url, size in rows:
+                self._conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+                self._total_bytes -= size
+                if self._total_bytes <= self.max_bytes:
+                    break
+
+    def clear(self):
+        """
+        Removes every cached response.
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._total_bytes = 0
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """
+    Returns the process-wide ResponseCache, creating it on first use.
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache()
+        return _default_cache
+
+
+def set_cache(cache):
+    """
+    Replaces the process-wide ResponseCache (e.g. with a temporary one for benchmarks).
+    """
+    global _default_cache
+    with _default_cache_lock:
+        _default_cache = cache
+
+
+def _build_response(url, entry):
+    """
+    Rebuilds a requests.Response from a cached entry so callers can use it unchanged.
+    """
+    response = requests.Response()
+    response.status_code = entry["status"]
+    response.reason = "OK"
+    response.headers = CaseInsensitiveDict(entry["headers"])
+    response.encoding = entry["encoding"]
+    response.url = url
+    response._content = entry["content"]
+    return response
+
+
+def _conditional_headers(headers, entry):
+    """
+    Adds If-None-Match / If-Modified-Since validators from a stale cached entry to the request headers.
+    """
+    headers = dict(headers or {})
+    stored = CaseInsensitiveDict(entry["headers"])
+    if stored.get("ETag"):
+        headers["If-None-Match"] = stored["ETag"]
+    if stored.get("Last-Modified"):
+        headers["If-Modified-Since"] = stored["Last-Modified"]
+    return headers
+
+
+def cached_get(url, headers=None, params=None, cache=None, fetch=None, vary_headers=VARY_HEADERS, **kwargs):
+    """
+    Drop-in replacement for requests.get that serves successful responses from the shared cache.
+
+    Network requests go through the pooled client in http_utils.client.
+
+    Fresh entries are served without a request. Expired entries that carry an ETag or
+    Last-Modified validator are revalidated with a conditional request; a 304 answer
+    (which GitHub does not count against the rate limit) refreshes the stored body.
+    Only 200 responses are stored; anything else is returned as-is and fetched again next time.
+    Entries are keyed by URL and by the Accept / Authorization headers (see cache_key), or by
+    the given `vary_headers` instead.
+    `fetch` replaces http_get for the network call (e.g. the GitHub token scheduler).
+    """
+    cache = cache or get_cache()
+    fetch = fetch or http_get
+    key = cache_key(url, params, headers, vary_headers)
+    response_url = normalize_url(url, params)
+
+    entry = cache.get(key, include_stale=True)
+    if entry is not None and entry["fresh"]:
+        cache.record("hit")
+        return _build_response(response_url, entry)
+
+    request_headers = headers
+    if entry is not None:
+        request_headers = _conditional_headers(headers, entry)
+
+    response = fetch(url, headers=request_headers, params=params, **kwargs)
+    if response.status_code == 304 and entry is not None:
+        cache.refresh(key, response.headers)
+        cache.record("revalidated")
+        return _build_response(response_url, entry)
+
+    cache.record("downloaded")
+    if response.status_code == 200:
+        cache.put(key, response)
+    return response
+
+
+def get_cache_stats():
+    """
+    Returns how many lookups were served from cache, revalidated with a 304, or fully downloaded.
+    """
+    return dict(get_cache().stats)
@@ -0,0 +1,120 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# (connect, read) timeout in seconds applied when the caller does not pass one
+DEFAULT_TIMEOUT = (5, 30)
+
+# Connections kept alive per host; should be at least the number of worker threads hitting one host
+DEFAULT_POOL_MAXSIZE = 32
+
+# Retry settings for transient failures: 429 and 5xx responses plus connection errors
+DEFAULT_RETRIES = 5
+DEFAULT_BACKOFF_FACTOR = 0.5
+DEFAULT_BACKOFF_JITTER = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Sessions by profile, each with its own retried statuses and methods. GitHub's 429s are
+# left to git_utils.rate_limit.TokenPool, which retries them on another token instead of
+# waiting on the same one; urllib3 retries any 429 with a Retry-After header while it honors
+# the header, so that profile ignores it. POST is only retried for ClearlyDefined, whose
+# POST /definitions is a read-only batch query; elsewhere a POST may not be safe to repeat.
+DEFAULT_PROFILE = "default"
+GITHUB_PROFILE = "github"
+CLEARLYDEFINED_PROFILE = "clearlydefined"
+SESSION_PROFILES = {
+    DEFAULT_PROFILE: {"statuses": RETRY_STATUSES, "methods": ("GET", "HEAD"), "retry_after": True},
+    GITHUB_PROFILE: {"statuses": (500, 502, 503, 504), "methods": ("GET", "HEAD"), "retry_after": False},
+    CLEARLYDEFINED_PROFILE: {"statuses": RETRY_STATUSES, "methods": ("GET", "HEAD", "POST"), "retry_after": True},
+}
+
+_settings = {
+    "timeout": DEFAULT_TIMEOUT,
+    "pool_maxsize": DEFAULT_POOL_MAXSIZE,
+    "retries": DEFAULT_RETRIES,
+    "backoff_factor": DEFAULT_BACKOFF_FACTOR,
+    "backoff_jitter": DEFAULT_BACKOFF_JITTER,
+}
+_sessions = {}
+_session_lock = threading.Lock()
+
+
+def _build_session(profile):
+    """
+    Creates a requests.Session with keep-alive connection pools and retry/backoff on every host.
+    """
+    options = SESSION_PROFILES[profile]
+    retry = Retry(
+        total=_settings["retries"],
+        backoff_factor=_settings["backoff_factor"],
+        backoff_jitter=_settings["backoff_jitter"],
+        status_forcelist=options["statuses"],
+        allowed_methods=frozenset(options["methods"]),
+        respect_retry_after_header=options["retry_after"],
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=_settings["pool_maxsize"],
+        pool_maxsize=_settings["pool_maxsize"],
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def configure(timeout=None, pool_maxsize=None, retries=None, backoff_factor=None, backoff_jitter=None):
+    """
+    Changes the shared client settings. The sessions are rebuilt on next use.
+
+    Args:
+        timeout (float or tuple): Default (connect, read) timeout in seconds.
+        pool_maxsize (int): Keep-alive connections kept per host.
+        retries (int): Maximum retries for 429/5xx responses and connection errors.
+        backoff_factor (float): Base of the exponential backoff between retries, in seconds.
+        backoff_jitter (float): Upper bound of the random jitter added to each backoff, in seconds.
+    """
+    updates = {
+        "timeout": timeout,
+        "pool_maxsize": pool_maxsize,
+        "retries": retries,
+        "backoff_factor": backoff_factor,
+        "backoff_jitter": backoff_jitter,
+    }
+    with _session_lock:
+        _settings.update({key: value for key, value in updates.items() if value is not None})
+        _sessions.clear()
+
+
+def get_session(profile=DEFAULT_PROFILE):
+    """
+    Returns the process-wide pooled session of a profile (see SESSION_PROFILES), creating it on first use.
+    """
+    with _session_lock:
+        if profile not in _sessions:
+            _sessions[profile] = _build_session(profile)
+        return _sessions[profile]
+
+
+def http_get(url, profile=DEFAULT_PROFILE, **kwargs):
+    """
+    Drop-in replacement for requests.get that reuses pooled keep-alive connections.
+
+    429 and 5xx responses are retried with jittered exponential backoff, honoring
+    Retry-After (only 5xx with the "github" profile); the configured default timeout
+    applies unless `timeout` is passed.
+    """
+    kwargs.setdefault("timeout", _settings["timeout"])
+    return get_session(profile).get(url, **kwargs)
+
+
+def http_post(url, profile=DEFAULT_PROFILE, **kwargs):
+    """
+    Drop-in replacement for requests.post with the same pooling and default timeout as http_get.
+    POST requests are only retried with a profile that allows it ("clearlydefined").
+    """
+    kwargs.setdefault("timeout", _settings["timeout"])
+    return get_session(profile).post(url, **kwargs)
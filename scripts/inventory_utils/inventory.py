@@ -0,0 +1,72 @@
+import fnmatch
+import os
+
+from inventory_utils.lockfiles import read_package_lock, read_yarn_lock, read_poetry_lock, read_requirements, read_nuget_lock
+from inventory_utils.sbom import read_cyclonedx, read_spdx
+
+# File name patterns and the reader for each, checked in order
+READERS = (
+    ("package-lock.json", read_package_lock),
+    ("npm-shrinkwrap.json", read_package_lock),
+    ("yarn.lock", read_yarn_lock),
+    ("poetry.lock", read_poetry_lock),
+    ("packages.lock.json", read_nuget_lock),
+    ("*requirements*.txt", read_requirements),
+    ("*.cdx.json", read_cyclonedx),
+    ("*.spdx.json", read_spdx),
+)
+
+# Bytes read from the start of other .json files to tell CycloneDX from SPDX
+SNIFF_SIZE = 4096
+
+
+def get_reader(path):
+    """
+    Returns the reader function for an inventory file, chosen by file name and, for other
+    .json files, by looking for CycloneDX's "bomFormat" or SPDX's "spdxVersion" near the top.
+
+    Raises:
+        ValueError: If the file is not a supported lockfile or SBOM.
+    """
+    file_name = os.path.basename(path).lower()
+    for pattern, reader in READERS:
+        if fnmatch.fnmatch(file_name, pattern):
+            return reader
+    if file_name.endswith(".json"):
+        with open(path, encoding="utf-8-sig", errors="replace") as json_file:
+            head = json_file.read(SNIFF_SIZE)
+        if '"bomFormat"' in head:
+            return read_cyclonedx
+        if '"spdxVersion"' in head:
+            return read_spdx
+    raise ValueError(f"Unsupported inventory file: {path}")
+
+
+def read_inventory(paths, stats=None):
+    """
+    Streams unique (ecosystem, name, version) coordinates from lockfiles and SBOMs.
+
+    Files are read one at a time and coordinates are yielded as they are parsed, so the only
+    state kept across files is the set of coordinates already yielded. Duplicates, within a
+    file or across files, never reach the resolver.
+
+    Args:
+        paths (iterable): Paths of package-lock.json, yarn.lock, poetry.lock, requirements.txt,
+            packages.lock.json or CycloneDX / SPDX JSON files.
+        stats (dict, optional): Filled in with "read" and "duplicates" counts.
+
+    Yields:
+        tuple: (ecosystem, name, version), ready for get_package_info / resolve_many.
+    """
+    stats = stats if stats is not None else {}
+    stats.setdefault("read", 0)
+    stats.setdefault("duplicates", 0)
+    seen = set()
+    for path in paths:
+        for coordinate in get_reader(path)(path):
+            stats["read"] += 1
+            if coordinate in seen:
+                stats["duplicates"] += 1
+                continue
+            seen.add(coordinate)
+            yield coordinate
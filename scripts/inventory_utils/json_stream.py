@@ -0,0 +1,178 @@
+import json
+
+try:
+    import ijson
+except ImportError:  # optional; the built-in reader below streams with the json module alone
+    ijson = None
+
+# Characters read from the file per refill of the fallback reader's buffer
+CHUNK_SIZE = 1 << 16
+
+WHITESPACE = " \t\r\n"
+
+# Characters a JSON number may continue with
+NUMBER_CHARS = "0123456789.eE+-"
+
+
+class _JsonReader:
+    """
+    Incremental reader over a text file of JSON, built on json.JSONDecoder.raw_decode.
+
+    Only the buffer and the one value being decoded are held in memory, so the members of a
+    top-level array or object can be walked in a file of any size.
+    """
+    def __init__(self, fileobj, chunk_size=CHUNK_SIZE):
+        self.file = fileobj
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        if self.eof:
+            return False
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        return True
+
+    def peek(self):
+        """
+        Skips whitespace and returns the next character, or "" at the end of the file.
+        """
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in WHITESPACE:
+                self.position += 1
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self._fill():
+                return ""
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at {self.peek()!r} in JSON stream")
+        self.position += 1
+
+    def decode(self):
+        """
+        Decodes and returns the next complete JSON value.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number cut by the buffer edge ("1" + "2", "2." + "5", "1e" + "5") decodes to its
+            # first part, so retry with the next chunk until something follows the number
+            is_number = isinstance(value, (int, float)) and not isinstance(value, bool)
+            if is_number and not self.buffer[end:].strip(NUMBER_CHARS) and self._fill():
+                continue
+            self.position = end
+            return value
+
+    def skip(self):
+        """
+        Skips the next JSON value without building it, in constant memory.
+        """
+        if self.peek() not in "[{":
+            self.decode()
+            return
+        depth, in_string, escaped = 0, False, False
+        while True:
+            if self.position >= len(self.buffer) and not self._fill():
+                raise ValueError("Unexpected end of JSON stream")
+            char = self.buffer[self.position]
+            self.position += 1
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == "\\":
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char in "[{":
+                depth += 1
+            elif char in "]}":
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def members(self, container):
+        """
+        Yields the items of the array (container="[") or the (key, value) pairs of the object
+        (container="{") at the current position.
+        """
+        closing = "]" if container == "[" else "}"
+        self.expect(container)
+        if self.peek() == closing:
+            self.position += 1
+            return
+        while True:
+            if container == "{":
+                key = self.decode()
+                self.expect(":")
+                yield key, self.decode()
+            else:
+                yield self.decode()
+            if self.peek() == ",":
+                self.position += 1
+                continue
+            self.expect(closing)
+            return
+
+    def find(self, key):
+        """
+        Advances to the value of a top-level key, skipping the values before it.
+        Returns False if the document has no such key.
+        """
+        self.expect("{")
+        while self.peek() == '"':
+            name = self.decode()
+            self.expect(":")
+            if name == key:
+                return True
+            self.skip()
+            if self.peek() == ",":
+                self.position += 1
+        return False
+
+
+def stream_array(path, key):
+    """
+    Yields the items of the array under a top-level key of a JSON file, e.g. an SBOM's
+    "components", without loading the whole document.
+
+    Uses ijson when it is installed and the built-in incremental reader otherwise.
+    """
+    if ijson is not None:
+        with open(path, "rb") as json_file:
+            yield from ijson.items(json_file, f"{key}.item", use_float=True)
+        return
+    with open(path, encoding="utf-8-sig") as json_file:
+        reader = _JsonReader(json_file)
+        if reader.find(key) and reader.peek() == "[":
+            yield from reader.members("[")
+
+
+def stream_object(path, key):
+    """
+    Yields the (key, value) pairs of the object under a top-level key of a JSON file,
+    e.g. package-lock.json's "packages", without loading the whole document.
+    """
+    if ijson is not None:
+        with open(path, "rb") as json_file:
+            yield from ijson.kvitems(json_file, key, use_float=True)
+        return
+    with open(path, encoding="utf-8-sig") as json_file:
+        reader = _JsonReader(json_file)
+        if reader.find(key) and reader.peek() == "{":
+            yield from reader.members("{")
@@ -0,0 +1,148 @@
+import os
+import re
+
+from inventory_utils.json_stream import stream_object
+from inventory_utils.sbom import normalize_coordinate
+
+# requirements.txt lines pinned to one version: name[extras]==version ; markers
+PINNED_REQUIREMENT = re.compile(r"^([A-Za-z0-9][A-Za-z0-9._-]*)\s*(?:\[[^\]]*\])?\s*===?\s*([^\s;,#\\]+)")
+INCLUDE_REQUIREMENT = re.compile(r"^(?:-r|--requirement)(?:\s+|=)(\S+)")
+TOML_STRING = re.compile(r'^(name|version)\s*=\s*"([^"]*)"')
+
+
+def _is_registry_tarball(resolved):
+    """
+    Tells whether a package-lock "resolved" value is a registry tarball (".../name/-/name-1.0.0.tgz",
+    on any registry host) rather than a git, file: or other non-registry source.
+    """
+    return resolved.startswith(("https://", "http://")) and "/-/" in resolved and resolved.endswith(".tgz")
+
+
+def _npm_name_from_path(path):
+    """
+    Returns the package name of a package-lock "packages" key ("node_modules/a/node_modules/@s/b" -> "@s/b").
+    """
+    marker = "node_modules/"
+    index = path.rfind(marker)
+    return path[index + len(marker):] if index != -1 else None
+
+
+def _npm_v1_dependencies(dependencies):
+    for name, entry in dependencies.items():
+        if isinstance(entry, dict):
+            if entry.get("version") and not entry["version"].startswith(("file:", "link:", "git")):
+                yield normalize_coordinate("npm", name, entry["version"])
+            yield from _npm_v1_dependencies(entry.get("dependencies") or {})
+
+
+def read_package_lock(path):
+    """
+    Streams (ecosystem, name, version) tuples from an npm package-lock.json / npm-shrinkwrap.json.
+
+    Lockfile v2 / v3 are read from the flat "packages" map; v1 files, which only have the
+    nested "dependencies" tree, are read from that. The root package, workspace packages (keys
+    outside node_modules/, and their links) and packages resolved from git or file: sources
+    rather than a registry tarball are skipped.
+    """
+    found = False
+    for package_path, entry in stream_object(path, "packages"):
+        found = True
+        if "node_modules/" not in package_path or not isinstance(entry, dict) or entry.get("link") or not entry.get("version"):
+            continue
+        if entry.get("resolved") and not _is_registry_tarball(entry["resolved"]):
+            continue
+        name = entry.get("name") or _npm_name_from_path(package_path)
+        if name:
+            yield normalize_coordinate("npm", name, entry["version"])
+    if found:
+        return
+    for name, entry in stream_object(path, "dependencies"):
+        yield from _npm_v1_dependencies({name: entry})
+
+
+def _yarn_name(specifier):
+    """
+    Returns the package name of a yarn.lock specifier ('"@babel/core@^7.0.0"' -> "@babel/core").
+    """
+    specifier = specifier.strip().strip('"')
+    at = specifier.find("@", 1)  # a leading "@" belongs to the scope
+    return specifier[:at] if at != -1 else specifier
+
+
+def read_yarn_lock(path):
+    """
+    Streams (ecosystem, name, version) tuples from a yarn.lock, classic (v1) or Berry, line by line.
+    """
+    name = None
+    with open(path, encoding="utf-8") as lock_file:
+        for line in lock_file:
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            if not line[0].isspace():
+                # Entry header: one or more comma-separated specifiers of the same package
+                header = line.rstrip().rstrip(":")
+                name = None if header.startswith("__metadata") else _yarn_name(header.split(",")[0])
+                continue
+            stripped = line.strip()
+            if name and stripped.startswith("version"):
+                version = stripped[len("version"):].lstrip(":").strip().strip('"')
+                if version and "use.local" not in version:  # Berry workspaces are 0.0.0-use.local
+                    yield normalize_coordinate("npm", name, version)
+                name = None
+
+
+def read_poetry_lock(path):
+    """
+    Streams (ecosystem, name, version) tuples from a poetry.lock, line by line.
+    """
+    in_package, name, version = False, None, None
+    with open(path, encoding="utf-8") as lock_file:
+        for line in lock_file:
+            stripped = line.strip()
+            if stripped.startswith("["):
+                if in_package and name and version:
+                    yield normalize_coordinate("pypi", name, version)
+                # Only keys directly under [[package]], not [package.dependencies] and friends
+                in_package, name, version = stripped == "[[package]]", None, None
+                continue
+            match = TOML_STRING.match(stripped) if in_package else None
+            if match:
+                if match.group(1) == "name":
+                    name = match.group(2)
+                else:
+                    version = match.group(2)
+    if in_package and name and version:
+        yield normalize_coordinate("pypi", name, version)
+
+
+def read_requirements(path, _seen=None):
+    """
+    Streams (ecosystem, name, version) tuples for the pinned (==) lines of a requirements.txt,
+    following -r includes. Unpinned requirements cannot be resolved to one version and are skipped.
+    """
+    seen = _seen if _seen is not None else set()
+    path = os.path.abspath(path)
+    if path in seen:
+        return
+    seen.add(path)
+    with open(path, encoding="utf-8") as requirements_file:
+        for line in requirements_file:
+            line = line.split(" #", 1)[0].strip()
+            include = INCLUDE_REQUIREMENT.match(line)
+            if include:
+                yield from read_requirements(os.path.join(os.path.dirname(path), include.group(1)), seen)
+                continue
+            match = PINNED_REQUIREMENT.match(line)
+            if match:
+                yield normalize_coordinate("pypi", match.group(1), match.group(2))
+
+
+def read_nuget_lock(path):
+    """
+    Streams (ecosystem, name, version) tuples from a NuGet packages.lock.json, across all
+    target frameworks. Project references are skipped.
+    """
+    for _, packages in stream_object(path, "dependencies"):
+        for package_id, entry in (packages or {}).items():
+            if isinstance(entry, dict) and entry.get("resolved") and entry.get("type") != "Project":
+                yield normalize_coordinate("nuget", package_id, entry["resolved"])
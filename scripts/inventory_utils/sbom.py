@@ -0,0 +1,81 @@
+from urllib.parse import unquote
+
+from inventory_utils.json_stream import stream_array
+from pypi_utils.project_index import normalize_project_name
+
+# purl types that get_package_info can resolve, mapped to its ecosystem names
+PURL_ECOSYSTEMS = {"maven": "maven", "npm": "npm", "pypi": "pypi", "nuget": "nuget"}
+
+
+def normalize_coordinate(ecosystem, name, version):
+    """
+    Returns the canonical (ecosystem, name, version) tuple used for deduplication:
+    PyPI names as in PEP 503, NuGet ids and versions lowercased (they are case-insensitive).
+    """
+    name, version = name.strip(), version.strip()
+    if ecosystem == "pypi":
+        name = normalize_project_name(name)
+    elif ecosystem == "nuget":
+        name, version = name.lower(), version.lower()
+    return ecosystem, name, version
+
+
+def parse_purl(purl):
+    """
+    Parses a package URL (pkg:type/namespace/name@version?qualifiers#subpath) into a
+    normalized (ecosystem, name, version) tuple.
+
+    Maven coordinates come out as "group:artifact" and npm scopes as "@scope/name", matching
+    what get_package_info expects.
+
+    Returns:
+        tuple: (ecosystem, name, version), or None for unsupported types or purls without a version.
+    """
+    if not purl or not purl.startswith("pkg:"):
+        return None
+    body = purl[len("pkg:"):].split("#", 1)[0].split("?", 1)[0].lstrip("/")
+    path, _, version = body.rpartition("@")
+    if not path or not version:
+        return None
+    purl_type, _, rest = path.partition("/")
+    ecosystem = PURL_ECOSYSTEMS.get(purl_type.lower())
+    if ecosystem is None or not rest:
+        return None
+    namespace, _, name = rest.rpartition("/")
+    namespace, name, version = unquote(namespace), unquote(name), unquote(version)
+    if ecosystem == "maven":
+        if not namespace:
+            return None
+        name = f"{namespace.replace('/', '.')}:{name}"
+    elif ecosystem == "npm" and namespace:
+        name = f"{namespace}/{name}"
+    return normalize_coordinate(ecosystem, name, version)
+
+
+def _cyclonedx_coordinates(component):
+    coordinate = parse_purl(component.get("purl"))
+    if coordinate is not None:
+        yield coordinate
+    # Components may nest sub-components (e.g. the contents of an assembly)
+    for child in component.get("components") or []:
+        yield from _cyclonedx_coordinates(child)
+
+
+def read_cyclonedx(path):
+    """
+    Streams the package coordinates of a CycloneDX JSON SBOM from its components' purls.
+    """
+    for component in stream_array(path, "components"):
+        yield from _cyclonedx_coordinates(component)
+
+
+def read_spdx(path):
+    """
+    Streams the package coordinates of an SPDX JSON SBOM from its packages' purl external refs.
+    """
+    for package in stream_array(path, "packages"):
+        for ref in package.get("externalRefs") or []:
+            if ref.get("referenceType") == "purl":
+                coordinate = parse_purl(ref.get("referenceLocator"))
+                if coordinate is not None:
+                    yield coordinate
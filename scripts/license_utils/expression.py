@@ -0,0 +1,234 @@
+import json
+import os
+import re
+from functools import lru_cache
+
+# Canonical SPDX license / exception IDs and free-form aliases ("Apache 2.0", "GPLv2+", PyPI
+# classifier names, deprecated IDs such as "GPL-2.0"). Names that leave the license or its
+# version open ("BSD", "Apache", "GPL", "LGPL", "Artistic License") are deliberately not aliased
+# and come out as LicenseRef-..., e.g. LicenseRef-BSD.
+ALIASES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "spdx_aliases.json")
+
+# Distinct license strings remembered by parse_expression / normalize_expression
+EXPRESSION_CACHE_SIZE = 8192
+
+OPERATORS = ("AND", "OR", "WITH")
+TOKEN = re.compile(r"\(|\)|[^\s()]+")
+OR_LATER = re.compile(r"[\s-]+or[\s-]+(any[\s-]+)?later([\s-]+version)?", re.IGNORECASE)
+LOWERCASE_OPERATOR = re.compile(r"\s+(and|or)\s+", re.IGNORECASE)
+
+
+def _alias_key(text):
+    """
+    Reduces a license name to a lookup key that ignores case, punctuation and filler words,
+    so "Apache License, Version 2.0", "apache-2.0" and "Apache 2" share one key.
+    """
+    key = OR_LATER.sub("+", text.lower().replace("licence", "license"))
+    key = re.sub(r"\b(the|license|version)\b", " ", key)
+    key = re.sub(r"(?<![a-z])v(?=\d)|(?<=[a-z]{2})v(?=\d)", "", key)  # "v2", "GPLv2"
+    key = re.sub(r"[^a-z0-9.+]", "", key)
+    return re.sub(r"(\d)\.0(?!\d)", r"\1", key)  # "2.0" -> "2"
+
+
+def _load_aliases(path=ALIASES_PATH):
+    with open(path, encoding="utf-8") as aliases_file:
+        table = json.load(aliases_file)
+    licenses = {}
+    for license_id in table["licenses"] + table["special"]:
+        licenses.setdefault(_alias_key(license_id), license_id)
+    exceptions = {_alias_key(exception_id): exception_id for exception_id in table["exceptions"]}
+    aliases = {}
+    for alias, target in table["aliases"].items():
+        aliases.setdefault(_alias_key(alias), target)
+    return licenses, exceptions, aliases
+
+
+LICENSES, EXCEPTIONS, ALIASES = _load_aliases()
+
+
+def _license_ref(term):
+    if term.startswith(("LicenseRef-", "DocumentRef-")):
+        return term
+    return "LicenseRef-" + re.sub(r"[^A-Za-z0-9.]+", "-", term).strip("-")
+
+
+def _resolve_term(term):
+    """
+    Returns the parsed node for one license term (one or more words between operators).
+    """
+    key = _alias_key(term)
+    if key in LICENSES:
+        return ("LICENSE", LICENSES[key])
+    if key in ALIASES:
+        return parse_expression(ALIASES[key])
+    # "MIT or Apache 2.0": lowercase operators only count when every part is a known license
+    if LOWERCASE_OPERATOR.search(term):
+        parts = re.split(r"\s+or\s+", term, flags=re.IGNORECASE)
+        if len(parts) > 1:
+            alternatives = [_resolve_term(part) for part in parts]
+            if all(_is_known(node) for node in alternatives):
+                return _combine("OR", alternatives)
+        parts = re.split(r"\s+and\s+", term, flags=re.IGNORECASE)
+        if len(parts) > 1:
+            conjuncts = [_resolve_term(part) for part in parts]
+            if all(_is_known(node) for node in conjuncts):
+                return _combine("AND", conjuncts)
+    return ("LICENSE", _license_ref(term))
+
+
+def _is_known(node):
+    if node[0] == "LICENSE":
+        return not node[1].startswith("LicenseRef-")
+    if node[0] == "WITH":
+        return _is_known(node[1])
+    return all(_is_known(child) for child in node[1])
+
+
+def _combine(operator, nodes):
+    """
+    Builds an AND / OR node, flattening nested nodes of the same operator and dropping duplicates.
+    """
+    children = []
+    for node in nodes:
+        for child in (node[1] if node[0] == operator else (node,)):
+            if child not in children:
+                children.append(child)
+    return children[0] if len(children) == 1 else (operator, tuple(children))
+
+
+class _Parser:
+    """
+    Recursive-descent parser over SPDX tokens; WITH binds tighter than AND, AND tighter than OR.
+    """
+    def __init__(self, text):
+        self.tokens = TOKEN.findall(text)
+        self.position = 0
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def parse(self):
+        node = self.parse_or()
+        if self.peek() is not None:
+            raise ValueError(f"Unexpected {self.peek()!r} in license expression")
+        return node
+
+    def parse_or(self):
+        nodes = [self.parse_and()]
+        while self.peek() == "OR":
+            self.position += 1
+            nodes.append(self.parse_and())
+        return _combine("OR", nodes)
+
+    def parse_and(self):
+        nodes = [self.parse_with()]
+        while self.peek() == "AND":
+            self.position += 1
+            nodes.append(self.parse_with())
+        return _combine("AND", nodes)
+
+    def parse_with(self):
+        node = self.parse_primary()
+        if self.peek() == "WITH":
+            self.position += 1
+            exception = self.parse_term()
+            node = ("WITH", node, EXCEPTIONS.get(_alias_key(exception), exception))
+        return node
+
+    def parse_primary(self):
+        if self.peek() == "(":
+            self.position += 1
+            node = self.parse_or()
+            if self.peek() != ")":
+                raise ValueError("Unbalanced parentheses in license expression")
+            self.position += 1
+            return node
+        return _resolve_term(self.parse_term())
+
+    def parse_term(self):
+        words = []
+        while self.peek() not in (None, "(", ")") and self.peek() not in OPERATORS:
+            words.append(self.tokens[self.position])
+            self.position += 1
+        if not words:
+            raise ValueError(f"Expected a license at {self.peek()!r}")
+        return " ".join(words)
+
+
+@lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def parse_expression(text):
+    """
+    Parses an SPDX license expression (AND / OR / WITH, parentheses) into a tree of tuples:
+    ("LICENSE", id), ("WITH", node, exception_id), ("AND", (nodes...)) or ("OR", (nodes...)).
+
+    Free-form names are mapped to canonical IDs through the bundled alias table; unknown names
+    become LicenseRef-* IDs. A string that is itself a known alias (even one containing "and")
+    is resolved as a whole before it is tokenized.
+
+    Raises:
+        ValueError: If the expression is empty or syntactically invalid.
+    """
+    text = text.strip()
+    if text.count("(") == text.count(")"):
+        key = _alias_key(text)
+        if key in LICENSES:
+            return ("LICENSE", LICENSES[key])
+        if key in ALIASES:
+            return parse_expression(ALIASES[key])
+    return _Parser(OR_LATER.sub("+", text)).parse()
+
+
+def render_expression(node, parent=None):
+    """
+    Renders a parsed expression tree back to a canonical SPDX expression string.
+    """
+    if node[0] == "LICENSE":
+        return node[1]
+    if node[0] == "WITH":
+        return f"{render_expression(node[1], 'WITH')} WITH {node[2]}"
+    rendered = f" {node[0]} ".join(render_expression(child, node[0]) for child in node[1])
+    # OR binds loosest, so it needs parentheses inside AND / WITH; AND needs them inside WITH
+    if (node[0] == "OR" and parent in ("AND", "WITH")) or (node[0] == "AND" and parent == "WITH"):
+        return f"({rendered})"
+    return rendered
+
+
+@lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def normalize_expression(text):
+    """
+    Returns the canonical SPDX expression for a license string ("Apache 2.0" -> "Apache-2.0",
+    "GPL-2.0+ OR mit" -> "GPL-2.0-or-later OR MIT"), or None for an empty value.
+    Strings that cannot be parsed are returned stripped but otherwise unchanged.
+    """
+    if text is None or not text.strip():
+        return None
+    try:
+        return render_expression(parse_expression(text))
+    except ValueError:
+        return text.strip()
+
+
+def combine_expressions(expressions, operator="AND"):
+    """
+    Joins several license strings into one normalized expression, e.g. the discovered
+    expressions of a package, dropping duplicates and adding parentheses where needed.
+    Returns None if no expression is given.
+    """
+    nodes = []
+    for expression in expressions:
+        if not expression or not expression.strip():
+            continue
+        try:
+            nodes.append(parse_expression(expression))
+        except ValueError:
+            nodes.append(("LICENSE", expression.strip()))
+    if not nodes:
+        return None
+    return render_expression(_combine(operator, nodes))
+
+
+def get_expression_cache_info():
+    """
+    Returns the hit / miss counts of the normalization cache.
+    """
+    return normalize_expression.cache_info()
@@ -0,0 +1,151 @@
+import os
+import re
+import threading
+
+from license_utils.expression import normalize_expression
+
+# Bundled SPDX license texts, one "<SPDX-ID>.txt" per license, named with current SPDX IDs.
+# A license text alone does not say whether later versions may be used (that choice is made
+# in a project's notices), so the GPL family is stored under its "-only" IDs, as the SPDX list
+# does for the bare texts. The GPL, LGPL and MPL texts are complete; AGPL-3.0, EPL and CC0 are
+# stored as their opening sections, so those are identified from their preambles alone.
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "licenses")
+
+# Word n-gram size used for matching
+SHINGLE_SIZE = 3
+
+# Only the start of a file is scanned; every bundled text fits within this many words
+MAX_TOKENS = 8000
+
+# Matches below this share of a license's n-grams are not reported
+MIN_CONFIDENCE = 0.5
+
+# Size of each license's bottom-k MinHash sketch, and the sketch hit rate a text needs before
+# the license's full n-gram set is compared (kept well below MIN_CONFIDENCE to allow for sampling error)
+SKETCH_SIZE = 32
+SKETCH_THRESHOLD = 0.3
+
+# Candidates this close to the best score are ranked by how many n-grams they matched,
+# so a BSD-3-Clause text is not reported as BSD-2-Clause (whose text it contains)
+TIE_MARGIN = 0.05
+
+SPDX_IDENTIFIER = re.compile(r"SPDX-License-Identifier:\s*(.+)")
+COPYRIGHT_LINE = re.compile(r"^\s*(copyright\s*(\(c\)|©|\d{4})|\(c\)|©).*$", re.IGNORECASE | re.MULTILINE)
+
+# Byte translation table that keeps [a-z0-9] and turns everything else into a word separator
+WORD_BYTES = bytes(c if chr(c).isascii() and chr(c).isalnum() and not chr(c).isupper() else 32 for c in range(256))
+
+
+def tokenize(text):
+    """
+    Returns the lowercased ASCII words of a text as bytes.
+    """
+    return text.lower().encode("ascii", "ignore").translate(WORD_BYTES).split()
+
+
+def shingles(tokens):
+    """
+    Returns the set of hashed word n-grams of a token list.
+    """
+    return set(map(hash, zip(*(tokens[i:] for i in range(SHINGLE_SIZE)))))
+
+
+def find_spdx_identifier(text):
+    """
+    Returns the value of the first "SPDX-License-Identifier:" line in a text, or None.
+    """
+    match = SPDX_IDENTIFIER.search(text)
+    if match:
+        return match.group(1).strip().rstrip("*/#-> ").strip() or None
+    return None
+
+
+class LicenseIndex:
+    """
+    Precomputed word n-gram sets and MinHash sketches of the bundled license texts.
+
+    A file is classified by building its n-gram set once and scoring each license by the share
+    of its own n-grams found in the file (its "confidence"). Each license's sketch is checked
+    first, so only the few plausible licenses pay for a full set intersection.
+    """
+    def __init__(self, corpus_dir=CORPUS_DIR):
+        self.license_ids = []
+        self.ngrams = []
+        self.sketches = []
+        for file_name in sorted(os.listdir(corpus_dir)):
+            if not file_name.endswith(".txt"):
+                continue
+            with open(os.path.join(corpus_dir, file_name), encoding="utf-8") as license_file:
+                # Copyright lines differ per project (and the FSF's own is part of the GPL texts)
+                text = COPYRIGHT_LINE.sub("", license_file.read())
+            self.license_ids.append(file_name[:-len(".txt")])
+            license_ngrams = frozenset(shingles(tokenize(text)))
+            self.ngrams.append(license_ngrams)
+            self.sketches.append(sorted(license_ngrams)[:SKETCH_SIZE])
+
+    def scores(self, text):
+        """
+        Returns [(spdx_id, confidence, matched_ngrams)] for every license whose sketch matches the text,
+        best first.
+        """
+        # Copyright lines are dropped as in the corpus, so they do not break the n-grams around them
+        text_ngrams = shingles(tokenize(COPYRIGHT_LINE.sub("", text))[:MAX_TOKENS])
+        results = []
+        for spdx_id, license_ngrams, sketch in zip(self.license_ids, self.ngrams, self.sketches):
+            if sum(map(text_ngrams.__contains__, sketch)) < SKETCH_THRESHOLD * len(sketch):
+                continue
+            count = len(license_ngrams & text_ngrams)
+            results.append((spdx_id, count / len(license_ngrams), count))
+        results.sort(key=lambda result: result[1], reverse=True)
+        return results
+
+    def identify(self, text):
+        """
+        Returns {"spdx_id", "confidence"} for the bundled license the text matches best,
+        or None if no license reaches MIN_CONFIDENCE.
+        """
+        results = self.scores(text)
+        if not results or results[0][1] < MIN_CONFIDENCE:
+            return None
+        contenders = [result for result in results if results[0][1] - result[1] <= TIE_MARGIN]
+        spdx_id, confidence, _ = max(contenders, key=lambda result: result[2])
+        return {"spdx_id": spdx_id, "confidence": round(confidence, 3)}
+
+
+_default_index = None
+_default_index_lock = threading.Lock()
+
+
+def get_license_index():
+    """
+    Returns the shared LicenseIndex over the bundled corpus, building it on first use.
+    """
+    global _default_index
+    with _default_index_lock:
+        if _default_index is None:
+            _default_index = LicenseIndex()
+        return _default_index
+
+
+def identify_license(text):
+    """
+    Identifies a license text against the bundled SPDX corpus.
+
+    Returns:
+        dict: {"spdx_id", "confidence"} with confidence in [0, 1], or None if the text is not recognised.
+    """
+    return get_license_index().identify(text)
+
+
+def get_license_name(text):
+    """
+    Returns a short name for a license file: its SPDX-License-Identifier if it declares one,
+    else the identified SPDX ID (both normalized), else its first non-empty line.
+    """
+    declared = find_spdx_identifier(text)
+    if declared:
+        return normalize_expression(declared)
+    match = identify_license(text)
+    if match:
+        return normalize_expression(match["spdx_id"])
+    return next((line.strip() for line in text.splitlines() if line.strip()), "")
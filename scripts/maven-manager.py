@@ -1,5 +1,8 @@
-import requests
 from datetime import datetime
+from xml.etree import ElementTree as ET
+from http_utils.cache import cached_get
+from maven_utils.inheritance import resolve_inherited, get_inheritance_stats
+from maven_utils.pom_parser import parse_pom, get_license_names
 
 # Package details for Maven
 group_id = "org.springframework"  # Example group ID
@@ -10,20 +13,23 @@ version = "5.3.9"                 # Example version
 maven_pom_url = f"https://repo1.maven.org/maven2/{group_id.replace('.', '/')}/{artifact_id}/{version}/{artifact_id}-{version}.pom"
 
 # Make the request to fetch the POM file
-response = requests.get(maven_pom_url)
+response = cached_get(maven_pom_url)
 
 # Check if the request was successful
 if response.status_code == 200:
-    pom_data = response.text
-    # Extract license information if available in the POM XML
-    licenses_start = pom_data.find("<licenses>")
-    licenses_end = pom_data.find("</licenses>") + len("</licenses>")
-    licenses_section = pom_data[licenses_start:licenses_end] if licenses_start != -1 else "No license info available in POM."
-    fetch_time = datetime.now().isoformat()
+    try:
+        # Extract license information if available in the POM XML
+        pom = resolve_inherited(parse_pom(response.content))  # fill in licenses/scm from parent POMs
+        license_names = get_license_names(pom)
+        licenses_section = ", ".join(license_names) if license_names else "No license info available in POM."
+        fetch_time = datetime.now().isoformat()
 
-    # Display the license section and fetch time
-    print("Licenses Section:", licenses_section)
-    print("Fetch Time:", fetch_time)
+        # Display the licenses and fetch time
+        print("Licenses:", licenses_section)
+        print("Fetch Time:", fetch_time)
+    except ET.ParseError:
+        print("Failed to parse the POM file.")
 else:
     print(f"Failed to fetch POM file with status code {response.status_code}")
-    print(response.text)
\ No newline at end of file
+    print(response.text)
+print("Parent POM memo stats:", get_inheritance_stats())
@@ -1,5 +1,8 @@
-import requests
 from xml.etree import ElementTree as ET
+from http_utils.cache import cached_get
+from git_utils.repo_url import canonical_repo_url, parse_repo_url
+from maven_utils.inheritance import resolve_inherited, get_inheritance_stats
+from maven_utils.pom_parser import parse_pom, get_repository_url
 
 # Package details for Maven
 group_id = "org.springframework"  # Example group ID
@@ -10,31 +13,23 @@ version = "5.3.9"                 # Example version
 maven_pom_url = f"https://repo1.maven.org/maven2/{group_id.replace('.', '/')}/{artifact_id}/{version}/{artifact_id}-{version}.pom"
 
 # Make the request to fetch the POM file
-response = requests.get(maven_pom_url)
+response = cached_get(maven_pom_url)
 
 if response.status_code == 200:
-    # Parse the POM XML content
-    pom_data = response.content
     try:
-        root = ET.fromstring(pom_data)
-
         # Try to find the repository URL in the <scm> section or <url> element
-        repository_url = None
-        scm = root.find(".//{http://maven.apache.org/POM/4.0.0}scm")
-        if scm is not None:
-            repository_url = scm.find("{http://maven.apache.org/POM/4.0.0}url")
-            repository_url = repository_url.text if repository_url is not None else None
-        else:
-            project_url = root.find(".//{http://maven.apache.org/POM/4.0.0}url")
-            repository_url = project_url.text if project_url is not None else None
+        pom = resolve_inherited(parse_pom(response.content))  # fill in licenses/scm from parent POMs
+        repository_url = get_repository_url(pom)
+        repo_key = parse_repo_url(repository_url)  # scm:git:git@github.com:... and browser URLs alike
 
         # Check if the repository URL is from GitHub
-        if repository_url and "github.com" in repository_url:
-            print("GitHub Repository URL:", repository_url)
+        if repo_key and repo_key[0] == "github.com":
+            print("GitHub Repository URL:", canonical_repo_url(repository_url))
         else:
             print("The repository is not hosted on GitHub or no repository URL found in the POM.")
     except ET.ParseError:
         print("Failed to parse the POM file.")
 else:
     print(f"Failed to fetch POM file with status code {response.status_code}")
-    print(response.text)
\ No newline at end of file
+    print(response.text)
+print("Parent POM memo stats:", get_inheritance_stats())
@@ -0,0 +1,152 @@
+import threading
+from xml.etree import ElementTree as ET
+
+from http_utils.cache import cached_get
+from maven_utils.pom_parser import parse_pom
+
+MAVEN_BASE_URL = "https://repo1.maven.org/maven2"
+
+# Longest parent chain followed before giving up (guards against cycles and broken metadata)
+MAX_PARENT_DEPTH = 10
+
+
+def pom_url(group_id, artifact_id, version, base_url=MAVEN_BASE_URL):
+    """
+    Builds the repository URL of the POM for a Maven coordinate.
+    """
+    return f"{base_url}/{group_id.replace('.', '/')}/{artifact_id}/{version}/{artifact_id}-{version}.pom"
+
+
+class ParentPomResolver:
+    """
+    Fills in licenses, scm and url that a POM inherits from its parent chain.
+
+    Effective parent records are memoized by parent GAV, so a popular parent such as
+    org.apache:apache:23 is fetched and parsed once per run however many children use it.
+
+    With a LocalRepository, POMs already in ~/.m2 are read from disk and only the rest are fetched.
+
+    Note: Maven appends the child artifactId to inherited scm urls; this resolver keeps the
+    parent's url unchanged, since the parent's repository is what license lookups need.
+    """
+    def __init__(self, base_url=MAVEN_BASE_URL, max_depth=MAX_PARENT_DEPTH, local_repository=None):
+        self.base_url = base_url
+        self.local_repository = local_repository
+        self.max_depth = max_depth
+        self.stats = {"hits": 0, "misses": 0}
+        self._memo = {}
+        self._key_locks = {}
+        self._lock = threading.Lock()
+
+    def fetch_pom(self, group_id, artifact_id, version):
+        """
+        Fetches and parses one POM. Returns the parsed record, or None if missing or malformed.
+        """
+        content = None
+        if self.local_repository is not None:
+            content = self.local_repository.read_pom(group_id, artifact_id, version)
+        if content is None:
+            response = cached_get(pom_url(group_id, artifact_id, version, self.base_url))
+            if response.status_code != 200:
+                return None
+            content = response.content
+        try:
+            return parse_pom(content)
+        except ET.ParseError:
+            return None
+
+    def resolve(self, record, depth=0):
+        """
+        Returns a copy of a parsed POM record with inherited fields filled in from its parents.
+
+        The copy carries an "inherited_from" dict naming the parent GAV ("group:artifact:version")
+        each of licenses, scm and url was taken from, or None where the POM declares its own.
+        """
+        effective = dict(record)
+        effective["inherited_from"] = {"licenses": None, "scm": None, "url": None}
+
+        parent = record.get("parent")
+        if not parent or not all((parent["group_id"], parent["artifact_id"], parent["version"])):
+            return effective
+
+        effective["group_id"] = effective["group_id"] or parent["group_id"]
+        effective["version"] = effective["version"] or parent["version"]
+        if effective["licenses"] and effective["scm"] and effective["url"]:
+            return effective
+        if depth >= self.max_depth:
+            return effective
+
+        gav = (parent["group_id"], parent["artifact_id"], parent["version"])
+        parent_effective = self._effective_parent(gav, depth)
+        if parent_effective is None:
+            return effective
+
+        gav_name = ":".join(gav)
+        for field in ("licenses", "scm", "url"):
+            if not effective[field] and parent_effective[field]:
+                effective[field] = parent_effective[field]
+                effective["inherited_from"][field] = parent_effective["inherited_from"][field] or gav_name
+        return effective
+
+    def _effective_parent(self, gav, depth):
+        """
+        Returns the memoized effective record of a parent POM, fetching it on first use.
+        """
+        with self._lock:
+            if gav in self._memo:
+                self.stats["hits"] += 1
+                return self._memo[gav]
+            key_lock = self._key_locks.setdefault(gav, threading.RLock())
+
+        # Concurrent children of the same parent wait here instead of fetching it twice
+        with key_lock:
+            with self._lock:
+                if gav in self._memo:
+                    self.stats["hits"] += 1
+                    return self._memo[gav]
+
+            record = self.fetch_pom(*gav)
+            effective = self.resolve(record, depth + 1) if record is not None else None
+
+            with self._lock:
+                self._memo[gav] = effective
+                self.stats["misses"] += 1
+        return effective
+
+    def hit_rate(self):
+        """
+        Returns the fraction of parent lookups served from the memo table.
+        """
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+
+
+_default_resolvers = {}
+_default_resolvers_lock = threading.Lock()
+
+
+def get_resolver(base_url=MAVEN_BASE_URL, local_repository=None):
+    """
+    Returns the process-wide ParentPomResolver for a registry base URL (and optional
+    LocalRepository), creating it on first use.
+    """
+    key = (base_url, local_repository.root if local_repository is not None else None)
+    with _default_resolvers_lock:
+        if key not in _default_resolvers:
+            _default_resolvers[key] = ParentPomResolver(base_url, local_repository=local_repository)
+        return _default_resolvers[key]
+
+
+def resolve_inherited(record, base_url=MAVEN_BASE_URL, local_repository=None):
+    """
+    Fills in inherited licenses, scm and url of a parsed POM using the shared memo table.
+    """
+    return get_resolver(base_url, local_repository).resolve(record)
+
+
+def get_inheritance_stats(base_url=MAVEN_BASE_URL, local_repository=None):
+    """
+    Returns memo hits, misses and hit rate of the shared parent POM resolver.
+    """
+    resolver = get_resolver(base_url, local_repository)
+    return dict(resolver.stats, hit_rate=resolver.hit_rate())
@@ -0,0 +1,72 @@
+import os
+import threading
+
+DEFAULT_LOCAL_REPOSITORY = os.path.join(os.path.expanduser("~"), ".m2", "repository")
+
+
+class LocalRepository:
+    """
+    Finds POMs in a local Maven repository (~/.m2/repository) without touching the network.
+
+    The repository is walked once, on first lookup, into a {(group_id, artifact_id, version): path}
+    map; every later lookup is a dict access.
+    """
+    def __init__(self, root=DEFAULT_LOCAL_REPOSITORY):
+        self.root = root
+        self._poms = None
+        self._lock = threading.Lock()
+
+    def _index(self):
+        with self._lock:
+            if self._poms is None:
+                self._poms = self._walk()
+            return self._poms
+
+    def _walk(self):
+        poms = {}
+        for dirpath, _, filenames in os.walk(self.root):
+            pom_files = sorted(name for name in filenames if name.endswith(".pom"))
+            if not pom_files:
+                continue
+            parts = os.path.relpath(dirpath, self.root).split(os.sep)
+            if len(parts) < 3:
+                continue
+            group_id, artifact_id, version = ".".join(parts[:-2]), parts[-2], parts[-1]
+            expected = f"{artifact_id}-{version}.pom"
+            # SNAPSHOT directories may only hold timestamped POMs; the newest sorts last
+            pom_file = expected if expected in pom_files else pom_files[-1]
+            poms[(group_id, artifact_id, version)] = os.path.join(dirpath, pom_file)
+        return poms
+
+    def find_pom(self, group_id, artifact_id, version):
+        """
+        Returns the path of a POM in the local repository, or None if it is not there.
+        """
+        return self._index().get((group_id, artifact_id, version))
+
+    def read_pom(self, group_id, artifact_id, version):
+        """
+        Returns the raw bytes of a POM from the local repository, or None if it is not there.
+        """
+        path = self.find_pom(group_id, artifact_id, version)
+        if path is None:
+            return None
+        with open(path, "rb") as pom_file:
+            return pom_file.read()
+
+    def __len__(self):
+        return len(self._index())
+
+
+_default_repositories = {}
+_default_repositories_lock = threading.Lock()
+
+
+def get_local_repository(root=DEFAULT_LOCAL_REPOSITORY):
+    """
+    Returns the process-wide LocalRepository for a directory, creating it on first use.
+    """
+    with _default_repositories_lock:
+        if root not in _default_repositories:
+            _default_repositories[root] = LocalRepository(root)
+        return _default_repositories[root]
@@ -0,0 +1,135 @@
+import io
+from xml.etree import ElementTree as ET
+
+# Top-level sections that never hold the fields we extract; their contents are discarded as they stream past
+SKIPPED_SECTIONS = {
+    "properties", "dependencyManagement", "dependencies", "repositories", "pluginRepositories",
+    "build", "reporting", "profiles", "modules", "developers", "contributors", "mailingLists",
+    "distributionManagement",
+}
+
+# Sections that conventionally come after the project header; once licenses and scm have been
+# seen, reaching one of them ends the scan
+TRAILING_SECTIONS = {
+    "properties", "dependencyManagement", "dependencies", "repositories", "pluginRepositories",
+    "build", "reporting", "profiles",
+}
+
+HEADER_FIELDS = ("groupId", "artifactId", "version", "parent", "url", "licenses", "scm")
+
+
+def _local_name(tag):
+    """
+    Strips the XML namespace from an element tag.
+    """
+    return tag.rsplit("}", 1)[-1]
+
+
+def _child_texts(element):
+    """
+    Maps the local names of an element's direct children to their stripped text.
+    """
+    return {_local_name(child.tag): (child.text or "").strip() for child in element}
+
+
+def parse_pom(pom_content):
+    """
+    Extracts coordinates, parent, licenses, scm and project url from a POM in one streaming pass.
+
+    The document is read with iterparse and the scan stops as soon as the fields are found,
+    so dependency and build sections of large POMs are never materialized.
+
+    Args:
+        pom_content (bytes or str): Raw POM document. Pass bytes where possible so the
+            encoding declared in the XML prolog is honored.
+
+    Returns:
+        dict: {"group_id", "artifact_id", "version", "url", "parent", "licenses", "scm"} where
+        parent and scm are dicts or None and licenses is a list of {"name", "url"} dicts.
+
+    Raises:
+        xml.etree.ElementTree.ParseError: If the document is not well-formed XML.
+    """
+    source = io.BytesIO(pom_content) if isinstance(pom_content, bytes) else io.StringIO(pom_content)
+    record = {
+        "group_id": None,
+        "artifact_id": None,
+        "version": None,
+        "url": None,
+        "parent": None,
+        "licenses": [],
+        "scm": None,
+    }
+    seen = set()
+    depth = 0
+    root = None
+    skipping = False
+
+    for event, element in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            depth += 1
+            if depth == 1:
+                root = element
+            elif depth == 2:
+                name = _local_name(element.tag)
+                if name in TRAILING_SECTIONS and {"licenses", "scm"} <= seen:
+                    break
+                skipping = name in SKIPPED_SECTIONS
+            continue
+
+        depth -= 1
+        if depth > 1:
+            if skipping:
+                element.clear()
+            continue
+        if depth == 0:
+            break
+
+        name = _local_name(element.tag)
+        if name in ("groupId", "artifactId", "version", "url"):
+            key = {"groupId": "group_id", "artifactId": "artifact_id"}.get(name, name)
+            record[key] = (element.text or "").strip() or None
+        elif name == "parent":
+            parent = _child_texts(element)
+            record["parent"] = {
+                "group_id": parent.get("groupId"),
+                "artifact_id": parent.get("artifactId"),
+                "version": parent.get("version"),
+                "relative_path": parent.get("relativePath"),
+            }
+        elif name == "licenses":
+            for license_element in element:
+                license_fields = _child_texts(license_element)
+                record["licenses"].append({"name": license_fields.get("name"), "url": license_fields.get("url")})
+        elif name == "scm":
+            scm = _child_texts(element)
+            record["scm"] = {
+                "url": scm.get("url"),
+                "connection": scm.get("connection"),
+                "developer_connection": scm.get("developerConnection"),
+                "tag": scm.get("tag"),
+            }
+
+        seen.add(name)
+        skipping = False
+        root.remove(element)
+        if seen.issuperset(HEADER_FIELDS):
+            break
+
+    return record
+
+
+def get_repository_url(record):
+    """
+    Returns the repository URL of a parsed POM: the scm url if present, else the project url.
+    """
+    scm = record.get("scm") or {}
+    return scm.get("url") or record.get("url")
+
+
+def get_license_names(record):
+    """
+    Returns the license names of a parsed POM, falling back to the license URL when unnamed.
+    """
+    return [license_info["name"] or license_info["url"] for license_info in record.get("licenses", [])
+            if license_info["name"] or license_info["url"]]
@@ -1,5 +1,5 @@
-import requests
 from datetime import datetime
+from http_utils.cache import cached_get
 
 # Package details
 package_manager = "npm"
@@ -10,7 +10,7 @@ package_version = "4.17.1"
 npm_url = f"https://registry.npmjs.org/{package_name}/{package_version}"
 
 # Make the request to npm registry
-response = requests.get(npm_url)
+response = cached_get(npm_url)
 
 # Check if the request was successful
 if response.status_code == 200:
@@ -1,21 +1,29 @@
-import requests
+from git_utils.repo_url import canonical_repo_url, group_by_repo
+from npm_utils.packument import get_packument_index
 
 # Package details for npm
 package_name = "express"
-package_version = "4.17.1"
+package_versions = ["4.17.1", "4.17.3", "4.18.2"]
 
-# npm Registry URL
-npm_url = f"https://registry.npmjs.org/{package_name}/{package_version}"
+# All versions are answered from one fetch of the package's packument
+packument_index = get_packument_index()
+versions = packument_index.get_versions(package_name)
 
-# Make the request to npm registry
-response = requests.get(npm_url)
+if versions is not None:
+    repository_urls = {}
+    for package_version in package_versions:
+        version_info = versions.get(package_version)
+        if version_info is None:
+            print(f"{package_name}@{package_version}: version not found in npm registry.")
+            continue
+        repository_urls[package_version] = version_info["repository"]
 
-if response.status_code == 200:
-    data = response.json()
-    repository_url = data.get("repository", {}).get("url", "")
-    if "github.com" in repository_url:
-        print("GitHub Repository URL:", repository_url)
-    else:
-        print("The repository is not hosted on GitHub or no repository URL found.")
+    # git+https://...git, git://, github:owner/repo all map to one (host, owner, repo) key
+    for repo_key, repo_versions in group_by_repo(repository_urls).items():
+        labels = ", ".join(f"{package_name}@{package_version}" for package_version in repo_versions)
+        if repo_key and repo_key[0] == "github.com":
+            print(f"{labels}: GitHub Repository URL:", canonical_repo_url(repository_urls[repo_versions[0]]))
+        else:
+            print(f"{labels}: The repository is not hosted on GitHub or no repository URL found.")
 else:
-    print("Failed to retrieve package information from npm registry.")
\ No newline at end of file
+    print("Failed to retrieve package information from npm registry.")
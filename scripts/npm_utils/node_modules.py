@@ -0,0 +1,96 @@
+import json
+import os
+import threading
+
+from npm_utils.packument import get_license, get_repository_url
+
+# Directories below a workspace root searched for node_modules folders
+MAX_WORKSPACE_DEPTH = 6
+
+# Directories never descended into while looking for node_modules folders
+SKIPPED_DIRECTORIES = (".git", ".hg", ".svn", ".cache", "__pycache__")
+
+
+class NodeModulesIndex:
+    """
+    Answers npm license / repository lookups from installed node_modules trees.
+
+    Every node_modules folder under the given roots (including nested ones and @scope
+    folders) is read once, on first lookup, into a compact {(name, version): {"license",
+    "repository"}} map, so a whole CI workspace is indexed with no network at all.
+    """
+    def __init__(self, roots=(".",), max_depth=MAX_WORKSPACE_DEPTH):
+        self.roots = tuple(roots)
+        self.max_depth = max_depth
+        self._packages = None
+        self._lock = threading.Lock()
+
+    def _index(self):
+        with self._lock:
+            if self._packages is None:
+                self._packages = {}
+                for root in self.roots:
+                    self._walk_workspace(os.path.abspath(root))
+            return self._packages
+
+    def _walk_workspace(self, root):
+        root_depth = root.rstrip(os.sep).count(os.sep)
+        for dirpath, dirnames, _ in os.walk(root):
+            if os.path.basename(dirpath) == "node_modules":
+                self._scan_node_modules(dirpath)
+                dirnames[:] = []
+                continue
+            if dirpath.count(os.sep) - root_depth >= self.max_depth:
+                dirnames[:] = [name for name in dirnames if name == "node_modules"]
+            else:
+                dirnames[:] = [name for name in dirnames if name not in SKIPPED_DIRECTORIES]
+
+    def _scan_node_modules(self, node_modules_dir):
+        for entry in os.scandir(node_modules_dir):
+            if entry.name.startswith(".") or not entry.is_dir():  # .bin, .package-lock.json
+                continue
+            if entry.name.startswith("@"):
+                for scoped in os.scandir(entry.path):
+                    if scoped.is_dir():
+                        self._add_package(scoped.path)
+            else:
+                self._add_package(entry.path)
+
+    def _add_package(self, package_dir):
+        try:
+            with open(os.path.join(package_dir, "package.json"), encoding="utf-8") as package_file:
+                package_data = json.load(package_file)
+        except (OSError, ValueError):
+            package_data = None
+        if isinstance(package_data, dict) and package_data.get("name") and package_data.get("version"):
+            self._packages.setdefault((package_data["name"], package_data["version"]), {
+                "license": get_license(package_data),
+                "repository": get_repository_url(package_data),
+            })
+        nested = os.path.join(package_dir, "node_modules")
+        if os.path.isdir(nested):
+            self._scan_node_modules(nested)
+
+    def get(self, package_name, package_version):
+        """
+        Returns {"license", "repository"} for an installed package version, or None if it is not installed.
+        """
+        return self._index().get((package_name, package_version))
+
+    def __len__(self):
+        return len(self._index())
+
+
+_default_indexes = {}
+_default_indexes_lock = threading.Lock()
+
+
+def get_node_modules_index(roots=(".",)):
+    """
+    Returns the process-wide NodeModulesIndex for a set of workspace roots, creating it on first use.
+    """
+    key = tuple(roots)
+    with _default_indexes_lock:
+        if key not in _default_indexes:
+            _default_indexes[key] = NodeModulesIndex(key)
+        return _default_indexes[key]
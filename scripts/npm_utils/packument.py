@@ -0,0 +1,119 @@
+import threading
+from collections import OrderedDict
+
+from http_utils.cache import cached_get
+
+NPM_BASE_URL = "https://registry.npmjs.org"
+
+# Packages whose per-version index is kept in memory at once (least recently used are dropped)
+MAX_INDEXED_PACKAGES = 1024
+
+
+def get_license(version_data):
+    """
+    Returns the license of an npm version document as a string, handling the legacy
+    {"type": ...} and "licenses": [...] forms. Returns None if no license is declared.
+    """
+    license_info = version_data.get("license")
+    if isinstance(license_info, dict):
+        license_info = license_info.get("type")
+    if not license_info and isinstance(version_data.get("licenses"), list):
+        types = [item.get("type") if isinstance(item, dict) else item for item in version_data["licenses"]]
+        types = [license_type for license_type in types if license_type]
+        license_info = " OR ".join(types) if types else None
+    return license_info or None
+
+
+def get_repository_url(version_data):
+    """
+    Returns the repository URL of an npm version document, which may be a string or a {"url": ...} dict.
+    """
+    repository = version_data.get("repository")
+    if isinstance(repository, dict):
+        repository = repository.get("url")
+    return repository or None
+
+
+class PackumentIndex:
+    """
+    Answers license and repository lookups for any version of an npm package from one packument.
+
+    The packument (/{name}) is fetched once per package and reduced to a compact
+    {version: {"license", "repository"}} map, so 50 versions of lodash cost one request.
+    Only the compact maps are kept, in an LRU of `max_packages` entries.
+
+    The abbreviated install metadata form (application/vnd.npm.install-v1+json) is not used:
+    it omits the license and repository fields this index needs.
+    """
+    def __init__(self, base_url=NPM_BASE_URL, max_packages=MAX_INDEXED_PACKAGES):
+        self.base_url = base_url
+        self.max_packages = max_packages
+        self.stats = {"hits": 0, "misses": 0}
+        self._index = OrderedDict()
+        self._key_locks = {}
+        self._lock = threading.Lock()
+
+    def fetch_versions(self, package_name):
+        """
+        Fetches a packument and reduces it to {version: {"license", "repository"}}.
+        Returns None if the package does not exist.
+        """
+        # Scoped packages need their slash encoded in the packument URL
+        response = cached_get(f"{self.base_url}/{package_name.replace('/', '%2F')}")
+        if response.status_code != 200:
+            return None
+        return {
+            version: {"license": get_license(version_data), "repository": get_repository_url(version_data)}
+            for version, version_data in response.json().get("versions", {}).items()
+        }
+
+    def get_versions(self, package_name):
+        """
+        Returns the compact version map of a package, fetching its packument on first use.
+        """
+        with self._lock:
+            if package_name in self._index:
+                self._index.move_to_end(package_name)
+                self.stats["hits"] += 1
+                return self._index[package_name]
+            key_lock = self._key_locks.setdefault(package_name, threading.Lock())
+
+        # Concurrent lookups of the same package wait here instead of fetching it twice
+        with key_lock:
+            with self._lock:
+                if package_name in self._index:
+                    self.stats["hits"] += 1
+                    return self._index[package_name]
+
+            versions = self.fetch_versions(package_name)
+
+            with self._lock:
+                self.stats["misses"] += 1
+                self._index[package_name] = versions
+                self._key_locks.pop(package_name, None)
+                while len(self._index) > self.max_packages:
+                    self._index.popitem(last=False)
+        return versions
+
+    def get(self, package_name, package_version):
+        """
+        Returns {"license", "repository"} for one version, or None if the package or version is unknown.
+        """
+        versions = self.get_versions(package_name)
+        if versions is None:
+            return None
+        return versions.get(package_version)
+
+
+_default_indexes = {}
+_default_indexes_lock = threading.Lock()
+
+
+def get_packument_index(base_url=NPM_BASE_URL):
+    """
+    Returns the process-wide PackumentIndex for a registry base URL, creating it on first use.
+    """
+    with _default_indexes_lock:
+        if base_url not in _default_indexes:
+            _default_indexes[base_url] = PackumentIndex(base_url)
+        return _default_indexes[base_url]
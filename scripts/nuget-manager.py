@@ -1,5 +1,5 @@
-import requests
 from datetime import datetime
+from http_utils.cache import cached_get
 
 # Package details for NuGet
 package_name = "Newtonsoft.Json"  # Example package name
@@ -9,7 +9,7 @@ version = "13.0.1"                # Example version
 nuget_metadata_url = f"https://api.nuget.org/v3-flatcontainer/{package_name.lower()}/{version}/{package_name.lower()}.nuspec"
 
 # Make the request to fetch the NuSpec metadata file
-response = requests.get(nuget_metadata_url)
+response = cached_get(nuget_metadata_url)
 
 # Check if the request was successful
 if response.status_code == 200:
@@ -1,30 +1,23 @@
-import requests
-from xml.etree import ElementTree as ET
+from git_utils.repo_url import canonical_repo_url, parse_repo_url
+from nuget_utils.registration import get_registration_reader
 
 # NuGet package name
 package_name = "Newtonsoft.Json"  # Example package name
+package_version = None            # Specific version, or None for the latest listed version
 
-# NuGet API URL for latest version metadata
-nuget_url = f"https://api.nuget.org/v3/registration5-semver1/{package_name.lower()}/index.json"
-
-# Make the request to NuGet API
-response = requests.get(nuget_url)
-
-if response.status_code == 200:
-    data = response.json()
-
-    # Get the latest package entry
-    latest_entry = data.get("items", [{}])[-1].get("items", [{}])[-1]
+# Only the registration page that holds the requested version is fetched
+catalog_entry = get_registration_reader().get_catalog_entry(package_name, package_version)
 
+if catalog_entry is not None:
     # Retrieve the repository URL from the catalog entry
-    repository_url = latest_entry.get("catalogEntry", {}).get("projectUrl", None)
+    repository_url = catalog_entry.get("projectUrl", None)
+    repo_key = parse_repo_url(repository_url)
 
-    if repository_url and "github.com" in repository_url:
-        print("GitHub Repository URL:", repository_url)
+    if repo_key and repo_key[0] == "github.com":
+        print("GitHub Repository URL:", canonical_repo_url(repository_url))
     elif repository_url:
         print("Repository URL:", repository_url)
     else:
         print("No repository URL found for the specified NuGet package.")
 else:
-    print(f"Request to NuGet API failed with status code {response.status_code}")
-    print(response.text)
\ No newline at end of file
+    print(f"No registration entry found for NuGet package {package_name}.")
@@ -1,6 +1,7 @@
-import requests
 from datetime import datetime
 import xml.etree.ElementTree as ET
+from http_utils.cache import cached_get
+from git_utils.repo_url import canonical_repo_url
 
 # Package details for NuGet
 package_name = "Newtonsoft.Json"  # Example package name
@@ -10,7 +11,7 @@ version = "13.0.1"                # Example version
 nuget_metadata_url = f"https://api.nuget.org/v3-flatcontainer/{package_name.lower()}/{version}/{package_name.lower()}.nuspec"
 
 # Make the request to fetch the NuSpec metadata file
-response = requests.get(nuget_metadata_url)
+response = cached_get(nuget_metadata_url)
 
 # Check if the request was successful
 if response.status_code == 200:
@@ -28,7 +29,8 @@ if response.status_code == 200:
     
     # Extract the Git URL from the repository element
     repository_url = root.find('.//ns:repository', namespace)
-    git_url = repository_url.get('url') if repository_url is not None else "No repository URL available in NuSpec."
+    git_url = repository_url.get('url') if repository_url is not None else None
+    git_url = canonical_repo_url(git_url) or git_url or "No repository URL available in NuSpec."
     
     fetch_time = datetime.now().isoformat()
 
@@ -0,0 +1,79 @@
+import os
+import threading
+from xml.etree import ElementTree as ET
+
+from nuget_utils.nuspec_parser import parse_nuspec
+
+# NuGet's global packages folder: $NUGET_PACKAGES, else ~/.nuget/packages
+DEFAULT_GLOBAL_PACKAGES = os.environ.get("NUGET_PACKAGES") or os.path.join(os.path.expanduser("~"), ".nuget", "packages")
+
+
+class GlobalPackagesFolder:
+    """
+    Finds nuspecs in NuGet's global packages folder (<root>/<id>/<version>/<id>.nuspec).
+
+    The folder is listed once, on first lookup, into a {(id, version): path} map with
+    lowercased keys, matching the folder's own lowercase layout.
+    """
+    def __init__(self, root=DEFAULT_GLOBAL_PACKAGES):
+        self.root = root
+        self._nuspecs = None
+        self._lock = threading.Lock()
+
+    def _index(self):
+        with self._lock:
+            if self._nuspecs is None:
+                self._nuspecs = self._walk()
+            return self._nuspecs
+
+    def _walk(self):
+        nuspecs = {}
+        if not os.path.isdir(self.root):
+            return nuspecs
+        for package_dir in os.scandir(self.root):
+            if not package_dir.is_dir():
+                continue
+            for version_dir in os.scandir(package_dir.path):
+                path = os.path.join(version_dir.path, f"{package_dir.name}.nuspec")
+                if version_dir.is_dir() and os.path.isfile(path):
+                    nuspecs[(package_dir.name.lower(), version_dir.name.lower())] = path
+        return nuspecs
+
+    def read_nuspec(self, package_id, version):
+        """
+        Returns the nuspec text of an installed package, or None if it is not in the folder.
+        """
+        path = self._index().get((package_id.lower(), version.lower()))
+        if path is None:
+            return None
+        with open(path, encoding="utf-8-sig") as nuspec_file:
+            return nuspec_file.read()
+
+    def get_record(self, package_id, version):
+        """
+        Returns the parsed nuspec record (see parse_nuspec) of an installed package, or None.
+        """
+        content = self.read_nuspec(package_id, version)
+        if content is None:
+            return None
+        try:
+            return parse_nuspec(content)
+        except ET.ParseError:
+            return None
+
+    def __len__(self):
+        return len(self._index())
+
+
+_default_folders = {}
+_default_folders_lock = threading.Lock()
+
+
+def get_global_packages(root=DEFAULT_GLOBAL_PACKAGES):
+    """
+    Returns the process-wide GlobalPackagesFolder for a directory, creating it on first use.
+    """
+    with _default_folders_lock:
+        if root not in _default_folders:
+            _default_folders[root] = GlobalPackagesFolder(root)
+        return _default_folders[root]
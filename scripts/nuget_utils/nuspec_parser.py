@@ -0,0 +1,75 @@
+from xml.etree import ElementTree as ET
+
+
+def _local_name(tag):
+    """
+    Strips the XML namespace from an element tag (nuspec namespaces vary by schema version).
+    """
+    return tag.rsplit("}", 1)[-1]
+
+
+def parse_nuspec(nuspec_content):
+    """
+    Extracts id, version, license, repository and project url from a .nuspec document.
+
+    Args:
+        nuspec_content (bytes or str): Raw nuspec XML.
+
+    Returns:
+        dict: {"id", "version", "license", "license_type", "license_url", "project_url",
+        "repository"} where repository is a {"type", "url", "commit"} dict or None.
+
+    Raises:
+        xml.etree.ElementTree.ParseError: If the document is not well-formed XML.
+    """
+    root = ET.fromstring(nuspec_content)
+    record = {
+        "id": None,
+        "version": None,
+        "license": None,
+        "license_type": None,
+        "license_url": None,
+        "project_url": None,
+        "repository": None,
+    }
+
+    metadata = next((child for child in root if _local_name(child.tag) == "metadata"), None)
+    if metadata is None:
+        return record
+
+    for element in metadata:
+        name = _local_name(element.tag)
+        text = (element.text or "").strip() or None
+        if name == "id":
+            record["id"] = text
+        elif name == "version":
+            record["version"] = text
+        elif name == "license":
+            record["license"] = text
+            record["license_type"] = element.get("type")
+        elif name == "licenseUrl":
+            record["license_url"] = text
+        elif name == "projectUrl":
+            record["project_url"] = text
+        elif name == "repository":
+            record["repository"] = {
+                "type": element.get("type"),
+                "url": element.get("url"),
+                "commit": element.get("commit"),
+            }
+    return record
+
+
+def get_repository_url(record):
+    """
+    Returns the repository URL of a parsed nuspec: the <repository url> if present, else projectUrl.
+    """
+    repository = record.get("repository") or {}
+    return repository.get("url") or record.get("project_url")
+
+
+def get_license(record):
+    """
+    Returns the license of a parsed nuspec: the license expression or file name, else the licenseUrl.
+    """
+    return record.get("license") or record.get("license_url")
@@ -0,0 +1,126 @@
+import threading
+
+from http_utils.cache import cached_get
+
+REGISTRATION_BASE_URL = "https://api.nuget.org/v3/registration5-semver1"
+
+
+def version_key(version):
+    """
+    Returns a sort key for a NuGet version following SemVer 2.0 precedence.
+
+    Build metadata is ignored, missing numeric parts count as 0 ("1.0" == "1.0.0.0"),
+    a release sorts after its pre-releases, and pre-release labels compare
+    numerically or case-insensitively part by part.
+    """
+    version = version.split("+", 1)[0]
+    release, _, prerelease = version.partition("-")
+    numbers = [int(part) if part.isdigit() else 0 for part in release.split(".")]
+    numbers = tuple((numbers + [0, 0, 0, 0])[:4])
+    if not prerelease:
+        return numbers, (1,)
+    labels = tuple((0, int(part), "") if part.isdigit() else (1, 0, part.lower()) for part in prerelease.split("."))
+    return numbers, (0,) + labels
+
+
+def is_prerelease(version):
+    """
+    Returns True if a NuGet version carries a pre-release label.
+    """
+    return "-" in version.split("+", 1)[0]
+
+
+class RegistrationReader:
+    """
+    Reads NuGet registration metadata page by page instead of loading the whole registration.
+
+    The registration index lists pages with their lower/upper version bounds; for large
+    packages the pages are not inlined. Only the page that can contain the requested (or
+    latest) version is fetched, and fetched pages are kept in memory by URL.
+    """
+    def __init__(self, base_url=REGISTRATION_BASE_URL):
+        self.base_url = base_url
+        self._pages = {}
+        self._lock = threading.Lock()
+
+    def _get_json(self, url):
+        """
+        Fetches a registration document, or None if it does not exist.
+        """
+        response = cached_get(url)
+        if response.status_code != 200:
+            return None
+        return response.json()
+
+    def get_index(self, package_id):
+        """
+        Returns the registration index of a package, or None if the package is unknown.
+        """
+        return self._get_json(f"{self.base_url}/{package_id.lower()}/index.json")
+
+    def get_page_items(self, page):
+        """
+        Returns the leaves of a registration page, fetching the page if it is not inlined.
+        """
+        if "items" in page:
+            return page["items"]
+        url = page["@id"]
+        with self._lock:
+            if url in self._pages:
+                return self._pages[url]
+        data = self._get_json(url)
+        items = data.get("items", []) if data else []
+        with self._lock:
+            self._pages[url] = items
+        return items
+
+    def get_leaf(self, package_id, version=None, include_prerelease=True):
+        """
+        Returns the registration leaf for one version of a package, or for its latest listed
+        version when `version` is None. Returns None if nothing matches.
+        """
+        index = self.get_index(package_id)
+        if index is None:
+            return None
+        pages = sorted(index.get("items", []), key=lambda page: version_key(page.get("upper", "0")))
+
+        if version is not None:
+            key = version_key(version)
+            for page in pages:
+                if version_key(page.get("lower", "0")) <= key <= version_key(page.get("upper", "0")):
+                    for leaf in self.get_page_items(page):
+                        if version_key(leaf.get("catalogEntry", {}).get("version", "0")) == key:
+                            return leaf
+            return None
+
+        # Latest: walk pages from the newest down until a page has a listed candidate
+        for page in reversed(pages):
+            candidates = [
+                leaf for leaf in self.get_page_items(page)
+                if leaf.get("catalogEntry", {}).get("listed", True)
+                and (include_prerelease or not is_prerelease(leaf["catalogEntry"].get("version", "")))
+            ]
+            if candidates:
+                return max(candidates, key=lambda leaf: version_key(leaf["catalogEntry"].get("version", "0")))
+        return None
+
+    def get_catalog_entry(self, package_id, version=None, include_prerelease=True):
+        """
+        Returns the catalogEntry (projectUrl, licenseExpression, ...) for a version, or None.
+        """
+        leaf = self.get_leaf(package_id, version, include_prerelease)
+        return leaf.get("catalogEntry") if leaf else None
+
+
+_default_readers = {}
+_default_readers_lock = threading.Lock()
+
+
+def get_registration_reader(base_url=REGISTRATION_BASE_URL):
+    """
+    Returns the process-wide RegistrationReader for a registration base URL, creating it on first use.
+    """
+    with _default_readers_lock:
+        if base_url not in _default_readers:
+            _default_readers[base_url] = RegistrationReader(base_url)
+        return _default_readers[base_url]
@@ -1,26 +1,23 @@
-import requests
 from datetime import datetime
+from pypi_utils.project_index import get_project_index
 
 # Package details
 package_manager = "pip"
 package_name = "flask"
-package_version = "2.0.1"
+package_versions = ["2.0.1", "2.0.3", "2.2.5"]
 
-# PyPI URL
-pypi_url = f"https://pypi.org/pypi/{package_name}/{package_version}/json"
+# One /pypi/{name}/json call per project, plus one version-specific call per older release;
+# pass verify=False to bisect between releases instead (such results carry "inferred": True)
+metadata_by_version = get_project_index().get_many(package_name, package_versions)
+fetch_time = datetime.now().isoformat()
 
-# Make the request to PyPI API
-response = requests.get(pypi_url)
+for package_version, metadata in metadata_by_version.items():
+    if metadata is not None:
+        license_info = metadata["license"] or "No license info available"
 
-# Check if the request was successful
-if response.status_code == 200:
-    data = response.json()
-    license_info = data.get("info", {}).get("license", "No license info available")
-    fetch_time = datetime.now().isoformat()
-
-    # Display the license and fetch time
-    print("License:", license_info)
-    print("Fetch Time:", fetch_time)
-else:
-    print(f"Request to PyPI failed with status code {response.status_code}")
-    print(response.text)
\ No newline at end of file
+        # Display the license and fetch time
+        print(f"{package_name}=={package_version} License:", license_info)
+        print(f"{package_name}=={package_version} License Classifiers:", metadata["classifiers"])
+        print("Fetch Time:", fetch_time)
+    else:
+        print(f"{package_name}=={package_version} not found on PyPI")
@@ -0,0 +1,251 @@
+import bisect
+import re
+import threading
+
+from http_utils.cache import cached_get
+from license_utils.expression import normalize_expression
+from license_utils.identify import get_license_name
+
+PYPI_BASE_URL = "https://pypi.org/pypi"
+
+# project_urls labels that usually point at the source repository, in order of preference
+REPOSITORY_URL_LABELS = ("source", "source code", "repository", "code", "github", "homepage", "home")
+
+# License field values that only say the license was not filled in (setuptools writes "UNKNOWN")
+LICENSE_PLACEHOLDERS = {"unknown", "none", "null", "n/a", "na", "-", "license", "see license"}
+
+
+def normalize_project_name(name):
+    """
+    Normalizes a PyPI project name as in PEP 503, so "Flask_Login" and "flask-login" share one entry.
+    """
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def normalize_license(value):
+    """
+    Normalizes PyPI's license_expression / free-form license field to a canonical SPDX expression.
+    Multi-line values are whole license texts and are identified against the bundled corpus.
+    Empty values and placeholders such as "UNKNOWN" return None.
+    """
+    if not value or value.strip().strip(".").lower() in LICENSE_PLACEHOLDERS | {""}:
+        return None
+    if "\n" in value.strip():
+        return get_license_name(value)
+    return normalize_expression(value)
+
+
+def _extract_metadata(info):
+    """
+    Reduces the "info" section of a PyPI JSON response to the fields license lookups need.
+    """
+    return {
+        "license": normalize_license(info.get("license_expression") or info.get("license")),
+        "project_urls": info.get("project_urls") or {},
+        "classifiers": [classifier for classifier in info.get("classifiers") or []
+                        if classifier.startswith("License ::")],
+        "home_page": info.get("home_page") or None,
+    }
+
+
+def get_repository_url(metadata):
+    """
+    Picks the most likely source repository URL from compact project metadata.
+    """
+    project_urls = {label.lower(): url for label, url in metadata["project_urls"].items()}
+    for label in REPOSITORY_URL_LABELS:
+        if project_urls.get(label):
+            return project_urls[label]
+    for url in project_urls.values():
+        if "github.com" in url or "gitlab.com" in url:
+            return url
+    return metadata["home_page"]
+
+
+class ProjectIndex:
+    """
+    Answers license, project_urls and license classifiers for any release of a PyPI project.
+
+    The project document (/pypi/{name}/json) is fetched once per project; its "info" section
+    describes the latest release. Other releases are fetched from their version-specific
+    document, batched per project: versions registered with expect() are fetched together
+    with the first lookup of their project.
+
+    With verify=False, releases are instead resolved by bisecting the upload-ordered release
+    list: when two fetched releases carry identical metadata, every release between them is
+    assumed to share it. That assumption misses a change that is later reverted (A, B, A), so
+    such results carry "inferred": True and a verified lookup fetches them again.
+    """
+    def __init__(self, base_url=PYPI_BASE_URL):
+        self.base_url = base_url
+        self.stats = {"project_fetches": 0, "version_fetches": 0, "inferred": 0, "batched": 0}
+        self._projects = {}
+        self._expected = {}
+        self._key_locks = {}
+        self._lock = threading.Lock()
+
+    def _fetch_project(self, name):
+        """
+        Fetches the project document and builds its compact cache entry, or None if unknown.
+        """
+        response = cached_get(f"{self.base_url}/{name}/json")
+        with self._lock:
+            self.stats["project_fetches"] += 1
+        if response.status_code != 200:
+            return None
+        data = response.json()
+
+        # Order releases by their first upload; releases without files cannot be placed
+        upload_times = {}
+        for version, files in data.get("releases", {}).items():
+            times = [file_info.get("upload_time_iso_8601") or file_info.get("upload_time") for file_info in files]
+            times = [upload_time for upload_time in times if upload_time]
+            if times:
+                upload_times[version] = min(times)
+        order = sorted(upload_times, key=upload_times.get)
+
+        latest = data.get("info", {}).get("version")
+        return {
+            "order": order,
+            "positions": {version: position for position, version in enumerate(order)},
+            "known": {latest: _extract_metadata(data.get("info", {}))} if latest else {},
+            "inferred": set(),
+        }
+
+    def _fetch_version(self, name, version):
+        """
+        Fetches the version-specific document for one release, or None if it does not exist.
+        """
+        response = cached_get(f"{self.base_url}/{name}/{version}/json")
+        with self._lock:
+            self.stats["version_fetches"] += 1
+        if response.status_code != 200:
+            return None
+        return _extract_metadata(response.json().get("info", {}))
+
+    def _bisect(self, name, project, low, high, wanted):
+        """
+        Fills in metadata for the wanted positions strictly between two known positions.
+        """
+        order, known = project["order"], project["known"]
+        inside = [position for position in wanted if low < position < high]
+        if not inside:
+            return
+        if known[order[low]] == known[order[high]]:
+            for position in inside:
+                known[order[position]] = known[order[low]]
+                project["inferred"].add(order[position])
+            with self._lock:
+                self.stats["inferred"] += len(inside)
+            return
+
+        middle = (low + high) // 2
+        metadata = self._fetch_version(name, order[middle])
+        if metadata is None:
+            # Yanked or missing release in the middle: fall back to direct calls for this span
+            for position in inside:
+                known[order[position]] = self._fetch_version(name, order[position])
+            return
+        known[order[middle]] = metadata
+        self._bisect(name, project, low, middle, inside)
+        self._bisect(name, project, middle, high, inside)
+
+    @staticmethod
+    def _anchor_positions(project):
+        """
+        Returns the sorted release positions whose metadata was fetched and is usable as bisection anchors.
+        """
+        positions = project["positions"]
+        return sorted(positions[version] for version, metadata in project["known"].items()
+                      if metadata is not None and version in positions and version not in project["inferred"])
+
+    def expect(self, name, versions):
+        """
+        Registers releases that are about to be looked up, so they are fetched in one batch
+        with the next lookup of their project.
+        """
+        key = normalize_project_name(name)
+        with self._lock:
+            self._expected.setdefault(key, set()).update(versions)
+
+    def get_many(self, name, versions, verify=True):
+        """
+        Returns {version: metadata} for the requested releases of one project.
+
+        metadata is {"license", "project_urls", "classifiers", "home_page"}, or None when the
+        project or release is unknown. With verify=False, releases between two releases with
+        identical metadata are not fetched, and their metadata carries "inferred": True.
+        """
+        key = normalize_project_name(name)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            if key not in self._projects:
+                self._projects[key] = self._fetch_project(name)
+            project = self._projects[key]
+
+            # Collected after the project fetch, so releases registered meanwhile join this batch
+            with self._lock:
+                expected = self._expected.pop(key, set()) - set(versions)
+            if project is None:
+                return {version: None for version in versions}
+            batch = list(dict.fromkeys(versions)) + sorted(expected)
+            with self._lock:
+                self.stats["batched"] += len(expected)
+
+            known, inferred = project["known"], project["inferred"]
+            if verify:
+                for version in batch:
+                    if version not in known or version in inferred:
+                        known[version] = self._fetch_version(name, version)
+                        inferred.discard(version)
+            else:
+                self._infer(name, project, batch)
+
+            return {version: dict(known[version], inferred=True) if version in inferred else known.get(version)
+                    for version in versions}
+
+    def _infer(self, name, project, versions):
+        """
+        Fills in metadata for the given releases, bisecting between the nearest known releases.
+        """
+        known, positions, order = project["known"], project["positions"], project["order"]
+        for version in versions:
+            if version not in known and version not in positions:
+                known[version] = self._fetch_version(name, version)
+
+        wanted = sorted(positions[version] for version in set(versions) if version not in known)
+        known_positions = self._anchor_positions(project)
+        for position in wanted:
+            if order[position] in known:
+                continue
+            # Anchor each span on the nearest known releases, fetching the release itself at the edges
+            index = bisect.bisect_left(known_positions, position)
+            if index == 0 or index == len(known_positions):
+                known[order[position]] = self._fetch_version(name, order[position])
+                bisect.insort(known_positions, position)
+                continue
+            low, high = known_positions[index - 1], known_positions[index]
+            self._bisect(name, project, low, high, [p for p in wanted if low < p < high])
+            known_positions = self._anchor_positions(project)
+
+    def get(self, name, version, verify=True):
+        """
+        Returns the metadata of one release, or None if the project or release is unknown.
+        """
+        return self.get_many(name, [version], verify)[version]
+
+
+_default_indexes = {}
+_default_indexes_lock = threading.Lock()
+
+
+def get_project_index(base_url=PYPI_BASE_URL):
+    """
+    Returns the process-wide ProjectIndex for a registry base URL, creating it on first use.
+    """
+    with _default_indexes_lock:
+        if base_url not in _default_indexes:
+            _default_indexes[base_url] = ProjectIndex(base_url)
+        return _default_indexes[base_url]
@@ -0,0 +1,109 @@
+import os
+import sys
+import threading
+from email.parser import BytesHeaderParser
+
+from pypi_utils.project_index import normalize_project_name, normalize_license
+
+# Metadata directories of installed distributions and the metadata file inside each
+METADATA_FILES = {".dist-info": "METADATA", ".egg-info": "PKG-INFO"}
+
+
+def default_site_packages_dirs():
+    """
+    Returns the directories on sys.path, i.e. the running interpreter's (or virtualenv's) site-packages.
+    """
+    return tuple(path for path in sys.path if path and os.path.isdir(path))
+
+
+def _parse_metadata(path):
+    """
+    Reduces a METADATA / PKG-INFO file to the compact shape PyPIProjectIndex uses.
+    """
+    with open(path, "rb") as metadata_file:
+        message = BytesHeaderParser().parse(metadata_file)
+    project_urls = {}
+    for value in message.get_all("Project-URL") or []:
+        label, _, url = value.partition(",")
+        if url.strip():
+            project_urls[label.strip()] = url.strip()
+    home_page = message.get("Home-page")
+    return {
+        "license": normalize_license(message.get("License-Expression") or message.get("License")),
+        "project_urls": project_urls,
+        "classifiers": [classifier for classifier in message.get_all("Classifier") or []
+                        if classifier.startswith("License ::")],
+        "home_page": home_page if home_page and home_page != "UNKNOWN" else None,
+    }
+
+
+class SitePackagesIndex:
+    """
+    Answers PyPI metadata lookups from installed distributions (*.dist-info / *.egg-info).
+
+    The directories are listed once, on first lookup, into a {(normalized name, version): path}
+    map; a distribution's METADATA is only read and parsed the first time it is asked for.
+    """
+    def __init__(self, paths=None):
+        self.paths = tuple(paths) if paths is not None else default_site_packages_dirs()
+        self._distributions = None
+        self._metadata = {}
+        self._lock = threading.Lock()
+
+    def _index(self):
+        with self._lock:
+            if self._distributions is None:
+                self._distributions = self._walk()
+            return self._distributions
+
+    def _walk(self):
+        distributions = {}
+        for path in self.paths:
+            if not os.path.isdir(path):
+                continue
+            for entry in os.scandir(path):
+                suffix = os.path.splitext(entry.name)[1]
+                if suffix not in METADATA_FILES or not entry.is_dir():
+                    continue
+                # "{name}-{version}.dist-info"; egg-info may carry a "-py3.x" tag after the version
+                name, _, rest = entry.name[:-len(suffix)].partition("-")
+                version = rest.split("-")[0]
+                metadata_path = os.path.join(entry.path, METADATA_FILES[suffix])
+                if version and os.path.isfile(metadata_path):
+                    # Earlier sys.path entries win, as they do for imports
+                    distributions.setdefault((normalize_project_name(name), version), metadata_path)
+        return distributions
+
+    def get(self, name, version):
+        """
+        Returns compact metadata for an installed distribution, or None if it is not installed.
+        """
+        key = (normalize_project_name(name), version)
+        path = self._index().get(key)
+        if path is None:
+            return None
+        with self._lock:
+            if key in self._metadata:
+                return self._metadata[key]
+        metadata = _parse_metadata(path)
+        with self._lock:
+            return self._metadata.setdefault(key, metadata)
+
+    def __len__(self):
+        return len(self._index())
+
+
+_default_indexes = {}
+_default_indexes_lock = threading.Lock()
+
+
+def get_site_packages_index(paths=None):
+    """
+    Returns the process-wide SitePackagesIndex for a set of directories (default: sys.path),
+    creating it on first use.
+    """
+    key = tuple(paths) if paths is not None else None
+    with _default_indexes_lock:
+        if key not in _default_indexes:
+            _default_indexes[key] = SitePackagesIndex(paths)
+        return _default_indexes[key]
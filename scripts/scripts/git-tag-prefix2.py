@@ -1,33 +1,29 @@
 import requests
-import re
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from git_utils.tag_index import get_tag_index
 
 def get_matching_tag(repo_owner, repo_name, version, github_token):
     """
     Finds the best-matching tag in a GitHub repo for a given version by removing separators.
+    All tags are fetched once per repo; later lookups are dictionary probes on precomputed
+    keys (separator-stripped, prefix-stripped, numeric).
     """
-    url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/tags"
     headers = {
         "Authorization": f"token {github_token}",
         "Accept": "application/vnd.github.v3+json"
     }
 
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        tags = response.json()
-        
-        # Normalize the input version by removing separators
-        cleaned_version = re.sub(r"[\.\_\-]", "", version)
-        
-        for tag in tags:
-            tag_name = tag.get('name', '')
-            
-            # Clean the tag name by removing separators
-            cleaned_tag = re.sub(r"[\.\_\-]", "", tag_name)
-            
-            # Check if the cleaned tag matches the cleaned version
-            if cleaned_tag == cleaned_version:
-                return tag_name  # Return the original tag format if there's a match
+        tag_index = get_tag_index(repo_owner, repo_name, headers)
+
+        # Return the original tag format if there's a match
+        tag_name = tag_index.match(version)
+        if tag_name is not None:
+            return tag_name
 
         return f"No matching tag found for version {version}."
 
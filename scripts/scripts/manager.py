@@ -1,14 +1,61 @@
 import requests
+from collections import deque
+import time
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urlparse
+from xml.etree import ElementTree as ET
+import os
+import sys
 
-def get_package_info(package_manager, package_name, package_version):
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from http_utils.cache import cached_get
+from inventory_utils.inventory import read_inventory
+from maven_utils.inheritance import resolve_inherited, get_inheritance_stats
+from maven_utils.local_repository import DEFAULT_LOCAL_REPOSITORY, get_local_repository
+from maven_utils.pom_parser import parse_pom, get_license_names, get_repository_url
+from npm_utils.node_modules import get_node_modules_index
+from npm_utils.packument import get_packument_index, get_license as get_npm_license, get_repository_url as get_npm_repository_url
+from nuget_utils.global_packages import DEFAULT_GLOBAL_PACKAGES, get_global_packages
+from pypi_utils.project_index import get_project_index, get_repository_url as get_pypi_repository_url
+from pypi_utils.site_packages import get_site_packages_index
+from state_utils.resolution_store import NEGATIVE_SOURCE, get_store
+
+# Registry base URLs (override to point at a mirror or a local stub registry)
+MAVEN_BASE_URL = "https://repo1.maven.org/maven2"
+NPM_BASE_URL = "https://registry.npmjs.org"
+PYPI_BASE_URL = "https://pypi.org/pypi"
+NUGET_BASE_URL = "https://api.nuget.org/v3-flatcontainer"
+
+# Prefixes of the results resolve_many returns when a request fails, or when a lookup raises
+# anything else (as opposed to a definite answer such as "Package or version not found")
+REQUEST_ERROR = "An error occurred"
+RESOLVE_ERROR = "Failed to resolve"
+
+# Prefix of the definite "not found" answers; resolve_incremental stores these with a short TTL
+NOT_FOUND = "Package or version not found"
+
+# Local stores answered before the registries; each is indexed by one directory walk on first use.
+# Set USE_LOCAL_STORES = False to always ask the registries.
+USE_LOCAL_STORES = True
+MAVEN_LOCAL_REPOSITORY = DEFAULT_LOCAL_REPOSITORY  # ~/.m2/repository
+NUGET_GLOBAL_PACKAGES = DEFAULT_GLOBAL_PACKAGES  # $NUGET_PACKAGES or ~/.nuget/packages
+NODE_MODULES_ROOTS = (".",)  # workspace roots searched for node_modules folders
+SITE_PACKAGES_DIRS = None  # None means the running interpreter's sys.path
+
+def get_package_info(package_manager, package_name, package_version, npm_packument=False):
     """
     Fetches the Git repository and license information for a specific package and version.
     Supports Maven, NPM, PyPi, and NuGet.
+
+    With npm_packument=True, npm versions are answered from one packument per package
+    (see get_npm_info).
     """
     if package_manager.lower() == 'maven':
         return get_maven_info(package_name, package_version)
     elif package_manager.lower() == 'npm':
-        return get_npm_info(package_name, package_version)
+        return get_npm_info(package_name, package_version, use_packument=npm_packument)
     elif package_manager.lower() == 'pypi':
         return get_pypi_info(package_name, package_version)
     elif package_manager.lower() == 'nuget':
@@ -20,33 +67,79 @@ def get_package_info(package_manager, package_name, package_version):
 def get_maven_info(package_name, package_version):
     """
     Fetches repository and license information for a Maven package.
+
+    POMs (and parent POMs) already in the local Maven repository are read from disk.
     """
     group_id, artifact_id = package_name.split(":")
-    url = f"https://repo1.maven.org/maven2/{group_id.replace('.', '/')}/{artifact_id}/{package_version}/{artifact_id}-{package_version}.pom"
-    response = requests.get(url)
-    if response.status_code == 200:
-        # You can parse the XML file (pom.xml) here to get license and repository info
-        pom_content = response.text
-        return {"file_content": pom_content, "source": "pom.xml"}
-    else:
-        return "Package or version not found in Maven repository."
+    local_repository = get_local_repository(MAVEN_LOCAL_REPOSITORY) if USE_LOCAL_STORES else None
+    content = local_repository.read_pom(group_id, artifact_id, package_version) if local_repository else None
+    origin = "local"
+    if content is None:
+        url = f"{MAVEN_BASE_URL}/{group_id.replace('.', '/')}/{artifact_id}/{package_version}/{artifact_id}-{package_version}.pom"
+        response = cached_get(url)
+        if response.status_code != 200:
+            return "Package or version not found in Maven repository."
+        content, origin = response.content, "registry"
+
+    # Keep only the compact record of licenses, scm, url and parent, not the whole document
+    try:
+        pom = resolve_inherited(parse_pom(content), MAVEN_BASE_URL, local_repository)  # fill in licenses/scm from parent POMs
+    except ET.ParseError:
+        return "Failed to parse the POM file."
+    license_names = get_license_names(pom)
+    return {
+        "repository": get_repository_url(pom) or "No repository info available",
+        "license": ", ".join(license_names) if license_names else "No license info available",
+        "pom": pom,
+        "source": "pom.xml",
+        "origin": origin
+    }
 
 
-def get_npm_info(package_name, package_version):
+def get_npm_info(package_name, package_version, use_packument=False):
     """
     Fetches repository and license information for an NPM package.
+
+    With use_packument=True the package's packument is fetched once and every version is
+    answered from its compact in-memory index, instead of one request per version.
+
+    Versions installed in a node_modules folder under NODE_MODULES_ROOTS are answered locally.
     """
-    url = f"https://registry.npmjs.org/{package_name}/{package_version}"
-    response = requests.get(url)
+    if USE_LOCAL_STORES:
+        version_info = get_node_modules_index(NODE_MODULES_ROOTS).get(package_name, package_version)
+        if version_info is not None:
+            return {
+                "repository": version_info["repository"] or "No repository info available",
+                "license": version_info["license"] or "No license info available",
+                "file_content": version_info,
+                "source": "package.json",
+                "origin": "local"
+            }
+
+    if use_packument:
+        version_info = get_packument_index(NPM_BASE_URL).get(package_name, package_version)
+        if version_info is None:
+            return "Package or version not found in NPM registry."
+        return {
+            "repository": version_info["repository"] or "No repository info available",
+            "license": version_info["license"] or "No license info available",
+            "file_content": version_info,
+            "source": "package.json",
+            "origin": "registry"
+        }
+
+    url = f"{NPM_BASE_URL}/{package_name}/{package_version}"
+    response = cached_get(url)
     if response.status_code == 200:
         package_data = response.json()
-        repo_url = package_data.get("repository", {}).get("url", "No repository info available")
-        license_info = package_data.get("license", "No license info available")
+        repo_url = get_npm_repository_url(package_data) or "No repository info available"
+        license_info = get_npm_license(package_data) or "No license info available"
         return {
             "repository": repo_url,
             "license": license_info,
             "file_content": package_data,
-            "source": "package.json"
+            "source": "package.json",
+            "origin": "registry"
         }
     else:
         return "Package or version not found in NPM registry."
@@ -55,18 +148,30 @@ def get_npm_info(package_name, package_version):
 def get_pypi_info(package_name, package_version):
     """
     Fetches repository and license information for a PyPi package.
+
+    Releases are answered from a per-project index built from one /pypi/{name}/json call;
+    releases registered by resolve_many are fetched in one batch with the first lookup of
+    their project. Distributions installed in SITE_PACKAGES_DIRS are answered from their METADATA first.
     """
-    url = f"https://pypi.org/pypi/{package_name}/{package_version}/json"
-    response = requests.get(url)
-    if response.status_code == 200:
-        package_data = response.json()
-        repo_url = package_data.get("info", {}).get("project_url", "No repository info available")
-        license_info = package_data.get("info", {}).get("license", "No license info available")
+    if USE_LOCAL_STORES:
+        metadata = get_site_packages_index(SITE_PACKAGES_DIRS).get(package_name, package_version)
+        if metadata is not None:
+            return {
+                "repository": get_pypi_repository_url(metadata) or "No repository info available",
+                "license": metadata["license"] or "No license info available",
+                "file_content": metadata,
+                "source": "METADATA",
+                "origin": "local"
+            }
+
+    metadata = get_project_index(PYPI_BASE_URL).get(package_name, package_version)
+    if metadata is not None:
         return {
-            "repository": repo_url,
-            "license": license_info,
-            "file_content": package_data,
-            "source": "pyproject.toml (if available)"
+            "repository": get_pypi_repository_url(metadata) or "No repository info available",
+            "license": metadata["license"] or "No license info available",
+            "file_content": metadata,
+            "source": "pyproject.toml (if available)",
+            "origin": "registry"
         }
     else:
         return "Package or version not found in PyPi registry."
@@ -75,21 +180,247 @@ def get_pypi_info(package_name, package_version):
 def get_nuget_info(package_name, package_version):
     """
     Fetches repository and license information for a NuGet package.
+
+    Packages already restored into the global packages folder are read from disk.
     """
-    url = f"https://api.nuget.org/v3-flatcontainer/{package_name}/{package_version}/{package_name}.nuspec"
-    response = requests.get(url)
+    if USE_LOCAL_STORES:
+        nuspec_content = get_global_packages(NUGET_GLOBAL_PACKAGES).read_nuspec(package_name, package_version)
+        if nuspec_content is not None:
+            return {"file_content": nuspec_content, "source": ".nuspec file", "origin": "local"}
+
+    url = f"{NUGET_BASE_URL}/{package_name}/{package_version}/{package_name}.nuspec"
+    response = cached_get(url)
     if response.status_code == 200:
         # Parse XML if needed to extract license and repository information
         nuspec_content = response.text
-        return {"file_content": nuspec_content, "source": ".nuspec file"}
+        return {"file_content": nuspec_content, "source": ".nuspec file", "origin": "registry"}
     else:
         return "Package or version not found in NuGet registry."
 
 
-# Example usage
-package_manager = "npm"  # can be "maven", "npm", "pypi", or "nuget"
-package_name = "express"  # Replace with the actual package name
-package_version = "4.17.1"  # Replace with the actual package version
+def _registry_host(package_manager):
+    """
+    Returns the registry host a package manager's lookups are sent to.
+    """
+    base_urls = {
+        "maven": MAVEN_BASE_URL,
+        "npm": NPM_BASE_URL,
+        "pypi": PYPI_BASE_URL,
+        "nuget": NUGET_BASE_URL,
+    }
+    return urlparse(base_urls.get(package_manager.lower(), "")).netloc
+
+
+def _expect_lookup(coordinate):
+    """
+    Registers a PyPI coordinate with the project index before it is looked up, so releases of one
+    project are fetched in a single batch. Distributions installed locally are not registered.
+    """
+    package_manager, package_name, package_version = coordinate
+    if package_manager.lower() != "pypi":
+        return
+    if USE_LOCAL_STORES and get_site_packages_index(SITE_PACKAGES_DIRS).get(package_name, package_version) is not None:
+        return
+    get_project_index(PYPI_BASE_URL).expect(package_name, [package_version])
+
+
+def resolve_many(coordinates, max_workers=16, per_host_limit=8, npm_packument=False):
+    """
+    Resolves many (package_manager, package_name, package_version) coordinates concurrently.
+
+    Lookups run on a bounded thread pool and at most `per_host_limit` requests are in
+    flight against any one registry host. Only a window of coordinates is pulled from
+    the iterable at a time, so very large inventories can be streamed in. An exception
+    from one lookup becomes that coordinate's error result and does not stop the others.
 
-result = get_package_info(package_manager, package_name, package_version)
-print(result)
+    Set npm_packument=True to serve all versions of an npm package from one packument;
+    concurrent lookups of the same package share that single fetch.
+
+    Yields (coordinate, result) tuples in completion order, where result is whatever
+    get_package_info returns for that coordinate.
+    """
+    if per_host_limit < 1:
+        raise ValueError(f"per_host_limit must be at least 1, got {per_host_limit}")
+
+    def resolve(coordinate):
+        package_manager, package_name, package_version = coordinate
+        try:
+            return get_package_info(package_manager, package_name, package_version, npm_packument)
+        except requests.RequestException as e:
+            return f"{REQUEST_ERROR}: {e}"
+        except Exception as e:  # e.g. a malformed Maven name or a non-JSON body; only this coordinate fails
+            return f"{RESOLVE_ERROR}: {e!r}"
+
+    # Per-host slots are taken here, before a lookup is submitted, so the pool's threads only
+    # ever run lookups that may start; coordinates for a busy host wait in that host's queue
+    in_flight = {}
+    active = {}
+    parked = {}
+
+    def submit(coordinate, host):
+        active[host] = active.get(host, 0) + 1
+        in_flight[executor.submit(resolve, coordinate)] = (coordinate, host)
+
+    def schedule(coordinate):
+        _expect_lookup(coordinate)
+        host = _registry_host(coordinate[0])
+        if active.get(host, 0) < per_host_limit:
+            submit(coordinate, host)
+        else:
+            parked.setdefault(host, deque()).append(coordinate)
+
+    def finish_some():
+        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in done:
+            coordinate, host = in_flight.pop(future)
+            active[host] -= 1
+            if parked.get(host):
+                submit(parked[host].popleft(), host)
+            yield coordinate, future.result()
+
+    window = max_workers * 2
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for coordinate in coordinates:
+            schedule(coordinate)
+            while len(in_flight) + sum(map(len, parked.values())) >= window:
+                yield from finish_some()
+
+        while in_flight:
+            yield from finish_some()
+
+
+# Coordinates checked against the resolution store per query in resolve_incremental
+STATE_BATCH_SIZE = 1000
+
+
+def resolve_incremental(coordinates, store=None, **kwargs):
+    """
+    Like resolve_many, but only resolves coordinates that are new or past their TTL in the
+    resolution state store; the rest are answered from their stored result. Successful
+    (dict) results are written back, so a daily run over a slowly changing inventory only
+    does work proportional to what changed. "Package or version not found" answers are
+    written back too, but expire after the store's shorter negative TTL.
+
+    Extra keyword arguments are passed on to resolve_many.
+
+    Yields (coordinate, result) tuples; stored results carry the "fetch_time" they were resolved at.
+    """
+    store = store or get_store()
+    coordinates = iter(coordinates)
+    while True:
+        batch = [tuple(coordinate) for _, coordinate in zip(range(STATE_BATCH_SIZE), coordinates)]
+        if not batch:
+            return
+        stored = store.get_many("manager", batch)
+        for coordinate, entry in stored.items():
+            if entry["source"] == NEGATIVE_SOURCE:
+                yield coordinate, entry["result"]
+            else:
+                yield coordinate, dict(entry["result"], fetch_time=entry["fetch_time"])
+
+        pending = [coordinate for coordinate in dict.fromkeys(batch) if coordinate not in stored]
+        resolved = []
+        for coordinate, result in resolve_many(pending, **kwargs):
+            if isinstance(result, dict):
+                result = dict(result, fetch_time=datetime.now().isoformat())
+                resolved.append((coordinate, result, result.get("origin")))
+            elif isinstance(result, str) and result.startswith(NOT_FOUND):
+                resolved.append((coordinate, result, NEGATIVE_SOURCE))
+            yield coordinate, result
+        store.put_many("manager", resolved)
+
+
+# Items a queue worker leases at a time, and results acked per queue transaction
+QUEUE_LEASE_SIZE = 200
+QUEUE_ACK_SIZE = 50
+
+
+def run_worker(queue, worker, lease_size=QUEUE_LEASE_SIZE, idle_timeout=None, poll_interval=5, **kwargs):
+    """
+    Works through a WorkQueue: leases items, resolves them with resolve_incremental and acks
+    each result, renewing the leases on the rest of the batch as results come in.
+
+    Items whose lookup failed or raised are released for a delayed retry instead of acked;
+    the rest of the batch is still acked. Many workers (processes or hosts) can share one
+    queue; a worker that dies only delays its batch until the lease expires.
+
+    Args:
+        queue (WorkQueue): The shared queue.
+        worker (str): Name of this worker, e.g. "host-1234".
+        idle_timeout (float, optional): Return after the queue has been empty this many seconds;
+            by default the worker keeps polling.
+
+    Extra keyword arguments are passed on to resolve_incremental / resolve_many.
+
+    Returns:
+        int: Number of items this worker acked.
+    """
+    acked = 0
+    idle_since = time.time()
+    while True:
+        leased = queue.lease(worker, lease_size)
+        if not leased:
+            if idle_timeout is not None and time.time() - idle_since >= idle_timeout:
+                return acked
+            time.sleep(poll_interval)
+            continue
+
+        ids_by_coordinate = {coordinate: item_id for item_id, coordinate in leased}
+        done = []
+
+        def finish(coordinate, result):
+            nonlocal acked, done
+            item_id = ids_by_coordinate.pop(coordinate, None)
+            if item_id is None:
+                return
+            if isinstance(result, str) and result.startswith((REQUEST_ERROR, RESOLVE_ERROR)):
+                queue.fail(worker, [item_id], result)
+                return
+            done.append((item_id, result))
+            if len(done) >= QUEUE_ACK_SIZE:
+                acked += queue.ack(worker, done)
+                done = []
+                queue.extend(worker, list(ids_by_coordinate.values()))
+
+        try:
+            for coordinate, result in resolve_incremental(list(ids_by_coordinate), **kwargs):
+                finish(coordinate, result)
+        except Exception:
+            # The batch broke off; resolve the rest one at a time so only the offending item fails
+            for coordinate in list(ids_by_coordinate):
+                try:
+                    for _, result in resolve_incremental([coordinate], **kwargs):
+                        finish(coordinate, result)
+                except Exception as e:
+                    finish(coordinate, f"{RESOLVE_ERROR}: {e!r}")
+        acked += queue.ack(worker, done)
+        idle_since = time.time()
+
+if __name__ == "__main__":
+    # Example usage
+    package_manager = "npm"  # can be "maven", "npm", "pypi", or "nuget"
+    package_name = "express"  # Replace with the actual package name
+    package_version = "4.17.1"  # Replace with the actual package version
+
+    result = get_package_info(package_manager, package_name, package_version)
+    print(result)
+
+    # Example batch usage; pass lockfiles / SBOMs on the command line to resolve their packages instead,
+    # e.g. python manager.py package-lock.json poetry.lock bom.cdx.json
+    inventory_stats = {}
+    if sys.argv[1:]:
+        coordinates = read_inventory(sys.argv[1:], inventory_stats)
+    else:
+        coordinates = [
+            ("maven", "org.apache.commons:commons-lang3", "3.12.0"),
+            ("npm", "express", "4.17.1"),
+            ("pypi", "flask", "2.0.1"),
+            ("nuget", "newtonsoft.json", "13.0.1"),
+        ]
+    for coordinate, result in resolve_incremental(coordinates):
+        print(coordinate, result)
+    if inventory_stats:
+        print("Inventory stats:", inventory_stats)
+    print("Resolution state stats:", get_store().stats)  # answered from the store vs stale / new
+    local_repository = get_local_repository(MAVEN_LOCAL_REPOSITORY) if USE_LOCAL_STORES else None
+    print("Parent POM memo stats:", get_inheritance_stats(MAVEN_BASE_URL, local_repository))
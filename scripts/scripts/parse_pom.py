@@ -1,9 +1,45 @@
-import requests
+import hashlib
+import json
 import openai
 import os
+import shelve
+import sys
+import threading
+from xml.etree import ElementTree as ET
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from http_utils.cache import cached_get
+from maven_utils.inheritance import pom_url, resolve_inherited
+from maven_utils.pom_parser import parse_pom, get_license_names, get_repository_url as get_pom_repository_url
+from nuget_utils.nuspec_parser import parse_nuspec, get_license as get_nuspec_license, get_repository_url as get_nuspec_repository_url
 
 # Set up your OpenAI API key
 openai.api_key = os.getenv("OPENAI_API_KEY")  # Make sure to set your API key as an environment variable
+# Point OPENAI_API_BASE at a local stub of the chat endpoint to run without the real service
+openai.api_base = os.getenv("OPENAI_API_BASE", openai.api_base)
+
+# Maven repository POMs and their parent POMs are fetched from (override to point at a mirror)
+MAVEN_BASE_URL = "https://repo1.maven.org/maven2"
+
+# Model answers keyed by SHA-256 of the file content, so identical files are never sent twice
+OPENAI_CACHE_PATH = os.environ.get(
+    "OPENAI_CACHE_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "python-scripts", "openai_parse_cache")
+)
+
+# Part of the model cache key; bump it when the prompt changes the shape of the answers
+OPENAI_PROMPT_VERSION = 3
+
+# Fields extracted from each file; the model is only asked for those the XML does not declare
+EXTRACTED_FIELDS = ("repository", "license")
+
+# How each file was handled: by the XML extractor, by a new model call, or from the model cache
+extraction_stats = {"deterministic": 0, "openai": 0, "openai_cached": 0}
+_stats_lock = threading.Lock()
+_openai_cache_lock = threading.Lock()
+_openai_key_locks = {}
+
 
 def get_package_info(package_manager, package_name, package_version):
     """
@@ -22,16 +58,21 @@ def get_package_info(package_manager, package_name, package_version):
         return "Unsupported package manager."
 
 
-def parse_with_openai(file_content, file_type):
+def parse_with_openai(file_content, file_type, fields=EXTRACTED_FIELDS):
     """
-    Uses OpenAI API to parse and extract repository and license information from a given file content.
+    Uses OpenAI API to parse and extract repository and/or license information from a given file content.
+    Only the given fields are asked for.
     """
+    descriptions = {"repository": "repository URL", "license": "license information"}
+    keys = " and ".join(f'"{field}"' for field in fields)
     try:
         response = openai.ChatCompletion.create(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": f"You are an assistant parsing {file_type} files."},
-                {"role": "user", "content": f"Extract repository URL and license information from this {file_type} content:\n\n{file_content}"}
+                {"role": "user", "content": f"Extract {' and '.join(descriptions[field] for field in fields)} from this {file_type} content. "
+                                            f"Answer only with a JSON object with the keys {keys}, "
+                                            f"using null for anything the file does not declare:\n\n{file_content}"}
             ]
         )
         return response['choices'][0]['message']['content'].strip()
@@ -39,16 +80,125 @@ def parse_with_openai(file_content, file_type):
         return f"Error parsing with OpenAI: {e}"
 
 
+def _record(outcome):
+    with _stats_lock:
+        extraction_stats[outcome] += 1
+
+
+def _read_openai_cache(digest):
+    """
+    Returns the cached model answer for a digest, or None.
+    """
+    with _openai_cache_lock, shelve.open(OPENAI_CACHE_PATH) as cache:
+        return cache.get(digest)
+
+
+def parse_with_openai_cached(file_content, file_type, fields=EXTRACTED_FIELDS):
+    """
+    Calls parse_with_openai at most once per distinct file content and requested fields, keyed
+    by SHA-256. Concurrent misses for the same digest share one call.
+    Error answers are not cached so they are retried on the next run.
+    """
+    key = f"{OPENAI_PROMPT_VERSION}\0{file_type}\0{','.join(fields)}\0{file_content}"
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+    os.makedirs(os.path.dirname(OPENAI_CACHE_PATH), exist_ok=True)
+
+    cached_answer = _read_openai_cache(digest)
+    if cached_answer is not None:
+        _record("openai_cached")
+        return cached_answer
+    with _openai_cache_lock:
+        key_lock = _openai_key_locks.setdefault(digest, threading.Lock())
+
+    with key_lock:
+        cached_answer = _read_openai_cache(digest)
+        if cached_answer is not None:
+            _record("openai_cached")
+            return cached_answer
+
+        parsed_result = parse_with_openai(file_content, file_type, fields)
+        _record("openai")
+        with _openai_cache_lock:
+            if not parsed_result.startswith("Error parsing with OpenAI"):
+                with shelve.open(OPENAI_CACHE_PATH) as cache:
+                    cache[digest] = parsed_result
+            _openai_key_locks.pop(digest, None)
+    return parsed_result
+
+
+def extract_deterministic(file_content, file_type):
+    """
+    Extracts repository URL and license with a plain XML parser. A POM's parent chain is
+    resolved first, so fields inherited from a parent POM count as declared.
+
+    Returns {"repository", "license"} with None for each field the file does not declare,
+    or None if the file is not well-formed XML.
+    """
+    try:
+        if file_type == "pom.xml":
+            pom = resolve_inherited(parse_pom(file_content), MAVEN_BASE_URL)
+            license_names = get_license_names(pom)
+            repository, license_info = get_pom_repository_url(pom), ", ".join(license_names)
+        else:
+            nuspec = parse_nuspec(file_content)
+            repository, license_info = get_nuspec_repository_url(nuspec), get_nuspec_license(nuspec)
+    except ET.ParseError:
+        return None
+    return {"repository": repository or None, "license": license_info or None}
+
+
+def parse_openai_answer(answer, fields=EXTRACTED_FIELDS):
+    """
+    Turns the model's JSON answer into {field: value} for the requested fields.
+    Fields the answer does not give, or an answer that is an error or not JSON, become None.
+    """
+    parsed_result = dict.fromkeys(fields)
+    try:
+        fields = json.loads(answer[answer.find("{"):answer.rfind("}") + 1])
+    except ValueError:
+        print(f"Unusable OpenAI answer: {answer}")
+        return parsed_result
+    if isinstance(fields, dict):
+        parsed_result.update({key: fields.get(key) or None for key in parsed_result})
+    return parsed_result
+
+
+def extract_repository_and_license(file_content, file_type):
+    """
+    Tiered extraction: the deterministic XML extractor handles the common case and the
+    OpenAI model is only asked (once per distinct content) for the fields it does not find.
+
+    Returns {"repository", "license"} either way.
+    """
+    parsed_result = extract_deterministic(file_content, file_type) or dict.fromkeys(EXTRACTED_FIELDS)
+    missing = tuple(field for field in EXTRACTED_FIELDS if not parsed_result[field])
+    if not missing:
+        _record("deterministic")
+        return parsed_result
+    answer = parse_with_openai_cached(file_content, file_type, missing)
+    return dict(parsed_result, **parse_openai_answer(answer, missing))
+
+
+def get_fallback_fraction():
+    """
+    Returns the fraction of parsed files that needed the model fallback (cached or not).
+    """
+    with _stats_lock:
+        total = sum(extraction_stats.values())
+        fallback = extraction_stats["openai"] + extraction_stats["openai_cached"]
+    return fallback / total if total else 0.0
+
+
 def get_maven_info(package_name, package_version):
     """
-    Fetches repository and license information for a Maven package and parses it using OpenAI API.
+    Fetches repository and license information for a Maven package, using OpenAI API only when
+    the POM does not declare them plainly.
     """
     group_id, artifact_id = package_name.split(":")
-    url = f"https://repo1.maven.org/maven2/{group_id.replace('.', '/')}/{artifact_id}/{package_version}/{artifact_id}-{package_version}.pom"
-    response = requests.get(url)
+    response = cached_get(pom_url(group_id, artifact_id, package_version, MAVEN_BASE_URL))
     if response.status_code == 200:
         pom_content = response.text
-        parsed_result = parse_with_openai(pom_content, "pom.xml")
+        parsed_result = extract_repository_and_license(pom_content, "pom.xml")
         return {"parsed_data": parsed_result, "source": "pom.xml"}
     else:
         return "Package or version not found in Maven repository."
@@ -56,22 +206,25 @@ def get_maven_info(package_name, package_version):
 
 def get_nuget_info(package_name, package_version):
     """
-    Fetches repository and license information for a NuGet package and parses it using OpenAI API.
+    Fetches repository and license information for a NuGet package, using OpenAI API only when
+    the nuspec does not declare them plainly.
     """
     url = f"https://api.nuget.org/v3-flatcontainer/{package_name}/{package_version}/{package_name}.nuspec"
-    response = requests.get(url)
+    response = cached_get(url)
     if response.status_code == 200:
         nuspec_content = response.text
-        parsed_result = parse_with_openai(nuspec_content, ".nuspec")
+        parsed_result = extract_repository_and_license(nuspec_content, ".nuspec")
         return {"parsed_data": parsed_result, "source": ".nuspec file"}
     else:
         return "Package or version not found in NuGet repository."
 
 
-# Example usage
-package_manager = "maven"  # can be "maven", "npm", "pypi", or "nuget"
-package_name = "org.apache.commons:commons-lang3"  # Replace with the actual package name
-package_version = "3.12.0"  # Replace with the actual package version
+if __name__ == "__main__":
+    # Example usage
+    package_manager = "maven"  # can be "maven", "npm", "pypi", or "nuget"
+    package_name = "org.apache.commons:commons-lang3"  # Replace with the actual package name
+    package_version = "3.12.0"  # Replace with the actual package version
 
-result = get_package_info(package_manager, package_name, package_version)
-print(result)
+    result = get_package_info(package_manager, package_name, package_version)
+    print(result)
+    print(f"Files needing the OpenAI fallback: {get_fallback_fraction():.1%}", extraction_stats)
@@ -0,0 +1,109 @@
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inventory_utils.inventory import read_inventory
+from state_utils.work_queue import DEFAULT_QUEUE_PATH, LEASE_SECONDS, WorkQueue
+from manager import QUEUE_LEASE_SIZE, run_worker
+
+
+def enqueue(args):
+    """
+    Loads lockfiles / SBOMs into the queue.
+    """
+    queue = WorkQueue(args.queue)
+    stats = {}
+    added = queue.enqueue(read_inventory(args.files, stats))
+    print(f"Enqueued {added} new coordinates ({stats['read']} read, {stats['duplicates']} duplicates)")
+
+
+def _worker_process(queue_path, lease_seconds, lease_size, idle_timeout, max_workers, per_host_limit):
+    # Each process opens its own connection; SQLite connections must not cross a fork
+    queue = WorkQueue(queue_path, lease_seconds=lease_seconds)
+    worker = f"{socket.gethostname()}-{os.getpid()}"
+    acked = run_worker(queue, worker, lease_size=lease_size, idle_timeout=idle_timeout,
+                       max_workers=max_workers, per_host_limit=per_host_limit)
+    print(f"Worker {worker} acked {acked} items")
+
+
+def work(args):
+    """
+    Runs one or more worker processes against the queue.
+    """
+    options = (args.queue, args.lease_seconds, args.lease_size, args.idle_timeout, args.max_workers, args.per_host_limit)
+    if args.processes == 1:
+        _worker_process(*options)
+        return
+    processes = [multiprocessing.Process(target=_worker_process, args=options) for _ in range(args.processes)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+
+def status(args):
+    """
+    Prints backlog and throughput, once or every --watch seconds.
+    """
+    queue = WorkQueue(args.queue)
+    while True:
+        summary = queue.status(window=args.window)
+        eta = f"{summary['eta_seconds'] / 60:.1f} min" if summary["eta_seconds"] is not None else "n/a"
+        print(f"[{time.strftime('%H:%M:%S')}] backlog {summary['backlog']} "
+              f"(pending {summary['pending']}, retry backoff {summary['delayed']}, leased {summary['leased']}, expired leases {summary['expired']}) | "
+              f"done {summary['done']} | failed {summary['failed']} | "
+              f"{summary['throughput']:.1f} items/s over {args.window}s | ETA {eta}")
+        for worker, count in sorted(summary["workers"].items()):
+            print(f"    {worker}: {count / args.window:.1f} items/s")
+        if not args.watch:
+            return
+        time.sleep(args.watch)
+
+
+def results(args):
+    """
+    Writes finished results as JSON lines.
+    """
+    queue = WorkQueue(args.queue)
+    for coordinate, result in queue.results():
+        print(json.dumps({"coordinate": coordinate, "result": result}, default=str))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resolve package coordinates through a durable work queue shared by many workers.")
+    parser.add_argument("--queue", default=DEFAULT_QUEUE_PATH, help="Path of the queue database (default: %(default)s)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    enqueue_parser = commands.add_parser("enqueue", help="Add the packages of lockfiles / SBOMs to the queue")
+    enqueue_parser.add_argument("files", nargs="+")
+    enqueue_parser.set_defaults(handler=enqueue)
+
+    worker_parser = commands.add_parser("worker", help="Lease, resolve and ack items")
+    worker_parser.add_argument("--processes", type=int, default=1)
+    worker_parser.add_argument("--lease-size", type=int, default=QUEUE_LEASE_SIZE)
+    worker_parser.add_argument("--lease-seconds", type=float, default=LEASE_SECONDS)
+    worker_parser.add_argument("--max-workers", type=int, default=16, help="Lookup threads per process")
+    worker_parser.add_argument("--per-host-limit", type=int, default=8, help="Concurrent requests per registry host per process")
+    worker_parser.add_argument("--idle-timeout", type=float, default=None, help="Exit after the queue has been empty this many seconds")
+    worker_parser.set_defaults(handler=work)
+
+    status_parser = commands.add_parser("status", help="Report backlog and throughput (coordinator view)")
+    status_parser.add_argument("--window", type=int, default=60, help="Seconds of history used for throughput")
+    status_parser.add_argument("--watch", type=float, default=None, help="Repeat every this many seconds")
+    status_parser.set_defaults(handler=status)
+
+    results_parser = commands.add_parser("results", help="Print finished results as JSON lines")
+    results_parser.set_defaults(handler=results)
+
+    args = parser.parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import json
+import os
+import queue
+import re
+import threading
+import time
+
+# Directory of checkpoint logs opened by name (override with CHECKPOINT_DIR)
+DEFAULT_CHECKPOINT_DIR = os.environ.get(
+    "CHECKPOINT_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "python-scripts", "checkpoints")
+)
+
+# The writer thread fsyncs after this many records or this many seconds, whichever comes first
+FSYNC_BATCH_SIZE = 1000
+FSYNC_INTERVAL = 0.5
+
+_STOP = object()
+
+
+class CheckpointLog:
+    """
+    Append-only log of finished items, so an interrupted run can resume where it stopped.
+
+    Workers call record(), which only puts the result on a queue; a writer thread appends it
+    as one JSON line and fsyncs in batches, so at most FSYNC_INTERVAL seconds of results are
+    lost on a hard crash. On open, the existing log is replayed into `completed`
+    ({key: result}); a torn last line from a crash is cut off before new records are appended.
+
+    Used as a context manager, the log is flushed on exit and deleted when the block finishes
+    without an exception (set remove_on_success=False to keep it); after Ctrl-C or an error it
+    stays on disk for the next run to replay.
+    """
+    def __init__(self, path, remove_on_success=True, fsync_batch_size=FSYNC_BATCH_SIZE, fsync_interval=FSYNC_INTERVAL):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.remove_on_success = remove_on_success
+        self.fsync_batch_size = fsync_batch_size
+        self.fsync_interval = fsync_interval
+        self.stats = {"replayed": 0, "recorded": 0, "written": 0, "fsyncs": 0}
+        self.completed = self._replay()
+        self._queue = queue.SimpleQueue()
+        self._file = open(path, "ab")
+        self._thread = threading.Thread(target=self._write_loop, name="checkpoint-writer", daemon=True)
+        self._thread.start()
+        self._closed = False
+
+    def _replay(self):
+        completed = {}
+        if not os.path.exists(self.path):
+            return completed
+        valid_end = 0
+        with open(self.path, "rb") as log_file:
+            for line in log_file:
+                if not line.endswith(b"\n"):
+                    break  # torn write from a crash
+                try:
+                    key, result = json.loads(line)
+                except ValueError:
+                    break
+                completed[tuple(key) if isinstance(key, list) else key] = result
+                valid_end += len(line)
+        if valid_end != os.path.getsize(self.path):
+            with open(self.path, "r+b") as log_file:
+                log_file.truncate(valid_end)
+        self.stats["replayed"] = len(completed)
+        return completed
+
+    def __contains__(self, key):
+        return key in self.completed
+
+    def record(self, key, result):
+        """
+        Queues one finished item for the log without waiting for the disk.
+
+        Args:
+            key: A string or a tuple of strings identifying the item, e.g. (ecosystem, name, version).
+            result: The item's JSON-serializable result.
+        """
+        self.completed[key] = result
+        self.stats["recorded"] += 1
+        self._queue.put((key, result))
+
+    def _write_loop(self):
+        pending = 0
+        last_sync = time.monotonic()
+        while True:
+            # Wake up in time to sync records that have waited FSYNC_INTERVAL, even while busy
+            timeout = self.fsync_interval - (time.monotonic() - last_sync) if pending else self.fsync_interval
+            try:
+                item = self._queue.get(timeout=max(timeout, 0))
+            except queue.Empty:
+                item = None
+            if item is _STOP:
+                break
+            if item is not None:
+                key, result = item
+                self._file.write(json.dumps([key, result], separators=(",", ":"), default=str).encode("utf-8") + b"\n")
+                pending += 1
+                self.stats["written"] += 1
+            if pending and (pending >= self.fsync_batch_size or time.monotonic() - last_sync >= self.fsync_interval):
+                self._sync()
+                pending = 0
+                last_sync = time.monotonic()
+        self._sync()
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.stats["fsyncs"] += 1
+
+    def close(self, remove=False):
+        """
+        Writes out every queued record, stops the writer thread and closes the file.
+        With remove=True the log is deleted afterwards, e.g. once the run has completed.
+        """
+        if not self._closed:
+            self._closed = True
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._file.close()
+        if remove and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close(remove=self.remove_on_success and exc_type is None)
+        return False
+
+
+def checkpoint_path(name, directory=DEFAULT_CHECKPOINT_DIR):
+    """
+    Returns the log path for a named run, e.g. "git_tags-owner-repo".
+    """
+    return os.path.join(directory, re.sub(r"[^A-Za-z0-9._-]+", "_", name) + ".jsonl")
+
+
+def open_checkpoint(name, directory=DEFAULT_CHECKPOINT_DIR, **options):
+    """
+    Opens (and replays) the checkpoint log of a named run.
+    """
+    return CheckpointLog(checkpoint_path(name, directory), **options)
@@ -0,0 +1,178 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+# Location of the resolution state database (override with RESOLUTION_STATE_PATH)
+DEFAULT_STATE_PATH = os.environ.get(
+    "RESOLUTION_STATE_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "python-scripts", "resolution_state.sqlite")
+)
+
+# Seconds a stored resolution stays valid, per ecosystem (the first element of a coordinate).
+# Published Maven / NuGet releases never change; npm and PyPI metadata rarely does; a tag's
+# license is keyed by its commit SHA and so is only rescanned to pick up better identification.
+ECOSYSTEM_TTLS = {
+    "maven": 30 * 24 * 3600,
+    "nuget": 30 * 24 * 3600,
+    "npm": 7 * 24 * 3600,
+    "pypi": 7 * 24 * 3600,
+    "git": 90 * 24 * 3600,
+}
+DEFAULT_TTL = 7 * 24 * 3600
+
+# Source recorded for a definite negative answer ("package or version not found"), and the
+# shorter validity of such rows: a release that is missing today may be published tomorrow
+NEGATIVE_SOURCE = "not_found"
+NEGATIVE_TTL = 24 * 3600
+
+# Coordinates looked up per SQL query by get_many
+LOOKUP_BATCH_SIZE = 500
+
+
+def _key(coordinate):
+    return json.dumps(list(coordinate))
+
+
+class ResolutionStore:
+    """
+    SQLite store of resolved coordinates, so a run only resolves what is new or past its TTL.
+
+    Each row holds one result per (namespace, coordinate) with its source and fetch time; the
+    namespace keeps the differently shaped results of manager.py, ClearlyDefined and tag scans apart.
+    Only successful results and definite negative answers (stored with source NEGATIVE_SOURCE,
+    valid for negative_ttl) are stored, so failures are retried on the next run.
+    """
+    def __init__(self, path=DEFAULT_STATE_PATH, ttls=None, default_ttl=DEFAULT_TTL, negative_ttl=NEGATIVE_TTL):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.ttls = dict(ECOSYSTEM_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        self.stats = {"fresh": 0, "stale": 0, "new": 0, "stored": 0}
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS resolutions (
+                namespace TEXT NOT NULL,
+                coordinate TEXT NOT NULL,
+                result TEXT NOT NULL,
+                source TEXT,
+                fetch_time REAL NOT NULL,
+                PRIMARY KEY (namespace, coordinate)
+            )
+            """
+        )
+
+    def ttl_for(self, coordinate, source=None):
+        """
+        Returns the validity in seconds of a stored resolution, based on the coordinate's ecosystem,
+        or negative_ttl for a negative answer.
+        """
+        if source == NEGATIVE_SOURCE:
+            return self.negative_ttl
+        return self.ttls.get(str(coordinate[0]).lower(), self.default_ttl)
+
+    def get_many(self, namespace, coordinates):
+        """
+        Returns {coordinate: {"result", "source", "fetch_time"}} for the coordinates with a
+        resolution that is still within its TTL; new and expired coordinates are left out.
+        fetch_time is an ISO timestamp, as the fetcher scripts print it.
+        """
+        coordinates = list(dict.fromkeys(tuple(coordinate) for coordinate in coordinates))
+        now = time.time()
+        found = {}
+        stale = 0
+        for start in range(0, len(coordinates), LOOKUP_BATCH_SIZE):
+            batch = {_key(coordinate): coordinate for coordinate in coordinates[start:start + LOOKUP_BATCH_SIZE]}
+            placeholders = ",".join("?" * len(batch))
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT coordinate, result, source, fetch_time FROM resolutions "
+                    f"WHERE namespace = ? AND coordinate IN ({placeholders})",
+                    (namespace, *batch)
+                ).fetchall()
+            for key, result, source, fetch_time in rows:
+                coordinate = batch[key]
+                if now - fetch_time <= self.ttl_for(coordinate, source):
+                    found[coordinate] = {
+                        "result": json.loads(result),
+                        "source": source,
+                        "fetch_time": datetime.fromtimestamp(fetch_time).isoformat(),
+                    }
+                else:
+                    stale += 1
+        with self._lock:
+            self.stats["fresh"] += len(found)
+            self.stats["stale"] += stale
+            self.stats["new"] += len(coordinates) - len(found) - stale
+        return found
+
+    def get(self, namespace, coordinate):
+        """
+        Returns the stored resolution of one coordinate (see get_many), or None if new or expired.
+        """
+        return self.get_many(namespace, [coordinate]).get(tuple(coordinate))
+
+    def put_many(self, namespace, items):
+        """
+        Stores resolutions in one transaction.
+
+        Args:
+            namespace (str): e.g. "manager", "clearlydefined" or "git_tags".
+            items (iterable): (coordinate, result, source) tuples; results must be JSON-serializable.
+        """
+        now = time.time()
+        rows = [(namespace, _key(coordinate), json.dumps(result, default=str), source, now)
+                for coordinate, result, source in items]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany("INSERT OR REPLACE INTO resolutions VALUES (?, ?, ?, ?, ?)", rows)
+            self._conn.execute("COMMIT")
+            self.stats["stored"] += len(rows)
+
+    def put(self, namespace, coordinate, result, source=None):
+        """
+        Stores the resolution of one coordinate.
+        """
+        self.put_many(namespace, [(coordinate, result, source)])
+
+    def clear(self, namespace=None):
+        """
+        Removes every stored resolution, or only those of one namespace.
+        """
+        with self._lock:
+            if namespace is None:
+                self._conn.execute("DELETE FROM resolutions")
+            else:
+                self._conn.execute("DELETE FROM resolutions WHERE namespace = ?", (namespace,))
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_store():
+    """
+    Returns the process-wide ResolutionStore, creating it on first use.
+    """
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = ResolutionStore()
+        return _default_store
+
+
+def set_store(store):
+    """
+    Replaces the process-wide ResolutionStore (e.g. with a temporary one for benchmarks).
+    """
+    global _default_store
+    with _default_store_lock:
+        _default_store = store
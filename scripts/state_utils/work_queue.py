@@ -0,0 +1,255 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Location of the shared work queue database (override with WORK_QUEUE_PATH)
+DEFAULT_QUEUE_PATH = os.environ.get(
+    "WORK_QUEUE_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "python-scripts", "work_queue.sqlite")
+)
+
+# Seconds a worker holds a lease before its items are handed to another worker
+LEASE_SECONDS = 300
+
+# Leases taken per item before it is marked failed instead of being retried again
+MAX_ATTEMPTS = 5
+
+# Seconds a failed item waits before it can be leased again; doubles with every attempt up to the cap
+RETRY_BACKOFF = 30
+MAX_RETRY_BACKOFF = 3600
+
+# Coordinates inserted per transaction by enqueue
+ENQUEUE_BATCH_SIZE = 5000
+
+# Seconds a writer waits for another process's transaction before giving up
+BUSY_TIMEOUT = 60
+
+
+class WorkQueue:
+    """
+    Durable SQLite queue of coordinates shared by any number of worker processes.
+
+    Workers lease a batch of items, resolve them and ack each one; a lease that is not acked
+    within its lease time expires, and the items go back to other workers, so a killed worker
+    only delays its batch. A failed item is retried after a backoff that doubles with each
+    attempt; items leased MAX_ATTEMPTS times without an ack are marked failed.
+    Every state change is one short IMMEDIATE transaction, so processes on the same host
+    coordinate through SQLite's locking alone. Workers on several hosts can share the file
+    only on a filesystem with reliable POSIX locks; otherwise give each host its own queue.
+    """
+    def __init__(self, path=DEFAULT_QUEUE_PATH, lease_seconds=LEASE_SECONDS, max_attempts=MAX_ATTEMPTS,
+                 retry_backoff=RETRY_BACKOFF, max_retry_backoff=MAX_RETRY_BACKOFF):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.max_retry_backoff = max_retry_backoff
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS items (
+                id INTEGER PRIMARY KEY,
+                coordinate TEXT NOT NULL UNIQUE,
+                state TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                worker TEXT,
+                lease_expires REAL,
+                not_before REAL,
+                result TEXT,
+                error TEXT,
+                enqueued_at REAL NOT NULL,
+                finished_at REAL
+            )
+            """
+        )
+        # Queues created before retries were delayed lack the not_before column
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(items)")]
+        if "not_before" not in columns:
+            self._conn.execute("ALTER TABLE items ADD COLUMN not_before REAL")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS items_state ON items (state, lease_expires)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS items_finished_at ON items (finished_at)")
+
+    def _transaction(self, statements):
+        """
+        Runs a function against the connection inside one IMMEDIATE transaction and returns its result.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = statements(self._conn)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return result
+
+    def enqueue(self, coordinates):
+        """
+        Adds coordinates to the queue; coordinates already queued (in any state) are ignored.
+        Accepts any iterable, e.g. read_inventory(paths), and inserts it in batches.
+
+        Returns:
+            int: Number of coordinates added.
+        """
+        added = 0
+        coordinates = iter(coordinates)
+        while True:
+            batch = [(json.dumps(list(coordinate)), time.time())
+                     for _, coordinate in zip(range(ENQUEUE_BATCH_SIZE), coordinates)]
+            if not batch:
+                return added
+
+            def insert(conn):
+                before = conn.total_changes
+                conn.executemany("INSERT OR IGNORE INTO items (coordinate, enqueued_at) VALUES (?, ?)", batch)
+                return conn.total_changes - before
+            added += self._transaction(insert)
+
+    def lease(self, worker, count=100):
+        """
+        Leases up to `count` pending items (or items whose lease has expired) to a worker.
+        Items released by fail() are only leased again once their backoff has passed.
+
+        Returns:
+            list: (item_id, coordinate) tuples; empty when there is nothing to do right now.
+        """
+        def take(conn):
+            now = time.time()
+            # Expired leases that used up their attempts are given up on
+            conn.execute(
+                "UPDATE items SET state = 'failed', finished_at = ?, error = 'lease expired' "
+                "WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, now, self.max_attempts)
+            )
+            rows = conn.execute(
+                "SELECT id, coordinate FROM items "
+                "WHERE (state = 'pending' AND (not_before IS NULL OR not_before <= ?)) "
+                "OR (state = 'leased' AND lease_expires < ?) ORDER BY id LIMIT ?",
+                (now, now, count)
+            ).fetchall()
+            conn.executemany(
+                "UPDATE items SET state = 'leased', worker = ?, lease_expires = ?, attempts = attempts + 1 WHERE id = ?",
+                [(worker, now + self.lease_seconds, item_id) for item_id, _ in rows]
+            )
+            return rows
+        return [(item_id, tuple(json.loads(coordinate))) for item_id, coordinate in self._transaction(take)]
+
+    def extend(self, worker, item_ids):
+        """
+        Renews a worker's leases on items it is still working on.
+        """
+        expires = time.time() + self.lease_seconds
+        self._transaction(lambda conn: conn.executemany(
+            "UPDATE items SET lease_expires = ? WHERE id = ? AND state = 'leased' AND worker = ?",
+            [(expires, item_id, worker) for item_id in item_ids]
+        ))
+
+    def ack(self, worker, results):
+        """
+        Marks leased items done and stores their results. Acks for leases that expired and
+        were taken over by another worker are ignored, so each item keeps one result.
+
+        Args:
+            worker (str): The worker that holds the leases.
+            results (iterable): (item_id, result) tuples; results must be JSON-serializable.
+
+        Returns:
+            int: Number of items marked done.
+        """
+        now = time.time()
+        rows = [(json.dumps(result, default=str), now, item_id, worker) for item_id, result in results]
+
+        def finish(conn):
+            before = conn.total_changes
+            conn.executemany(
+                "UPDATE items SET state = 'done', result = ?, finished_at = ?, lease_expires = NULL "
+                "WHERE id = ? AND state = 'leased' AND worker = ?",
+                rows
+            )
+            return conn.total_changes - before
+        return self._transaction(finish)
+
+    def fail(self, worker, item_ids, error):
+        """
+        Releases leased items after an error so they are retried (by any worker) once
+        retry_backoff * 2 ** (attempts - 1) seconds have passed, capped at max_retry_backoff,
+        or marks them failed once they have used up their attempts.
+        """
+        now = time.time()
+
+        def release(conn):
+            params = [(self.max_attempts, now, now, self.retry_backoff, self.max_retry_backoff, error, item_id, worker)
+                      for item_id in item_ids]
+            conn.executemany(
+                "UPDATE items SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "finished_at = ?, not_before = ? + MIN(? * (1 << MIN(attempts - 1, 30)), ?), "
+                "error = ?, lease_expires = NULL WHERE id = ? AND state = 'leased' AND worker = ?",
+                params
+            )
+        self._transaction(release)
+
+    def status(self, window=60):
+        """
+        Summarizes the queue for the coordinator.
+
+        Returns:
+            dict: Item counts per state ("expired" counts leases past their expiry, "delayed"
+            pending items waiting out a retry backoff), items done
+            in the last `window` seconds overall and per worker, throughput in items per second,
+            and the estimated seconds until the backlog is drained at that rate.
+        """
+        now = time.time()
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT state, COUNT(*) FROM items GROUP BY state").fetchall())
+            expired = self._conn.execute(
+                "SELECT COUNT(*) FROM items WHERE state = 'leased' AND lease_expires < ?", (now,)
+            ).fetchone()[0]
+            delayed = self._conn.execute(
+                "SELECT COUNT(*) FROM items WHERE state = 'pending' AND not_before > ?", (now,)
+            ).fetchone()[0]
+            recent = dict(self._conn.execute(
+                "SELECT worker, COUNT(*) FROM items WHERE state = 'done' AND finished_at >= ? GROUP BY worker",
+                (now - window,)
+            ).fetchall())
+        backlog = counts.get("pending", 0) + counts.get("leased", 0)
+        throughput = sum(recent.values()) / window
+        return {
+            "pending": counts.get("pending", 0),
+            "leased": counts.get("leased", 0),
+            "expired": expired,
+            "delayed": delayed,
+            "done": counts.get("done", 0),
+            "failed": counts.get("failed", 0),
+            "backlog": backlog,
+            "throughput": throughput,
+            "workers": recent,
+            "eta_seconds": backlog / throughput if throughput else None,
+        }
+
+    def results(self):
+        """
+        Yields (coordinate, result) for every finished item, including failed ones as
+        {"error": message}.
+        """
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT id, coordinate, state, result, error FROM items "
+                    "WHERE id > ? AND state IN ('done', 'failed') ORDER BY id LIMIT ?",
+                    (last_id, ENQUEUE_BATCH_SIZE)
+                ).fetchall()
+            if not rows:
+                return
+            for last_id, coordinate, state, result, error in rows:
+                yield tuple(json.loads(coordinate)), json.loads(result) if state == "done" else {"error": error}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,42 @@
+import os
+import sys
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# The command-line scripts (manager.py, ...) are imported as top-level modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from http_utils.cache import ResponseCache, set_cache
+
+
+@pytest.fixture
+def serve():
+    """
+    Starts a local stand-in server for a BaseHTTPRequestHandler subclass and returns its base URL.
+    """
+    servers = []
+
+    def start(handler):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_port}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def cache():
+    """
+    Replaces the shared HTTP cache with an empty in-memory one for the test.
+    """
+    response_cache = ResponseCache(":memory:")
+    set_cache(response_cache)
+    yield response_cache
+    set_cache(None)
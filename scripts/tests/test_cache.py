@@ -0,0 +1,185 @@
+import json
+from http.server import BaseHTTPRequestHandler
+
+from git_utils import rate_limit
+from git_utils.rate_limit import TokenPool, github_get
+from http_utils.cache import ResponseCache, cache_key, cached_get
+
+
+class StubResourceHandler(BaseHTTPRequestHandler):
+    """
+    Local stand-in for a JSON API that echoes the path and the Accept / Authorization headers it
+    was sent, and records the headers of every request.
+    """
+    protocol_version = "HTTP/1.1"
+    requests = []
+
+    def do_GET(self):
+        type(self).requests.append(dict(self.headers))
+        body = json.dumps({"path": self.path, "accept": self.headers.get("Accept"),
+                           "authorization": self.headers.get("Authorization")}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_handler():
+    return type("Handler", (StubResourceHandler,), {"requests": []})
+
+
+def test_fresh_entries_are_served_and_expired_ones_fetched_again(serve):
+    handler = make_handler()
+    base_url = serve(handler)
+    fresh = ResponseCache(":memory:", default_ttl=3600)
+    expired = ResponseCache(":memory:", default_ttl=-1)
+
+    for cache in (fresh, expired):
+        cached_get(f"{base_url}/resource", cache=cache)
+        cached_get(f"{base_url}/resource", cache=cache)
+
+    assert fresh.stats == {"hit": 1, "revalidated": 0, "downloaded": 1}
+    assert expired.stats == {"hit": 0, "revalidated": 0, "downloaded": 2}
+    assert len(handler.requests) == 3
+
+
+def test_least_recently_used_entries_are_evicted(serve):
+    base_url = serve(make_handler())
+    cache = ResponseCache(":memory:", default_ttl=3600)
+    for name in ("a", "b", "c"):
+        cached_get(f"{base_url}/{name}", cache=cache)
+    # Room for two of the three entries, after "a" was used again
+    cache.get(cache_key(f"{base_url}/a"))
+    sizes = [size for size, in cache._conn.execute("SELECT size FROM responses")]
+    cache.max_bytes = sum(sizes) - min(sizes)
+    cache._evict()
+
+    assert cache.get(cache_key(f"{base_url}/a")) is not None
+    assert cache.get(cache_key(f"{base_url}/b")) is None
+    assert cache.get(cache_key(f"{base_url}/c")) is not None
+
+
+def test_accept_and_authorization_select_separate_entries(serve, cache):
+    handler = make_handler()
+    url = f"{serve(handler)}/resource"
+
+    raw = cached_get(url, headers={"Accept": "application/vnd.github.raw"})
+    as_json = cached_get(url, headers={"Accept": "application/json"})
+    token_a = cached_get(url, headers={"Accept": "application/json", "Authorization": "token a"})
+    token_b = cached_get(url, headers={"Accept": "application/json", "Authorization": "token b"})
+    again = cached_get(url, headers={"accept": "application/json", "authorization": "token a"})
+
+    assert raw.json()["accept"] == "application/vnd.github.raw"
+    assert as_json.json()["accept"] == "application/json"
+    assert token_a.json()["authorization"] == "token a" and token_b.json()["authorization"] == "token b"
+    assert again.json() == token_a.json()
+    assert len(handler.requests) == 4
+    # The token itself never appears in the key
+    assert "token" not in cache_key(url, headers={"Authorization": "token a"})
+
+
+def test_github_entries_are_shared_by_every_pool_token(serve, cache, monkeypatch):
+    monkeypatch.setattr(rate_limit, "_default_pool", TokenPool())
+    handler = make_handler()
+    url = f"{serve(handler)}/repos/example/demo"
+
+    first = github_get(url, headers={"Authorization": "token a"})
+    second = github_get(url, headers={"Authorization": "token b"})
+    other_accept = github_get(url, headers={"Authorization": "token b", "Accept": "application/vnd.github.raw"})
+
+    assert second.json() == first.json()
+    assert other_accept.json()["accept"] == "application/vnd.github.raw"
+    assert len(handler.requests) == 2
+
+
+class StubConditionalHandler(BaseHTTPRequestHandler):
+    """
+    Local stand-in for a resource with a version: answers with its ETag (or only Last-Modified),
+    and with 304 Not Modified when the request's validator still matches. Records every request.
+    """
+    protocol_version = "HTTP/1.1"
+    version = 1
+    use_etag = True
+    requests = []
+
+    def do_GET(self):
+        type(self).requests.append(dict(self.headers))
+        etag, last_modified = f'"v{self.version}"', f"Mon, 0{self.version} Jan 2024 00:00:00 GMT"
+        validators = {"ETag": etag} if self.use_etag else {"Last-Modified": last_modified}
+        if self.headers.get("If-None-Match") == etag or (not self.use_etag and self.headers.get("If-Modified-Since") == last_modified):
+            self.send_response(304)
+            for name, value in validators.items():
+                self.send_header(name, value)
+            self.send_header("X-Checked", str(len(self.requests)))
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = json.dumps({"version": self.version}).encode("utf-8")
+        self.send_response(200)
+        for name, value in validators.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_conditional_handler(use_etag=True):
+    return type("Handler", (StubConditionalHandler,), {"version": 1, "use_etag": use_etag, "requests": []})
+
+
+def test_expired_entries_are_revalidated_with_their_etag(serve):
+    handler = make_conditional_handler()
+    url = f"{serve(handler)}/resource"
+    cache = ResponseCache(":memory:", default_ttl=-1)
+
+    first = cached_get(url, cache=cache)
+    second = cached_get(url, cache=cache)
+
+    assert first.json() == second.json() == {"version": 1}
+    assert second.status_code == 200
+    assert handler.requests[1]["If-None-Match"] == '"v1"'
+    assert cache.stats == {"hit": 0, "revalidated": 1, "downloaded": 1}
+    # Headers of the 304 are merged into the stored entry
+    assert cache.get(cache_key(url), include_stale=True)["headers"]["X-Checked"] == "2"
+
+    # A changed resource is downloaded and replaces the entry
+    handler.version = 2
+    assert cached_get(url, cache=cache).json() == {"version": 2}
+    assert cache.stats["downloaded"] == 2
+    assert cache.get(cache_key(url), include_stale=True)["headers"]["ETag"] == '"v2"'
+
+
+def test_last_modified_is_used_without_an_etag(serve):
+    handler = make_conditional_handler(use_etag=False)
+    url = f"{serve(handler)}/resource"
+    cache = ResponseCache(":memory:", default_ttl=-1)
+
+    cached_get(url, cache=cache)
+    assert cached_get(url, cache=cache).json() == {"version": 1}
+
+    assert "If-None-Match" not in handler.requests[1]
+    assert handler.requests[1]["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+    assert cache.stats["revalidated"] == 1
+
+
+def test_revalidated_entries_are_fresh_again(serve):
+    handler = make_conditional_handler()
+    url = f"{serve(handler)}/resource"
+    cache = ResponseCache(":memory:", default_ttl=3600)
+    cached_get(url, cache=cache)
+    cache._conn.execute("UPDATE responses SET fetched_at = 0")
+
+    cached_get(url, cache=cache)
+    cached_get(url, cache=cache)
+
+    assert cache.stats == {"hit": 1, "revalidated": 1, "downloaded": 1}
+    assert len(handler.requests) == 2
@@ -0,0 +1,79 @@
+import os
+import time
+
+import pytest
+
+from state_utils.checkpoint import CheckpointLog, checkpoint_path, open_checkpoint
+
+
+def test_records_are_replayed_and_skipped_on_restart(tmp_path):
+    path = str(tmp_path / "run.jsonl")
+    with CheckpointLog(path, remove_on_success=False) as log:
+        log.record(("npm", "left-pad", "1.3.0"), "MIT")
+        log.record("v1.0", {"license": None})
+
+    with CheckpointLog(path) as log:
+        assert log.stats["replayed"] == 2
+        assert ("npm", "left-pad", "1.3.0") in log
+        assert log.completed["v1.0"] == {"license": None}
+    # The finished run removes its log
+    assert not os.path.exists(path)
+
+
+def test_torn_last_line_is_cut_before_appending(tmp_path):
+    path = str(tmp_path / "run.jsonl")
+    with CheckpointLog(path, remove_on_success=False) as log:
+        log.record("v1.0", "MIT")
+        log.record("v2.0", "MIT")
+    whole = os.path.getsize(path)
+    with open(path, "ab") as log_file:
+        log_file.write(b'["v3.0","Apa')  # the crash hit mid-write
+
+    with CheckpointLog(path, remove_on_success=False) as log:
+        assert sorted(log.completed) == ["v1.0", "v2.0"]
+        assert os.path.getsize(path) == whole
+        log.record("v3.0", "Apache-2.0")
+
+    with CheckpointLog(path) as log:
+        assert log.completed == {"v1.0": "MIT", "v2.0": "MIT", "v3.0": "Apache-2.0"}
+
+
+def test_replay_stops_at_a_corrupt_line(tmp_path):
+    path = tmp_path / "run.jsonl"
+    path.write_bytes(b'["v1.0","MIT"]\n\x00\x00\x00\n["v2.0","MIT"]\n')
+
+    with CheckpointLog(str(path), remove_on_success=False) as log:
+        assert log.completed == {"v1.0": "MIT"}
+    assert path.read_bytes() == b'["v1.0","MIT"]\n'
+
+
+def test_log_is_kept_after_an_error(tmp_path):
+    path = str(tmp_path / "run.jsonl")
+    with pytest.raises(KeyboardInterrupt):
+        with CheckpointLog(path) as log:
+            log.record("v1.0", "MIT")
+            raise KeyboardInterrupt
+
+    with CheckpointLog(path) as log:
+        assert log.completed == {"v1.0": "MIT"}
+
+
+def test_busy_writer_still_syncs_every_interval(tmp_path):
+    path = str(tmp_path / "run.jsonl")
+    log = CheckpointLog(path, fsync_batch_size=1000, fsync_interval=0.2)
+    try:
+        # Records keep arriving faster than the interval, so the queue never goes quiet
+        for index in range(8):
+            log.record(f"v{index}", "MIT")
+            time.sleep(0.1)
+        assert os.path.getsize(path) > 0
+        assert log.stats["fsyncs"] >= 2
+    finally:
+        log.close(remove=True)
+
+
+def test_named_logs(tmp_path):
+    assert checkpoint_path("git_tags-owner/repo", str(tmp_path)) == str(tmp_path / "git_tags-owner_repo.jsonl")
+    with open_checkpoint("git_tags-owner/repo", str(tmp_path), remove_on_success=False) as log:
+        log.record("v1.0", "MIT")
+    assert os.path.exists(tmp_path / "git_tags-owner_repo.jsonl")
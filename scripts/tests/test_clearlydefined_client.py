@@ -0,0 +1,132 @@
+import json
+from http.server import BaseHTTPRequestHandler
+
+from clearlydefined_utils.client import ClearlyDefinedClient
+from http_utils.client import http_post
+from state_utils.resolution_store import ResolutionStore
+
+
+def definition(declared, *discovered):
+    return {"licensed": {"declared": declared, "facets": {"core": {"discovered": {"expressions": list(discovered)}}}}}
+
+
+class StubDefinitionsHandler(BaseHTTPRequestHandler):
+    """
+    Local stand-in for POST /definitions: answers the coordinates it knows and records every batch.
+    A batch containing a coordinate with the "broken" revision is rejected with a 400.
+    """
+    protocol_version = "HTTP/1.1"
+    definitions = {}
+    batches = []
+    unavailable = 0
+
+    def do_POST(self):
+        batch = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        type(self).batches.append(batch)
+        if type(self).unavailable:
+            type(self).unavailable -= 1
+            return self._send(503, {})
+        if any(coordinates.endswith("/broken") for coordinates in batch):
+            return self._send(400, {"error": "invalid coordinates"})
+        # The service answers with its own casing of the coordinates
+        self._send(200, {coordinates.lower(): self.definitions[coordinates.lower()]
+                         for coordinates in batch if coordinates.lower() in self.definitions})
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_handler(definitions, unavailable=0):
+    return type("Handler", (StubDefinitionsHandler,), {"definitions": definitions, "batches": [], "unavailable": unavailable})
+
+
+def test_get_licenses_batches_and_maps_results(serve, cache):
+    handler = make_handler({
+        "maven/mavencentral/org.example/lib-0/1.0": definition("Apache-2.0", "Apache-2.0", "MIT"),
+        "npm/npmjs/@scope/pkg/2.0.0": definition("mit"),
+        "nuget/nuget/-/newtonsoft.json/13.0.1": definition(None, "MIT"),
+    })
+    client = ClearlyDefinedClient(base_url=serve(handler), batch_size=2)
+    packages = [
+        ("maven", "org.example:lib-0", "1.0"),
+        ("npm", "@scope/pkg", "2.0.0"),
+        ("nuget", "Newtonsoft.Json", "13.0.1"),
+        ("pypi", "unknown", "0.1"),
+        ("maven", "org.example:lib-0", "1.0"),
+    ]
+
+    results = client.get_licenses(packages)
+
+    assert handler.batches == [
+        ["maven/mavencentral/org.example/lib-0/1.0", "npm/npmjs/@scope/pkg/2.0.0"],
+        ["nuget/nuget/-/Newtonsoft.Json/13.0.1", "pypi/pypi/-/unknown/0.1"],
+    ]
+    assert results == {
+        ("maven", "org.example:lib-0", "1.0"): {"declared": "Apache-2.0", "discovered": "Apache-2.0 AND MIT"},
+        ("npm", "@scope/pkg", "2.0.0"): {"declared": "MIT", "discovered": None},
+        ("nuget", "Newtonsoft.Json", "13.0.1"): {"declared": None, "discovered": "MIT"},
+        ("pypi", "unknown", "0.1"): {"declared": None, "discovered": None},
+    }
+
+
+def test_known_definitions_are_served_from_the_cache(serve, cache):
+    handler = make_handler({"pypi/pypi/-/requests/2.31.0": definition("Apache-2.0")})
+    client = ClearlyDefinedClient(base_url=serve(handler))
+
+    first = client.get_licenses([("pypi", "requests", "2.31.0")])
+    second = client.get_licenses([("pypi", "requests", "2.31.0")])
+
+    assert first == second == {("pypi", "requests", "2.31.0"): {"declared": "Apache-2.0", "discovered": None}}
+    assert len(handler.batches) == 1
+
+
+def test_empty_definitions_are_asked_again(serve, cache):
+    handler = make_handler({
+        "pypi/pypi/-/requests/2.31.0": definition("Apache-2.0"),
+        "pypi/pypi/-/fresh/0.1": definition(None),
+    })
+    store = ResolutionStore(":memory:")
+    client = ClearlyDefinedClient(base_url=serve(handler), store=store)
+    packages = [("pypi", "requests", "2.31.0"), ("pypi", "fresh", "0.1"), ("pypi", "unknown", "0.1")]
+
+    client.get_licenses(packages)
+    results = client.get_licenses(packages)
+
+    assert results[("pypi", "fresh", "0.1")] == results[("pypi", "unknown", "0.1")] == {"declared": None, "discovered": None}
+    assert list(store.get_many("clearlydefined", packages)) == [("pypi", "requests", "2.31.0")]
+    assert handler.batches[1] == ["pypi/pypi/-/fresh/0.1", "pypi/pypi/-/unknown/0.1"]
+
+
+def test_failed_batch_maps_only_its_packages_to_errors(serve, cache):
+    handler = make_handler({"npm/npmjs/-/left-pad/1.3.0": definition("WTFPL")})
+    client = ClearlyDefinedClient(base_url=serve(handler), batch_size=1)
+
+    results = client.get_licenses([("npm", "left-pad", "1.3.0"), ("npm", "left-pad", "broken")])
+
+    assert results == {
+        ("npm", "left-pad", "1.3.0"): {"declared": "WTFPL", "discovered": None},
+        ("npm", "left-pad", "broken"): {"error": "Error fetching license info"},
+    }
+
+
+def test_post_retries_are_limited_to_the_clearlydefined_session(serve, cache):
+    handler = make_handler({"npm/npmjs/-/left-pad/1.3.0": definition("WTFPL")}, unavailable=1)
+    base_url = serve(handler)
+
+    # The ClearlyDefined session retries the read-only batch query after a 503
+    results = ClearlyDefinedClient(base_url=base_url).get_licenses([("npm", "left-pad", "1.3.0")])
+    assert results == {("npm", "left-pad", "1.3.0"): {"declared": "WTFPL", "discovered": None}}
+    assert len(handler.batches) == 2
+
+    # Any other POST is sent once
+    handler.unavailable = 1
+    assert http_post(f"{base_url}/definitions", json=["npm/npmjs/-/left-pad/1.3.0"]).status_code == 503
+    assert len(handler.batches) == 3
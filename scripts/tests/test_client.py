@@ -0,0 +1,103 @@
+import time
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from http_utils import client
+from http_utils.client import GITHUB_PROFILE, http_get
+
+
+class StubFlakyHandler(BaseHTTPRequestHandler):
+    """
+    Local stand-in for a server that fails the first `failures` requests with `status` (adding
+    the class's retry_after header if set) and answers 200 afterwards. Records every request time.
+    """
+    protocol_version = "HTTP/1.1"
+    failures = 0
+    status = 503
+    retry_after = None
+    times = []
+
+    def do_GET(self):
+        handler = type(self)
+        handler.times.append(time.monotonic())
+        status = 200
+        if handler.failures:
+            handler.failures -= 1
+            status = handler.status
+        body = b"ok" if status == 200 else b"unavailable"
+        self.send_response(status)
+        if status != 200 and handler.retry_after is not None:
+            self.send_header("Retry-After", handler.retry_after)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_handler(failures, status=503, retry_after=None):
+    return type("Handler", (StubFlakyHandler,), {"failures": failures, "status": status,
+                                                 "retry_after": retry_after, "times": []})
+
+
+@pytest.fixture
+def retries():
+    """
+    Sets the shared client to two retries without backoff, restoring the defaults afterwards.
+    """
+    client.configure(retries=2, backoff_factor=0, backoff_jitter=0)
+    yield
+    client.configure(retries=client.DEFAULT_RETRIES, backoff_factor=client.DEFAULT_BACKOFF_FACTOR,
+                     backoff_jitter=client.DEFAULT_BACKOFF_JITTER)
+
+
+def test_server_errors_are_retried_until_the_limit(serve, retries):
+    recovering = make_handler(failures=2)
+    failing = make_handler(failures=5)
+
+    assert http_get(f"{serve(recovering)}/resource").status_code == 200
+    assert len(recovering.times) == 3
+    # Out of retries, the last answer is returned instead of raising
+    assert http_get(f"{serve(failing)}/resource").status_code == 503
+    assert len(failing.times) == 3
+
+
+def test_429_is_retried_by_default_but_left_to_the_token_pool_for_github(serve, retries):
+    handler = make_handler(failures=1, status=429, retry_after="0")
+    url = f"{serve(handler)}/resource"
+
+    assert http_get(url).status_code == 200
+    assert len(handler.times) == 2
+
+    handler.failures = 1
+    assert http_get(url, profile=GITHUB_PROFILE).status_code == 429
+    assert len(handler.times) == 3
+    # GitHub 5xx answers are still retried
+    handler.failures, handler.status = 1, 502
+    assert http_get(url, profile=GITHUB_PROFILE).status_code == 200
+    assert len(handler.times) == 5
+
+
+def test_retries_back_off_exponentially(serve):
+    client.configure(retries=3, backoff_factor=0.1, backoff_jitter=0)
+    try:
+        handler = make_handler(failures=3)
+        assert http_get(f"{serve(handler)}/resource").status_code == 200
+    finally:
+        client.configure(retries=client.DEFAULT_RETRIES, backoff_factor=client.DEFAULT_BACKOFF_FACTOR,
+                         backoff_jitter=client.DEFAULT_BACKOFF_JITTER)
+
+    gaps = [later - earlier for earlier, later in zip(handler.times, handler.times[1:])]
+    # urllib3 retries the first failure at once, then waits backoff_factor * 2 ** (n - 1)
+    assert gaps[0] < 0.1
+    assert gaps[1] == pytest.approx(0.2, abs=0.08)
+    assert gaps[2] == pytest.approx(0.4, abs=0.08)
+
+
+def test_retry_after_is_honored_by_default(serve, retries):
+    handler = make_handler(failures=1, status=503, retry_after="1")
+
+    assert http_get(f"{serve(handler)}/resource").status_code == 200
+    assert handler.times[1] - handler.times[0] >= 0.9
@@ -0,0 +1,68 @@
+import pytest
+
+from license_utils.expression import combine_expressions, normalize_expression, parse_expression
+
+
+@pytest.mark.parametrize("text, expected", [
+    # Free-form names, PyPI classifier names and deprecated IDs
+    ("Apache 2.0", "Apache-2.0"),
+    ("The Apache Software License, Version 2.0", "Apache-2.0"),
+    ("mit", "MIT"),
+    ("Expat", "MIT"),
+    ("New BSD License", "BSD-3-Clause"),
+    ("Eclipse Public License 1.0", "EPL-1.0"),
+    ("GNU General Public License v3 or later (GPLv3+)", "GPL-3.0-or-later"),
+    ("GPLv2 or later", "GPL-2.0-or-later"),
+    ("GPL-2.0", "GPL-2.0-only"),
+    ("LGPL-2.1+", "LGPL-2.1-or-later"),
+    ("GPL-2.0-with-classpath-exception", "GPL-2.0-only WITH Classpath-exception-2.0"),
+    # Names that leave the license or its version open are kept as references
+    ("BSD", "LicenseRef-BSD"),
+    ("Some Custom License", "LicenseRef-Some-Custom-License"),
+    ("LicenseRef-Internal", "LicenseRef-Internal"),
+])
+def test_aliases(text, expected):
+    assert normalize_expression(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("GPL-2.0+ OR mit", "GPL-2.0-or-later OR MIT"),
+    ("MIT or Apache 2.0", "MIT OR Apache-2.0"),
+    # AND binds tighter than OR, WITH tighter than AND
+    ("MIT OR Apache-2.0 AND BSD-3-Clause", "MIT OR Apache-2.0 AND BSD-3-Clause"),
+    ("(MIT OR Apache-2.0) AND BSD-3-Clause", "(MIT OR Apache-2.0) AND BSD-3-Clause"),
+    ("((MIT))", "MIT"),
+    ("Apache-2.0 WITH llvm-exception AND MIT", "Apache-2.0 WITH LLVM-exception AND MIT"),
+    ("MIT AND MIT AND (ISC AND MIT)", "MIT AND ISC"),
+    # Lowercase operators split a value only when every part is a known license
+    ("Dual MIT and GPL", "LicenseRef-Dual-MIT-and-GPL"),
+])
+def test_expressions(text, expected):
+    assert normalize_expression(text) == expected
+
+
+def test_parse_tree():
+    assert parse_expression("MIT OR (Apache-2.0 AND GPL-2.0-only WITH Classpath-exception-2.0)") == (
+        "OR", (("LICENSE", "MIT"),
+               ("AND", (("LICENSE", "Apache-2.0"),
+                        ("WITH", ("LICENSE", "GPL-2.0-only"), "Classpath-exception-2.0")))))
+
+
+@pytest.mark.parametrize("text", ["(MIT", "MIT OR", "MIT) OR (ISC", "AND"])
+def test_invalid_expressions_raise_and_are_kept_unchanged(text):
+    with pytest.raises(ValueError):
+        parse_expression(text)
+    assert normalize_expression(f" {text} ") == text
+
+
+def test_empty_values():
+    assert normalize_expression(None) is None
+    assert normalize_expression("  ") is None
+    assert combine_expressions([None, ""]) is None
+
+
+def test_combine_expressions():
+    assert combine_expressions(["MIT", "Apache-2.0 OR MIT", "mit"]) == "MIT AND (Apache-2.0 OR MIT)"
+    assert combine_expressions(["MIT", "ISC"], operator="OR") == "MIT OR ISC"
+    # Unparseable parts are kept as they are
+    assert combine_expressions(["MIT", "(broken"]) == "MIT AND (broken"
@@ -0,0 +1,128 @@
+import json
+import re
+from http.server import BaseHTTPRequestHandler
+
+from git_utils.graphql_backend import LICENSE_FILE_NAMES, get_licenses_graphql
+
+COMMIT = "a" * 40
+TAG_OBJECT = "b" * 40
+
+
+class StubGraphQLHandler(BaseHTTPRequestHandler):
+    """
+    Local stand-in for GitHub's GraphQL endpoint that answers the aliased repository queries of
+    build_query from a table of repositories, and records the variables of every request.
+
+    repositories maps "owner/name" to {"license": (spdx_id, name), "tags": {tag: annotated},
+    "files": {tag:path: text}}; unknown repositories get GitHub's NOT_FOUND error.
+    """
+    protocol_version = "HTTP/1.1"
+    repositories = {}
+    requests = []
+    reject = None
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        type(self).requests.append(body["variables"])
+        if self.reject:
+            return self._send({"data": None, "errors": [{"message": self.reject}]})
+
+        variables = body["variables"]
+        data, errors = {}, []
+        for alias in sorted(set(re.findall(r"(r\d+): repository", body["query"]))):
+            i = alias[1:]
+            full_name = f"{variables[f'owner{i}']}/{variables[f'name{i}']}"
+            repository = self.repositories.get(full_name)
+            if repository is None:
+                data[alias] = None
+                errors.append({"type": "NOT_FOUND", "path": [alias],
+                               "message": f"Could not resolve to a Repository with the name '{full_name}'."})
+                continue
+            spdx_id, name = repository["license"]
+            tag = variables[f"tag{i}"].removeprefix("refs/tags/")
+            tag_ref = None
+            if tag in repository["tags"]:
+                target = {"oid": TAG_OBJECT, "target": {"oid": COMMIT}} if repository["tags"][tag] else {"oid": COMMIT}
+                tag_ref = {"target": target}
+            data[alias] = {"licenseInfo": {"spdxId": spdx_id, "name": name}, "tagRef": tag_ref}
+            for index in range(len(LICENSE_FILE_NAMES)):
+                text = repository["files"].get(variables[f"expression{i}_{index}"])
+                data[alias][f"file{index}"] = {"text": text} if text is not None else None
+        self._send({"data": data, "errors": errors} if errors else {"data": data})
+
+    def _send(self, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_handler(repositories=None, reject=None):
+    return type("Handler", (StubGraphQLHandler,), {"repositories": repositories or {}, "requests": [], "reject": reject})
+
+
+REPOSITORIES = {
+    "jamesnk/newtonsoft.json": {
+        "license": ("MIT", "MIT License"),
+        "tags": {"13.0.1": True},
+        "files": {"13.0.1:LICENSE.md": "SPDX-License-Identifier: MIT\n"},
+    },
+    "psf/requests": {
+        "license": ("Apache-2.0", "Apache License 2.0"),
+        "tags": {"v2.31.0": False, "v0.1": False},
+        "files": {"v2.31.0:LICENSE": "SPDX-License-Identifier: Apache-2.0\n"},
+    },
+}
+
+
+def test_batches_and_parses_repositories(serve):
+    handler = make_handler(REPOSITORIES)
+    results = get_licenses_graphql(
+        [("JamesNK", "Newtonsoft.Json", "13.0.1"), ("psf", "requests", "v2.31.0"),
+         ("psf", "requests", "v0.1"), ("jamesnk", "newtonsoft.json", "13.0.1")],
+        github_token="stub-token", batch_size=2, graphql_url=f"{serve(handler)}/graphql",
+    )
+
+    # Owner / repo names differing only in case are queried once
+    assert [len([key for key in variables if key.startswith("owner")]) for variables in handler.requests] == [2, 1]
+    annotated = results[("JamesNK", "Newtonsoft.Json", "13.0.1")]
+    assert annotated == results[("jamesnk", "newtonsoft.json", "13.0.1")]
+    assert annotated["commit"] == COMMIT
+    assert annotated["license_at_tag"] == "MIT"
+    assert annotated["license_at_repo"] == "MIT License"
+    assert annotated["spdx_id"] == "MIT"
+    assert results[("psf", "requests", "v2.31.0")]["commit"] == COMMIT
+    assert results[("psf", "requests", "v2.31.0")]["license_at_tag"] == "Apache-2.0"
+    assert results[("psf", "requests", "v0.1")]["license_at_tag"] == "No LICENSE file found at the specified tag."
+
+
+def test_reports_missing_tags_and_repositories(serve):
+    handler = make_handler(REPOSITORIES)
+    results = get_licenses_graphql(
+        [("psf", "requests", "v9.9.9"), ("nobody", "nothing", "1.0")],
+        github_token="stub-token", graphql_url=f"{serve(handler)}/graphql",
+    )
+
+    assert results[("psf", "requests", "v9.9.9")]["license_at_tag"] == "Tag not found in the repository."
+    missing = results[("nobody", "nothing", "1.0")]
+    assert missing["license_at_tag"] == missing["license_at_repo"] == \
+        "Could not resolve to a Repository with the name 'nobody/nothing'."
+    assert missing["commit"] is None
+
+
+def test_query_level_errors_are_not_masked_as_missing_repositories(serve):
+    handler = make_handler(REPOSITORIES, reject="Query has complexity of 60000, which exceeds max complexity of 50000")
+    results = get_licenses_graphql(
+        [("psf", "requests", "v2.31.0"), ("JamesNK", "Newtonsoft.Json", "13.0.1")],
+        github_token="stub-token", graphql_url=f"{serve(handler)}/graphql",
+    )
+
+    assert results == {
+        repository: {"error": "GraphQL error: Query has complexity of 60000, which exceeds max complexity of 50000"}
+        for repository in [("psf", "requests", "v2.31.0"), ("JamesNK", "Newtonsoft.Json", "13.0.1")]
+    }
@@ -0,0 +1,57 @@
+import os
+
+import pytest
+
+from license_utils.identify import CORPUS_DIR, MIN_CONFIDENCE, get_license_name, identify_license
+
+MIT_VARIANT = """MIT License
+
+Copyright (c) 2019-2024 Example Corp. and contributors
+Copyright 2018 Jane Doe <jane@example.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT
+LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO
+EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR
+THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+
+def read_corpus(spdx_id):
+    with open(os.path.join(CORPUS_DIR, f"{spdx_id}.txt"), encoding="utf-8") as license_file:
+        return license_file.read()
+
+
+@pytest.mark.parametrize("spdx_id", sorted(name[:-len(".txt")] for name in os.listdir(CORPUS_DIR) if name.endswith(".txt")))
+def test_exact_corpus_texts_identify_as_themselves(spdx_id):
+    assert identify_license(read_corpus(spdx_id))["spdx_id"] == spdx_id
+
+
+def test_copyright_lines_and_wrapping_do_not_matter():
+    assert identify_license(MIT_VARIANT) == {"spdx_id": "MIT", "confidence": 1.0}
+    # BSD-3-Clause contains the whole BSD-2-Clause text, but is reported as itself
+    bsd = read_corpus("BSD-3-Clause").replace("Copyright (c) <year> <owner>", "Copyright (c) 2024, Example Org")
+    assert identify_license(bsd)["spdx_id"] == "BSD-3-Clause"
+
+
+def test_gpl_texts_are_reported_with_their_only_ids():
+    # The bare text does not grant "or later"; a declared identifier does
+    assert get_license_name(read_corpus("GPL-2.0-only")) == "GPL-2.0-only"
+    assert get_license_name("SPDX-License-Identifier: GPL-2.0+\n\n" + read_corpus("GPL-2.0-only")) == "GPL-2.0-or-later"
+
+
+def test_texts_below_the_threshold_are_not_identified():
+    # The first half of the MIT text covers less than MIN_CONFIDENCE of its n-grams
+    assert identify_license(MIT_VARIANT[:MIT_VARIANT.index("The above copyright")]) is None
+    assert identify_license("Proprietary. All rights reserved; no license is granted.") is None
+    assert identify_license(MIT_VARIANT[:300]) is None
+    assert get_license_name("Custom License v1\n\nAll rights reserved.") == "Custom License v1"
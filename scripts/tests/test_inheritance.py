@@ -0,0 +1,104 @@
+from http.server import BaseHTTPRequestHandler
+
+from maven_utils.inheritance import ParentPomResolver
+from maven_utils.pom_parser import parse_pom
+
+
+def pom(artifact_id, parent=None, body=""):
+    parent_xml = ""
+    if parent:
+        parent_xml = f"<parent><groupId>org.example</groupId><artifactId>{parent}</artifactId><version>1</version></parent>"
+    return (f'<project xmlns="http://maven.apache.org/POM/4.0.0">{parent_xml}'
+            f"<artifactId>{artifact_id}</artifactId><version>1</version>{body}</project>")
+
+
+LICENSES = "<licenses><license><name>Apache-2.0</name></license></licenses>"
+SCM = "<scm><url>https://github.com/example/root</url></scm>"
+
+
+class StubMavenHandler(BaseHTTPRequestHandler):
+    """
+    Local stand-in for a Maven repository serving org.example:{artifact}:1 POMs from a table;
+    other paths get a 404. Every requested path is recorded.
+    """
+    protocol_version = "HTTP/1.1"
+    poms = {}
+    paths = []
+
+    def do_GET(self):
+        type(self).paths.append(self.path)
+        artifact_id = self.path.split("/")[3] if self.path.startswith("/org/example/") else None
+        body = self.poms.get(artifact_id, "").encode("utf-8")
+        self.send_response(200 if artifact_id in self.poms else 404)
+        self.send_header("Content-Type", "application/xml")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_handler(poms):
+    return type("Handler", (StubMavenHandler,), {"poms": poms, "paths": []})
+
+
+def test_fields_are_inherited_along_the_chain_and_parents_memoized(serve, cache):
+    handler = make_handler({
+        "parent": pom("parent", parent="root", body=LICENSES),
+        "root": pom("root", body=SCM + "<url>https://example.org</url>"),
+    })
+    resolver = ParentPomResolver(serve(handler))
+
+    first = resolver.resolve(parse_pom(pom("first", parent="parent")))
+    second = resolver.resolve(parse_pom(pom("second", parent="parent", body="<url>https://example.org/second</url>")))
+
+    assert first["group_id"] == "org.example"
+    assert first["licenses"] == [{"name": "Apache-2.0", "url": None}]
+    assert first["scm"]["url"] == "https://github.com/example/root"
+    assert first["inherited_from"] == {"licenses": "org.example:parent:1", "scm": "org.example:root:1",
+                                       "url": "org.example:root:1"}
+    # A field the child declares is kept
+    assert second["url"] == "https://example.org/second" and second["inherited_from"]["url"] is None
+    assert len(handler.paths) == 2
+    assert resolver.stats == {"hits": 1, "misses": 2}
+
+
+def test_complete_poms_do_not_fetch_their_parent(serve, cache):
+    handler = make_handler({})
+    resolver = ParentPomResolver(serve(handler))
+
+    effective = resolver.resolve(parse_pom(pom("demo", parent="parent", body=LICENSES + SCM + "<url>https://x</url>")))
+
+    assert effective["inherited_from"] == {"licenses": None, "scm": None, "url": None}
+    assert handler.paths == []
+
+
+def test_missing_parent_leaves_the_fields_empty_and_is_memoized(serve, cache):
+    handler = make_handler({})
+    resolver = ParentPomResolver(serve(handler))
+
+    for _ in range(2):
+        effective = resolver.resolve(parse_pom(pom("demo", parent="gone")))
+        assert effective["licenses"] == [] and effective["scm"] is None
+        assert effective["inherited_from"] == {"licenses": None, "scm": None, "url": None}
+
+    assert handler.paths == ["/org/example/gone/1/gone-1.pom"]
+    assert resolver.stats == {"hits": 1, "misses": 1}
+
+
+def test_parent_cycles_stop_at_the_depth_limit(serve, cache):
+    handler = make_handler({
+        "a": pom("a", parent="b"),
+        "b": pom("b", parent="a", body=LICENSES),
+    })
+    resolver = ParentPomResolver(serve(handler), max_depth=4)
+
+    effective = resolver.resolve(parse_pom(pom("child", parent="a")))
+
+    assert effective["licenses"] == [{"name": "Apache-2.0", "url": None}]
+    assert effective["inherited_from"]["licenses"] == "org.example:b:1"
+    assert effective["scm"] is None
+    # Each POM of the cycle is downloaded once; later rounds are served by the HTTP cache
+    assert sorted(set(handler.paths)) == ["/org/example/a/1/a-1.pom", "/org/example/b/1/b-1.pom"]
+    assert len(handler.paths) == 2
@@ -0,0 +1,219 @@
+import io
+import json
+
+import pytest
+
+from inventory_utils import json_stream
+from inventory_utils.inventory import get_reader, read_inventory
+from inventory_utils.json_stream import _JsonReader
+from inventory_utils.sbom import parse_purl, read_cyclonedx
+
+PACKAGE_LOCK_V3 = {
+    "name": "app", "lockfileVersion": 3,
+    "packages": {
+        "": {"name": "app", "version": "1.0.0"},
+        "packages/tool": {"name": "tool", "version": "0.1.0"},
+        "node_modules/tool": {"resolved": "packages/tool", "link": True},
+        "node_modules/left-pad": {"version": "1.3.0", "resolved": "https://registry.npmjs.org/left-pad/-/left-pad-1.3.0.tgz"},
+        "node_modules/@scope/pkg": {"version": "2.0.0", "resolved": "https://npm.example.com/@scope/pkg/-/pkg-2.0.0.tgz"},
+        "node_modules/a/node_modules/left-pad": {"version": "1.1.0"},
+        "node_modules/forked": {"version": "1.0.0", "resolved": "git+ssh://git@github.com/example/forked.git#abc"},
+        "node_modules/alias": {"name": "real-name", "version": "3.0.0"},
+    },
+}
+
+PACKAGE_LOCK_V1 = {
+    "lockfileVersion": 1,
+    "dependencies": {
+        "a": {"version": "1.0.0", "dependencies": {"b": {"version": "2.0.0"}}},
+        "local": {"version": "file:../local"},
+    },
+}
+
+YARN_CLASSIC = """# THIS IS AN AUTOGENERATED FILE.
+# yarn lockfile v1
+
+
+"@babel/core@^7.0.0", "@babel/core@^7.1.0":
+  version "7.24.0"
+  resolved "https://registry.yarnpkg.com/@babel/core/-/core-7.24.0.tgz"
+  dependencies:
+    debug "^4.1.0"
+
+debug@^4.1.0:
+  version "4.3.4"
+"""
+
+YARN_BERRY = """__metadata:
+  version: 6
+  cacheKey: 8
+
+"app@workspace:.":
+  version: 0.0.0-use.local
+  resolution: "app@workspace:."
+
+"debug@npm:^4.1.0":
+  version: 4.3.4
+  resolution: "debug@npm:4.3.4"
+"""
+
+POETRY_LOCK = """[[package]]
+name = "Flask_Login"
+version = "0.6.3"
+
+[package.dependencies]
+name = "not-a-package"
+version = "0"
+
+[[package]]
+name = "requests"
+version = "2.31.0"
+
+[metadata]
+lock-version = "2.0"
+"""
+
+NUGET_LOCK = {
+    "version": 1,
+    "dependencies": {
+        "net6.0": {
+            "Newtonsoft.Json": {"type": "Direct", "requested": "[13.0.1, )", "resolved": "13.0.1"},
+            "MyProject.Core": {"type": "Project"},
+        },
+        "net48": {"Newtonsoft.Json": {"type": "Direct", "resolved": "13.0.1"}},
+    },
+}
+
+CYCLONEDX = {
+    "bomFormat": "CycloneDX", "specVersion": "1.5",
+    "metadata": {"component": {"purl": "pkg:npm/app@1.0.0"}},
+    "components": [
+        {"purl": "pkg:maven/org.example/lib@1.0?type=jar",
+         "components": [{"purl": "pkg:npm/%40scope/pkg@2.0.0"}]},
+        {"purl": "pkg:golang/example.com/mod@v1.0.0"},
+        {"name": "no-purl"},
+    ],
+}
+
+SPDX = {
+    "spdxVersion": "SPDX-2.3",
+    "packages": [
+        {"name": "requests", "externalRefs": [
+            {"referenceType": "purl", "referenceLocator": "pkg:pypi/Requests@2.31.0"},
+            {"referenceType": "cpe23Type", "referenceLocator": "cpe:2.3:a:python:requests:2.31.0"},
+        ]},
+        {"name": "Newtonsoft.Json", "externalRefs": [{"referenceType": "purl", "referenceLocator": "pkg:nuget/Newtonsoft.Json@13.0.1"}]},
+    ],
+}
+
+
+@pytest.fixture(autouse=True)
+def builtin_json_reader(monkeypatch):
+    """
+    Streams JSON with the built-in reader whether or not ijson is installed.
+    """
+    monkeypatch.setattr(json_stream, "ijson", None)
+
+
+def write(tmp_path, name, content):
+    path = tmp_path / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content if isinstance(content, str) else json.dumps(content), encoding="utf-8")
+    return str(path)
+
+
+def read(path):
+    return list(get_reader(path)(path))
+
+
+def test_package_lock(tmp_path):
+    assert read(write(tmp_path, "package-lock.json", PACKAGE_LOCK_V3)) == [
+        ("npm", "left-pad", "1.3.0"),
+        ("npm", "@scope/pkg", "2.0.0"),
+        ("npm", "left-pad", "1.1.0"),
+        ("npm", "real-name", "3.0.0"),
+    ]
+    assert read(write(tmp_path, "v1/npm-shrinkwrap.json", PACKAGE_LOCK_V1)) == [("npm", "a", "1.0.0"), ("npm", "b", "2.0.0")]
+
+
+def test_yarn_lock(tmp_path):
+    assert read(write(tmp_path, "yarn.lock", YARN_CLASSIC)) == [("npm", "@babel/core", "7.24.0"), ("npm", "debug", "4.3.4")]
+    assert read(write(tmp_path, "berry/yarn.lock", YARN_BERRY)) == [("npm", "debug", "4.3.4")]
+
+
+def test_poetry_lock_and_requirements(tmp_path):
+    assert read(write(tmp_path, "poetry.lock", POETRY_LOCK)) == [("pypi", "flask-login", "0.6.3"), ("pypi", "requests", "2.31.0")]
+
+    write(tmp_path, "base-requirements.txt", "Django==4.2.7  # LTS\n-r requirements.txt\n")
+    path = write(tmp_path, "requirements.txt", "\n".join([
+        "-r base-requirements.txt",
+        "requests[socks]==2.31.0 ; python_version >= '3.8'",
+        "numpy>=1.24",
+        "# comment",
+        "black===23.1.0",
+    ]))
+    assert read(path) == [("pypi", "django", "4.2.7"), ("pypi", "requests", "2.31.0"), ("pypi", "black", "23.1.0")]
+
+
+def test_nuget_lock(tmp_path):
+    assert read(write(tmp_path, "packages.lock.json", NUGET_LOCK)) == [
+        ("nuget", "newtonsoft.json", "13.0.1"), ("nuget", "newtonsoft.json", "13.0.1"),
+    ]
+
+
+def test_sboms(tmp_path):
+    assert read(write(tmp_path, "bom.cdx.json", CYCLONEDX)) == [
+        ("maven", "org.example:lib", "1.0"), ("npm", "@scope/pkg", "2.0.0"),
+    ]
+    assert read(write(tmp_path, "sbom.spdx.json", SPDX)) == [("pypi", "requests", "2.31.0"), ("nuget", "newtonsoft.json", "13.0.1")]
+    # Other .json files are recognised by their content
+    assert get_reader(write(tmp_path, "bom.json", CYCLONEDX)) is read_cyclonedx
+    with pytest.raises(ValueError, match="Unsupported inventory file"):
+        get_reader(write(tmp_path, "config.json", {"name": "app"}))
+
+
+def test_parse_purl():
+    assert parse_purl("pkg:maven/org.apache.commons/commons-lang3@3.12.0") == ("maven", "org.apache.commons:commons-lang3", "3.12.0")
+    assert parse_purl("pkg:npm/left-pad@1.3.0#src") == ("npm", "left-pad", "1.3.0")
+    assert parse_purl("pkg:pypi/requests") is None
+    assert parse_purl("pkg:maven/lib@1.0") is None
+    assert parse_purl("https://example.org") is None
+
+
+def test_read_inventory_drops_duplicates_across_files(tmp_path):
+    stats = {}
+    paths = [write(tmp_path, "bom.cdx.json", CYCLONEDX), write(tmp_path, "package-lock.json", PACKAGE_LOCK_V3)]
+
+    coordinates = list(read_inventory(paths, stats))
+
+    assert coordinates.count(("npm", "@scope/pkg", "2.0.0")) == 1
+    assert len(coordinates) == 5
+    assert stats == {"read": 6, "duplicates": 1}
+
+
+DOCUMENT = {
+    "skipped": {"text": "brackets ] } [ { and \"escaped\" quotes \\", "nested": [[1, 2], {"a": None}]},
+    "numbers": [7, -12.5, 2.5e10, 3E+2, -0.5e-3, 12345678901234567890, True, False, None],
+    "objects": [{"name": "é☃", "path": "C:\\\\tmp"}, [], {}],
+}
+
+
+@pytest.mark.parametrize("chunk_size", range(1, 17))
+def test_json_reader_across_chunk_boundaries(chunk_size):
+    text = json.dumps(DOCUMENT, ensure_ascii=False)
+
+    for key in DOCUMENT:
+        reader = _JsonReader(io.StringIO(text), chunk_size=chunk_size)
+        assert reader.find(key)
+        container = reader.peek()
+        members = reader.members(container)
+        assert (dict(members) if container == "{" else list(members)) == DOCUMENT[key]
+
+    assert not _JsonReader(io.StringIO(text), chunk_size=chunk_size).find("missing")
+
+
+def test_json_reader_rejects_truncated_documents():
+    reader = _JsonReader(io.StringIO('{"a": [1, 2'), chunk_size=4)
+    assert reader.find("a")
+    with pytest.raises(ValueError):
+        list(reader.members("["))
@@ -0,0 +1,101 @@
+import os
+import subprocess
+
+import pytest
+
+from git_utils.local_clone import LocalClone
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "Test", "GIT_AUTHOR_EMAIL": "test@example.com",
+    "GIT_COMMITTER_NAME": "Test", "GIT_COMMITTER_EMAIL": "test@example.com",
+    "GIT_CONFIG_GLOBAL": os.devnull, "GIT_CONFIG_NOSYSTEM": "1",
+}
+
+MIT_TEXT = "SPDX-License-Identifier: MIT\n"
+APACHE_TEXT = "SPDX-License-Identifier: Apache-2.0\n"
+
+
+def git(cwd, *args):
+    return subprocess.run(["git", "-C", str(cwd), *args], check=True, capture_output=True, text=True,
+                          env={**os.environ, **GIT_ENV}).stdout.strip()
+
+
+def commit_files(work, files, message):
+    for path, text in files.items():
+        (work / path).parent.mkdir(parents=True, exist_ok=True)
+        (work / path).write_text(text)
+    git(work, "add", "-A")
+    git(work, "commit", "-q", "-m", message)
+    return git(work, "rev-parse", "HEAD")
+
+
+@pytest.fixture
+def bare_repo(tmp_path):
+    """
+    Bare repository with a lightweight tag v1.0 (MIT LICENSE), an annotated tag v2.0 (Apache
+    LICENSE plus LICENSES/MIT.txt), an annotated tag v2.1 on a commit with the same LICENSE,
+    and an untagged commit that empties LICENSE.
+    """
+    work = tmp_path / "work"
+    work.mkdir()
+    git(work, "init", "-q")
+    commits = {}
+    commits["v1.0"] = commit_files(work, {"LICENSE": MIT_TEXT, "src/main.py": "print('v1')\n"}, "v1")
+    git(work, "tag", "v1.0")
+    commits["v2.0"] = commit_files(work, {"LICENSE": APACHE_TEXT, "LICENSES/MIT.txt": MIT_TEXT}, "v2")
+    git(work, "tag", "-a", "v2.0", "-m", "Release 2.0")
+    commits["v2.1"] = commit_files(work, {"src/main.py": "print('v2.1')\n"}, "v2.1")
+    git(work, "tag", "-a", "v2.1", "-m", "Release 2.1")
+    commits["unreleased"] = commit_files(work, {"LICENSE": ""}, "drop the license text")
+
+    bare = tmp_path / "repo.git"
+    git(tmp_path, "clone", "-q", "--bare", str(work), str(bare))
+    return str(bare), commits
+
+
+def test_get_tags_peels_annotated_tags(bare_repo):
+    path, commits = bare_repo
+    with LocalClone(path) as clone:
+        tags = clone.get_tags()
+
+    assert sorted(tags, key=lambda tag: tag["name"]) == [
+        {"name": "v1.0", "commit": {"sha": commits["v1.0"]}},
+        {"name": "v2.0", "commit": {"sha": commits["v2.0"]}},
+        {"name": "v2.1", "commit": {"sha": commits["v2.1"]}},
+    ]
+    # The annotated tag's own object is not the commit it names
+    assert git(path, "rev-parse", "v2.0") != commits["v2.0"]
+
+
+def test_get_license_for_tag(bare_repo):
+    path, commits = bare_repo
+    with LocalClone(path) as clone:
+        assert clone.get_license_for_tag("v1.0") == MIT_TEXT
+        # An annotated tag is peeled to its commit's tree
+        assert clone.get_license_for_tag("v2.0") == APACHE_TEXT
+        # A commit SHA works too, and the LICENSE blob shared with v2.0 is read once
+        assert clone.get_license_for_tag(commits["v2.1"]) == APACHE_TEXT
+        assert clone.stats["blob_hits"] == 1
+        assert clone.get_license_for_tag("v9.9") is None
+
+
+def test_get_licenses_at_tag_finds_license_directories(bare_repo):
+    path, commits = bare_repo
+    with LocalClone(path) as clone:
+        assert sorted(path for path, _ in clone.discover("v2.0")) == ["LICENSE", "LICENSES/MIT.txt"]
+        assert sorted(clone.get_licenses_at_tag("v2.0")) == ["Apache-2.0", "MIT"]
+        # An empty LICENSE is skipped
+        assert clone.get_licenses_at_tag(commits["unreleased"]) == ["MIT"]
+        assert clone.get_licenses_at_tag("v1.0") == ["MIT"]
+        assert clone.get_licenses_at_tag("v9.9") == ["No LICENSE file found at the specified tag."]
+
+
+def test_fetch_license_for_tag_reports_unreadable_blobs(bare_repo):
+    path, _ = bare_repo
+    blob = git(path, "rev-parse", "v1.0:LICENSE")
+    os.remove(os.path.join(path, "objects", blob[:2], blob[2:]))
+
+    with LocalClone(path) as clone:
+        assert clone.fetch_license_for_tag("v1.0") == (False, None)
+        assert clone.fetch_license_for_tag("v2.0") == (True, APACHE_TEXT)
+        assert clone.fetch_license_for_tag("v9.9") == (False, None)
@@ -0,0 +1,123 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+import manager
+from state_utils.resolution_store import ResolutionStore
+
+
+class StubRegistryHandler(BaseHTTPRequestHandler):
+    """
+    Local stand-in for a package registry that answers every GET after a short delay, recording
+    the most requests it had in flight at once. Paths containing "missing" get a 404.
+    """
+    protocol_version = "HTTP/1.1"
+    delay = 0.1
+    in_flight = 0
+    max_in_flight = 0
+    paths = []
+    lock = threading.Lock()
+
+    def do_GET(self):
+        handler = type(self)
+        with handler.lock:
+            handler.paths.append(self.path)
+            handler.in_flight += 1
+            handler.max_in_flight = max(handler.max_in_flight, handler.in_flight)
+        time.sleep(self.delay)
+        with handler.lock:
+            handler.in_flight -= 1
+
+        status = 404 if "missing" in self.path else 200
+        body = json.dumps({"license": "MIT", "repository": "https://github.com/example/demo"}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_handler():
+    return type("Handler", (StubRegistryHandler,), {"in_flight": 0, "max_in_flight": 0, "paths": [],
+                                                    "lock": threading.Lock()})
+
+
+@pytest.fixture
+def registries(serve, cache, monkeypatch):
+    """
+    Points the npm and NuGet registries at two stub hosts and turns off the local stores.
+    """
+    npm, nuget = make_handler(), make_handler()
+    monkeypatch.setattr(manager, "NPM_BASE_URL", serve(npm))
+    monkeypatch.setattr(manager, "NUGET_BASE_URL", serve(nuget))
+    monkeypatch.setattr(manager, "USE_LOCAL_STORES", False)
+    return npm, nuget
+
+
+def test_per_host_limit_caps_each_registry_separately(registries):
+    npm, nuget = registries
+    coordinates = [("npm", f"pkg-{i}", "1.0.0") for i in range(6)] + [("nuget", f"Pkg{i}", "1.0.0") for i in range(6)]
+
+    results = dict(manager.resolve_many(coordinates, max_workers=8, per_host_limit=2))
+
+    assert set(results) == set(coordinates)
+    assert all(isinstance(result, dict) for result in results.values())
+    assert npm.max_in_flight == nuget.max_in_flight == 2
+    assert len(npm.paths) == len(nuget.paths) == 6
+
+
+def test_a_failing_coordinate_only_fails_itself(registries):
+    npm, _ = registries
+    coordinates = [
+        ("npm", "left-pad", "1.3.0"),
+        ("maven", "not-a-maven-name", "1.0"),  # no "group:artifact" separator, so the lookup raises
+        ("npm", "missing", "1.0.0"),
+        ("npm", "right-pad", "1.0.0"),
+    ]
+
+    results = dict(manager.resolve_many(coordinates, max_workers=2, per_host_limit=1))
+
+    assert results[("maven", "not-a-maven-name", "1.0")].startswith(manager.RESOLVE_ERROR)
+    assert results[("npm", "missing", "1.0.0")] == "Package or version not found in NPM registry."
+    assert results[("npm", "left-pad", "1.3.0")]["license"] == "MIT"
+    assert results[("npm", "right-pad", "1.0.0")]["license"] == "MIT"
+    assert npm.max_in_flight == 1
+
+
+def test_per_host_limit_must_be_positive():
+    with pytest.raises(ValueError, match="per_host_limit"):
+        list(manager.resolve_many([("npm", "left-pad", "1.3.0")], per_host_limit=0))
+
+
+def test_not_found_answers_are_stored_with_the_negative_ttl(registries):
+    npm, _ = registries
+    coordinates = [("npm", "left-pad", "1.3.0"), ("npm", "missing", "1.0.0")]
+    store = ResolutionStore(":memory:")
+
+    first = dict(manager.resolve_incremental(coordinates, store=store))
+    second = dict(manager.resolve_incremental(coordinates, store=store))
+
+    assert second[("npm", "missing", "1.0.0")] == first[("npm", "missing", "1.0.0")] == \
+        "Package or version not found in NPM registry."
+    assert second[("npm", "left-pad", "1.3.0")]["license"] == "MIT"
+    assert len(npm.paths) == 2
+
+    # Past the negative TTL only the missing coordinate is asked again
+    store.negative_ttl = -1
+    dict(manager.resolve_incremental(coordinates, store=store))
+    assert npm.paths[2:] == ["/missing/1.0.0"]
+
+
+def test_errors_are_not_stored(registries):
+    store = ResolutionStore(":memory:")
+    coordinate = ("maven", "not-a-maven-name", "1.0")
+
+    dict(manager.resolve_incremental([coordinate], store=store))
+
+    assert store.get("manager", coordinate) is None
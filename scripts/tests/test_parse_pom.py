@@ -0,0 +1,97 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+
+import openai
+import pytest
+
+import parse_pom
+
+POM_WITH_BOTH = """<project xmlns="http://maven.apache.org/POM/4.0.0">
+  <groupId>org.example</groupId><artifactId>complete</artifactId><version>1.0</version>
+  <licenses><license><name>Apache-2.0</name></license></licenses>
+  <scm><url>https://github.com/example/complete</url></scm>
+</project>"""
+
+POM_WITHOUT_SCM = """<project xmlns="http://maven.apache.org/POM/4.0.0">
+  <groupId>org.example</groupId><artifactId>partial</artifactId><version>1.0</version>
+  <licenses><license><name>MIT</name></license></licenses>
+</project>"""
+
+
+class StubChatHandler(BaseHTTPRequestHandler):
+    """
+    Local stand-in for the OpenAI chat completions endpoint: records every prompt and answers
+    with a fixed JSON object after an optional delay.
+    """
+    protocol_version = "HTTP/1.1"
+    answer = {}
+    prompts = []
+    delay = 0
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        type(self).prompts.append(body["messages"][-1]["content"])
+        time.sleep(self.delay)
+        payload = json.dumps({
+            "id": "chatcmpl-stub", "object": "chat.completion", "model": body["model"],
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": json.dumps(self.answer)}}],
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def chat(serve, tmp_path, monkeypatch):
+    """
+    Points the OpenAI client at a stub chat endpoint with an empty model cache and fresh stats.
+    """
+    handler = type("Handler", (StubChatHandler,), {"answer": {"repository": "https://github.com/example/partial"},
+                                                   "prompts": [], "delay": 0})
+    monkeypatch.setattr(openai, "api_base", f"{serve(handler)}/v1")
+    monkeypatch.setattr(openai, "api_key", "test-key")
+    monkeypatch.setattr(parse_pom, "OPENAI_CACHE_PATH", str(tmp_path / "openai_cache"))
+    monkeypatch.setattr(parse_pom, "extraction_stats", dict.fromkeys(parse_pom.extraction_stats, 0))
+    return handler
+
+
+def test_declared_fields_skip_the_model(chat):
+    result = parse_pom.extract_repository_and_license(POM_WITH_BOTH, "pom.xml")
+
+    assert result == {"repository": "https://github.com/example/complete", "license": "Apache-2.0"}
+    assert chat.prompts == []
+    assert parse_pom.extraction_stats == {"deterministic": 1, "openai": 0, "openai_cached": 0}
+
+
+def test_model_is_asked_only_for_the_missing_field_once_per_content(chat):
+    first = parse_pom.extract_repository_and_license(POM_WITHOUT_SCM, "pom.xml")
+    second = parse_pom.extract_repository_and_license(POM_WITHOUT_SCM, "pom.xml")
+
+    # The license comes from the XML even though the model was asked
+    assert first == second == {"repository": "https://github.com/example/partial", "license": "MIT"}
+    assert len(chat.prompts) == 1
+    assert '"repository"' in chat.prompts[0] and '"license"' not in chat.prompts[0]
+    assert parse_pom.extraction_stats == {"deterministic": 0, "openai": 1, "openai_cached": 1}
+
+
+def test_concurrent_misses_share_one_model_call(chat):
+    chat.delay = 0.2
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(
+        parse_pom.parse_with_openai_cached(POM_WITHOUT_SCM, "pom.xml", ("repository",)))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(chat.prompts) == 1
+    assert len(set(results)) == 1 and len(results) == 4
+    assert parse_pom.extraction_stats["openai"] == 1 and parse_pom.extraction_stats["openai_cached"] == 3
@@ -0,0 +1,86 @@
+from xml.etree import ElementTree as ET
+
+import pytest
+
+from maven_utils.pom_parser import get_license_names, get_repository_url, parse_pom
+
+POM = """<?xml version="1.0" encoding="UTF-8"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0">
+  <modelVersion>4.0.0</modelVersion>
+  <parent>
+    <groupId>org.example</groupId>
+    <artifactId>example-parent</artifactId>
+    <version>7</version>
+    <relativePath>../pom.xml</relativePath>
+  </parent>
+  <artifactId>demo</artifactId>
+  <version>1.2.3</version>
+  <url>https://example.org/demo</url>
+  <developers>
+    <developer><url>https://example.org/~jane</url></developer>
+  </developers>
+  <licenses>
+    <license><name>Apache-2.0</name><url>https://www.apache.org/licenses/LICENSE-2.0</url></license>
+    <license><url>https://opensource.org/licenses/MIT</url></license>
+  </licenses>
+  <scm>
+    <url>https://github.com/example/demo</url>
+    <connection>scm:git:https://github.com/example/demo.git</connection>
+    <tag>demo-1.2.3</tag>
+  </scm>
+  <dependencies>
+    <dependency><groupId>org.other</groupId><artifactId>lib</artifactId><version>9</version></dependency>
+  </dependencies>
+</project>
+"""
+
+
+def test_header_fields_are_extracted():
+    record = parse_pom(POM.encode("utf-8"))
+
+    assert record == {
+        "group_id": None,
+        "artifact_id": "demo",
+        "version": "1.2.3",
+        "url": "https://example.org/demo",
+        "parent": {"group_id": "org.example", "artifact_id": "example-parent", "version": "7",
+                   "relative_path": "../pom.xml"},
+        "licenses": [{"name": "Apache-2.0", "url": "https://www.apache.org/licenses/LICENSE-2.0"},
+                     {"name": None, "url": "https://opensource.org/licenses/MIT"}],
+        "scm": {"url": "https://github.com/example/demo", "connection": "scm:git:https://github.com/example/demo.git",
+                "developer_connection": None, "tag": "demo-1.2.3"},
+    }
+    assert get_repository_url(record) == "https://github.com/example/demo"
+    assert get_license_names(record) == ["Apache-2.0", "https://opensource.org/licenses/MIT"]
+
+
+def test_nested_fields_do_not_leak_into_the_header():
+    # The url of a developer and the coordinates of a dependency belong to those sections only
+    pom = POM.replace("<url>https://example.org/demo</url>", "").replace("<scm>", "<scm-moved>").replace("</scm>", "</scm-moved>")
+    record = parse_pom(pom)
+
+    assert record["url"] is None and record["scm"] is None and record["group_id"] is None
+    assert get_repository_url(record) is None
+
+
+def test_declared_encoding_is_honored_for_bytes():
+    pom = """<?xml version="1.0" encoding="ISO-8859-1"?>
+<project><artifactId>café</artifactId><licenses><license><name>Licence étendue</name></license></licenses></project>"""
+
+    record = parse_pom(pom.encode("iso-8859-1"))
+
+    assert record["artifact_id"] == "café"
+    assert get_license_names(record) == ["Licence étendue"]
+
+
+def test_scan_stops_before_trailing_sections():
+    # Well past iterparse's read size, the document turns malformed; the scan never gets there
+    filler = "<dependency><artifactId>lib</artifactId></dependency>" * 2000
+    pom = POM.replace("</dependencies>\n</project>", f"{filler}<broken")
+
+    assert parse_pom(pom.encode("utf-8"))["scm"]["tag"] == "demo-1.2.3"
+
+
+def test_malformed_documents_raise():
+    with pytest.raises(ET.ParseError):
+        parse_pom(b"<project><licenses></project>")
@@ -0,0 +1,106 @@
+import json
+import re
+import time
+from http.server import BaseHTTPRequestHandler
+
+import manager
+from pypi_utils.project_index import ProjectIndex, get_project_index
+
+
+def info(version, license):
+    return {"version": version, "license": license, "project_urls": {"Source": "https://github.com/example/demo"},
+            "classifiers": [], "home_page": None}
+
+
+class StubPyPIHandler(BaseHTTPRequestHandler):
+    """
+    Local stand-in for the PyPI JSON API: serves /{name}/json and /{name}/{version}/json for one
+    project whose releases map to their license, uploaded in list order; the last release is the latest.
+    Every request path is recorded, and the project document can be answered slowly.
+    """
+    protocol_version = "HTTP/1.1"
+    releases = []
+    requests = []
+    project_delay = 0
+
+    def do_GET(self):
+        type(self).requests.append(self.path)
+        match = re.fullmatch(r"/demo(?:/([^/]+))?/json", self.path)
+        versions = dict(self.releases)
+        if match is None or (match.group(1) and match.group(1) not in versions):
+            return self._send(404, {"message": "Not Found"})
+        if match.group(1):
+            return self._send(200, {"info": info(match.group(1), versions[match.group(1)])})
+
+        time.sleep(self.project_delay)
+        latest = self.releases[-1][0]
+        self._send(200, {
+            "info": info(latest, versions[latest]),
+            "releases": {version: [{"upload_time_iso_8601": f"2020-01-{day:02d}T00:00:00Z"}]
+                         for day, (version, _) in enumerate(self.releases, 1)},
+        })
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_handler(releases, project_delay=0):
+    return type("Handler", (StubPyPIHandler,), {"releases": releases, "requests": [], "project_delay": project_delay})
+
+
+# The license changes to BSD-3-Clause in 1.1 and back to MIT in 1.2
+RELEASES = [("1.0", "MIT"), ("1.1", "BSD-3-Clause"), ("1.2", "MIT"), ("1.3", "MIT")]
+
+
+def test_reverted_change_is_only_inferred_without_verification(serve, cache):
+    index = ProjectIndex(serve(make_handler(RELEASES)))
+
+    # 1.0 and 1.3 share their metadata, so 1.1 is inferred from them
+    inferred = index.get_many("demo", ["1.0", "1.1"], verify=False)
+    assert inferred["1.0"]["license"] == "MIT" and "inferred" not in inferred["1.0"]
+    assert inferred["1.1"]["license"] == "MIT" and inferred["1.1"]["inferred"] is True
+    assert index.stats["inferred"] == 1
+
+    # A verified lookup falls back to the release's own document
+    verified = index.get("demo", "1.1")
+    assert verified["license"] == "BSD-3-Clause" and "inferred" not in verified
+    assert index.get("demo", "1.1", verify=False) == verified
+    assert index.stats["project_fetches"] == 1
+
+
+def test_verified_lookups_fetch_each_release(serve, cache):
+    handler = make_handler(RELEASES)
+    index = ProjectIndex(serve(handler))
+
+    results = index.get_many("demo", ["1.0", "1.1", "1.2", "1.3", "9.9"])
+
+    assert {version: metadata and metadata["license"] for version, metadata in results.items()} == {
+        "1.0": "MIT", "1.1": "BSD-3-Clause", "1.2": "MIT", "1.3": "MIT", "9.9": None,
+    }
+    # The latest release is answered by the project document
+    assert handler.requests == ["/demo/json", "/demo/1.0/json", "/demo/1.1/json", "/demo/1.2/json", "/demo/9.9/json"]
+
+
+def test_manager_batches_releases_of_one_project(serve, cache, monkeypatch):
+    handler = make_handler(RELEASES, project_delay=0.2)
+    monkeypatch.setattr(manager, "PYPI_BASE_URL", serve(handler))
+    monkeypatch.setattr(manager, "USE_LOCAL_STORES", False)
+    coordinates = [("pypi", "demo", version) for version in ("1.0", "1.1", "1.2")]
+
+    results = dict(manager.resolve_many(coordinates, per_host_limit=1))
+
+    assert {coordinate[2]: result["license"] for coordinate, result in results.items()} == {
+        "1.0": "MIT", "1.1": "BSD-3-Clause", "1.2": "MIT",
+    }
+    # The first lookup fetched the releases registered while the project document was loading
+    stats = get_project_index(manager.PYPI_BASE_URL).stats
+    assert stats["project_fetches"] == 1 and stats["version_fetches"] == 3
+    assert stats["batched"] == 2
@@ -0,0 +1,119 @@
+import json
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from git_utils import rate_limit
+from git_utils.rate_limit import TokenPool, retry_after_seconds
+
+
+class StubRateLimitedHandler(BaseHTTPRequestHandler):
+    """
+    Local stand-in for the GitHub REST API that keeps a core budget per token.
+
+    budgets maps each token to the calls it has left until `reset`, when they are replaced by
+    after_reset. A token without budget gets a 403 with X-RateLimit-Remaining: 0, or a 429 with
+    the class's retry_after header if that is set. Every request records the token it used.
+    """
+    protocol_version = "HTTP/1.1"
+    budgets = {}
+    after_reset = {}
+    reset = 0
+    retry_after = None
+    tokens = []
+
+    def do_GET(self):
+        handler = type(self)
+        if time.time() >= handler.reset:
+            handler.budgets, handler.reset = dict(handler.after_reset), time.time() + 3600
+        token = self.headers["Authorization"].partition(" ")[2]
+        handler.tokens.append(token)
+        remaining = handler.budgets.get(token, 0)
+        headers = {"X-RateLimit-Remaining": str(max(remaining - 1, 0)), "X-RateLimit-Reset": str(handler.reset),
+                   "X-RateLimit-Resource": "core"}
+        if remaining > 0:
+            handler.budgets[token] = remaining - 1
+            return self._send(200, {"token": token}, headers)
+        if handler.retry_after is not None:
+            return self._send(429, {"message": "secondary rate limit"}, {"Retry-After": handler.retry_after})
+        self._send(403, {"message": "API rate limit exceeded"}, headers)
+
+    def _send(self, status, payload, headers):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_handler(budgets, reset=None, after_reset=None, retry_after=None):
+    return type("Handler", (StubRateLimitedHandler,), {
+        "budgets": dict(budgets), "after_reset": after_reset or {}, "tokens": [],
+        "reset": reset or time.time() + 3600, "retry_after": retry_after,
+    })
+
+
+def test_retry_after_accepts_seconds_and_http_dates():
+    assert retry_after_seconds("120") == 120
+    assert 25 < retry_after_seconds(formatdate(time.time() + 30, usegmt=True)) <= 30
+    # A date in the past means "now"
+    assert retry_after_seconds("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert retry_after_seconds("soon") is None
+
+
+def test_unknown_budgets_rotate_then_the_fullest_token_is_chosen(serve):
+    handler = make_handler({"a": 10, "b": 50, "c": 5})
+    url = f"{serve(handler)}/repos/example/demo"
+    pool = TokenPool(["a", "b", "c"])
+
+    for _ in range(4):
+        assert pool.request(url).status_code == 200
+
+    # Tokens whose budget is unknown are spread over first, then the one with the most budget left wins
+    assert handler.tokens == ["a", "b", "c", "b"]
+
+
+def test_rate_limited_token_is_rotated_out(serve):
+    handler = make_handler({"a": 0, "b": 2})
+    url = f"{serve(handler)}/repos/example/demo"
+    pool = TokenPool(["a", "b"])
+
+    responses = [pool.request(url) for _ in range(2)]
+
+    assert [response.json()["token"] for response in responses] == ["b", "b"]
+    assert handler.tokens == ["a", "b", "b"]
+    assert pool.stats["rate_limited"] == 1 and pool.stats["sleeps"] == 0
+
+
+def test_http_date_retry_after_backs_off_the_token(serve):
+    handler = make_handler({"a": 0, "b": 5}, retry_after=formatdate(time.time() + 600, usegmt=True))
+    url = f"{serve(handler)}/repos/example/demo"
+    pool = TokenPool(["a", "b"])
+
+    assert pool.request(url).json()["token"] == "b"
+    assert handler.tokens == ["a", "b"]
+    # "a" is held back until the date given by Retry-After
+    assert pool._budgets[("a", "core")] == {"remaining": 0, "reset": pytest.approx(time.time() + 600, abs=5)}
+
+
+def test_exhausted_pool_sleeps_until_the_earliest_reset(serve, monkeypatch):
+    monkeypatch.setattr(rate_limit, "RESET_MARGIN", 0)
+    reset = time.time() + 1
+    handler = make_handler({"a": 0}, reset=reset, after_reset={"a": 10})
+    url = f"{serve(handler)}/repos/example/demo"
+    pool = TokenPool(["a"])
+
+    response = pool.request(url)
+
+    assert response.status_code == 200
+    assert handler.tokens == ["a", "a"]
+    assert pool.stats["sleeps"] == 1 and pool.stats["rate_limited"] == 1
+    assert time.time() == pytest.approx(reset, abs=0.5)
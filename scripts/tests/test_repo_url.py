@@ -0,0 +1,102 @@
+import json
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from git_utils import rate_limit, repo_url
+from git_utils.rate_limit import TokenPool
+from git_utils.repo_url import canonical_repo_url, get_repo_license, group_by_repo, parse_repo_url
+
+
+@pytest.mark.parametrize("url", [
+    "https://github.com/Example/Demo",
+    "https://www.github.com/example/demo.git",
+    "http://github.com/example/demo/tree/master/src",
+    "https://github.com/example/demo/blob/main/LICENSE#L3",
+    "https://github.com/example/demo#readme",
+    "git+https://github.com/example/demo.git",
+    "git://github.com/example/demo.git",
+    "git@github.com:example/demo.git",
+    "ssh://git@github.com/example/demo.git",
+    "git+ssh://git@github.com:example/demo.git",
+    "scm:git:https://github.com/example/demo.git",
+    "scm:git:git@github.com:example/demo.git",
+    "github:example/demo",
+    "example/demo",
+])
+def test_github_forms(url):
+    assert canonical_repo_url(url) == "https://github.com/example/demo"
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://gitlab.com/group/sub/demo", "https://gitlab.com/group/sub/demo"),
+    ("https://gitlab.com/group/sub/demo/-/tree/main", "https://gitlab.com/group/sub/demo"),
+    ("git@gitlab.com:group/sub/demo.git", "https://gitlab.com/group/sub/demo"),
+    ("gitlab:group/demo", "https://gitlab.com/group/demo"),
+    # Older GitLab URLs reach repository pages without "/-/"
+    ("https://gitlab.com/group/demo/tree/main", "https://gitlab.com/group/demo"),
+    ("https://gitlab.com/group/sub/demo/blob/main/LICENSE", "https://gitlab.com/group/sub/demo"),
+    ("https://gitlab.com/group/demo/merge_requests/12", "https://gitlab.com/group/demo"),
+    # A repository that is itself named like a page stays intact
+    ("https://gitlab.com/group/tree", "https://gitlab.com/group/tree"),
+    ("https://bitbucket.org/team/demo/src/main/", "https://bitbucket.org/team/demo"),
+    ("ssh://git@git.example.org:2222/team/demo.git", "https://git.example.org/team/demo"),
+])
+def test_other_hosts(url, expected):
+    assert canonical_repo_url(url) == expected
+
+
+@pytest.mark.parametrize("url", [
+    None, "", "scm:svn:https://svn.example.org/repo", "https://github.com/example",
+    "https://github.com/${project.owner}/demo", "not a url",
+])
+def test_unrecognised_values(url):
+    assert parse_repo_url(url) is None
+
+
+def test_group_by_repo():
+    groups = group_by_repo({
+        ("npm", "a", "1.0"): "git+https://github.com/example/demo.git",
+        ("maven", "org.example:a", "1.0"): "scm:git:git@github.com:example/demo.git",
+        ("pypi", "b", "2.0"): "https://example.org",
+    })
+
+    assert groups == {
+        ("github.com", "example", "demo"): [("npm", "a", "1.0"), ("maven", "org.example:a", "1.0")],
+        None: [("pypi", "b", "2.0")],
+    }
+
+
+class StubLicenseHandler(BaseHTTPRequestHandler):
+    """
+    Local stand-in for GitHub's /repos/{owner}/{repo}/license endpoint; only example/demo has a license.
+    """
+    protocol_version = "HTTP/1.1"
+    paths = []
+
+    def do_GET(self):
+        type(self).paths.append(self.path)
+        found = self.path == "/repos/example/demo/license"
+        body = json.dumps({"license": {"spdx_id": "MIT"}} if found else {"message": "Not Found"}).encode("utf-8")
+        self.send_response(200 if found else 404)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_repo_licenses_are_fetched_once_per_repository(serve, cache, monkeypatch):
+    handler = type("Handler", (StubLicenseHandler,), {"paths": []})
+    monkeypatch.setattr(repo_url, "GITHUB_API_URL", serve(handler))
+    monkeypatch.setattr(repo_url, "_repo_licenses", {})
+    monkeypatch.setattr(rate_limit, "_default_pool", TokenPool(["test"]))
+
+    for _ in range(2):
+        assert get_repo_license(("github.com", "example", "demo"))["license"]["spdx_id"] == "MIT"
+        assert get_repo_license(("github.com", "example", "gone")) is None
+    assert get_repo_license(("gitlab.com", "group", "demo")) is None
+
+    assert handler.paths == ["/repos/example/demo/license", "/repos/example/gone/license"]
@@ -0,0 +1,93 @@
+import json
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qs, urlsplit
+
+from git_utils import rate_limit, tag_index
+from git_utils.rate_limit import TokenPool
+from git_utils.tag_index import TagIndex, get_tag_index, semver_key
+
+
+def index_of(*names):
+    return TagIndex([{"name": name, "commit": {"sha": f"sha-{name}"}} for name in names])
+
+
+def test_versions_match_through_each_key():
+    index = index_of("v1.0", "r2_0_1", "release-3.1", "4.0.0", "5.2")
+
+    assert index.match("v1.0") == "v1.0"  # exact
+    assert index.match("r2.0.1") == "r2_0_1"  # separators removed
+    assert index.match("3.1") == "release-3.1"  # prefix removed
+    assert index.match("1.0") == "v1.0"
+    assert index.match("4") == "4.0.0"  # numeric, trailing zeros dropped
+    assert index.match("v5.2.0") == "5.2"
+    assert index.match("6.0") is None
+    assert semver_key("1.0-beta") is None
+
+
+def test_monorepo_tags_do_not_cross_match():
+    index = index_of("foo-1.2", "bar-1.2", "foo-1.3")
+
+    assert index.match("bar-1.2") == "bar-1.2"
+    assert index.match("bar_1_2") == "bar-1.2"
+    # bar has no 1.3 release, and a bare 1.2 could be either module
+    assert index.match("bar-1.3") is None
+    assert index.match("bar-1.3.0") is None
+    assert index.match("1.2") is None
+    # Only one module released 1.3
+    assert index.match("1.3") == "foo-1.3"
+
+
+def test_release_tags_win_over_module_tags():
+    index = index_of("mylib-parent-2.0", "v2.0")
+
+    assert index.match("2.0") == "v2.0"
+    assert index.match("2.0.0") == "v2.0"
+    assert index.match("mylib-parent-2.0.0") == "mylib-parent-2.0"
+
+
+def test_most_common_prefix():
+    assert index_of("v1.0", "v1.1", "r0.9", "docs").most_common_prefix() == "v"
+    assert index_of("docs", "latest").most_common_prefix() == ""
+
+
+class StubTagsHandler(BaseHTTPRequestHandler):
+    """
+    Local stand-in for GitHub's tags endpoint that pages through a list of tag names with a Link header.
+    """
+    protocol_version = "HTTP/1.1"
+    names = []
+    per_page = 2
+    paths = []
+
+    def do_GET(self):
+        type(self).paths.append(self.path)
+        page = int(parse_qs(urlsplit(self.path).query).get("page", ["1"])[0])
+        start = (page - 1) * self.per_page
+        body = json.dumps([{"name": name, "commit": {"sha": f"sha-{name}"}}
+                           for name in self.names[start:start + self.per_page]]).encode("utf-8")
+        self.send_response(200)
+        if start + self.per_page < len(self.names):
+            host = self.headers["Host"]
+            self.send_header("Link", f'<http://{host}{urlsplit(self.path).path}?page={page + 1}>; rel="next"')
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_tags_are_fetched_across_pages_once_per_repository(serve, cache, monkeypatch):
+    handler = type("Handler", (StubTagsHandler,), {"names": ["v1.0", "v1.1", "v2.0", "v2.1", "v3.0"], "paths": []})
+    monkeypatch.setattr(tag_index, "GITHUB_API_URL", serve(handler))
+    monkeypatch.setattr(rate_limit, "_default_pool", TokenPool())
+    monkeypatch.setattr(tag_index, "_indexes", {})
+    headers = {"Authorization": "token test"}
+
+    index = get_tag_index("Example", "Demo", headers)
+
+    assert index.tags == ["v1.0", "v1.1", "v2.0", "v2.1", "v3.0"]
+    assert index.commits["v3.0"] == "sha-v3.0"
+    assert get_tag_index("example", "demo", headers) is index
+    assert len(handler.paths) == 3
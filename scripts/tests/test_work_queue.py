@@ -0,0 +1,111 @@
+from types import SimpleNamespace
+
+import pytest
+
+from state_utils import work_queue
+from state_utils.work_queue import WorkQueue
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """
+    Replaces the queue's wall clock with one the test moves forward by hand.
+    """
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(work_queue, "time", SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+
+@pytest.fixture
+def queue(tmp_path, clock):
+    queue = WorkQueue(str(tmp_path / "queue.sqlite"), lease_seconds=60, max_attempts=3,
+                      retry_backoff=30, max_retry_backoff=100)
+    yield queue
+    queue.close()
+
+
+def test_items_are_leased_once_and_acked(queue):
+    assert queue.enqueue([("npm", "a", "1.0"), ("npm", "b", "2.0")]) == 2
+    assert queue.enqueue([("npm", "a", "1.0")]) == 0
+
+    leased = queue.lease("w1")
+    assert [coordinate for _, coordinate in leased] == [("npm", "a", "1.0"), ("npm", "b", "2.0")]
+    assert queue.lease("w2") == []
+
+    assert queue.ack("w1", [(item_id, {"license": "MIT"}) for item_id, _ in leased]) == 2
+    assert dict(queue.results()) == {("npm", "a", "1.0"): {"license": "MIT"}, ("npm", "b", "2.0"): {"license": "MIT"}}
+    assert queue.status()["done"] == 2
+
+
+def test_expired_leases_go_to_another_worker(queue, clock):
+    queue.enqueue([("npm", "a", "1.0")])
+    [(item_id, _)] = queue.lease("w1")
+
+    clock.now += 30
+    queue.extend("w1", [item_id])
+    clock.now += 40
+    assert queue.lease("w2") == []  # past the first expiry, but the extension moved it
+    clock.now += 21
+    assert queue.status()["expired"] == 1
+    assert queue.lease("w2") == [(item_id, ("npm", "a", "1.0"))]
+
+    # The first worker's late ack no longer counts
+    assert queue.ack("w1", [(item_id, "stale")]) == 0
+    assert queue.ack("w2", [(item_id, "fresh")]) == 1
+    assert dict(queue.results()) == {("npm", "a", "1.0"): "fresh"}
+
+
+def test_failed_items_are_retried_after_a_doubling_backoff(queue, clock):
+    queue.enqueue([("npm", "a", "1.0")])
+
+    # 30 s after the first attempt, 60 s after the second
+    for backoff in (30, 60):
+        [(item_id, _)] = queue.lease("w1")
+        queue.fail("w1", [item_id], "timeout")
+        assert queue.status()["delayed"] == 1
+        clock.now += backoff - 1
+        assert queue.lease("w1") == []
+        clock.now += 1
+
+    [(item_id, _)] = queue.lease("w1")
+    queue.fail("w1", [item_id], "timeout")
+    # The third attempt was the last one
+    status = queue.status()
+    assert (status["failed"], status["pending"], status["backlog"]) == (1, 0, 0)
+    assert dict(queue.results()) == {("npm", "a", "1.0"): {"error": "timeout"}}
+
+
+def test_backoff_is_capped(tmp_path, clock):
+    queue = WorkQueue(str(tmp_path / "queue.sqlite"), max_attempts=10, retry_backoff=30, max_retry_backoff=100)
+    queue.enqueue([("npm", "a", "1.0")])
+
+    for _ in range(3):
+        [(item_id, _)] = queue.lease("w1")
+        queue.fail("w1", [item_id], "timeout")
+        clock.now += 100  # 30, 60, then 120 capped to 100
+    assert len(queue.lease("w1")) == 1
+    queue.close()
+
+
+def test_expired_leases_fail_after_max_attempts(queue, clock):
+    queue.enqueue([("npm", "a", "1.0")])
+
+    for _ in range(3):
+        assert len(queue.lease("w1")) == 1
+        clock.now += 61  # the worker died
+
+    assert queue.lease("w2") == []
+    assert dict(queue.results()) == {("npm", "a", "1.0"): {"error": "lease expired"}}
+
+
+def test_status_reports_throughput_and_backlog(queue, clock):
+    queue.enqueue([("npm", name, "1.0") for name in "abcd"])
+    leased = queue.lease("w1", count=2)
+    queue.ack("w1", [(item_id, None) for item_id, _ in leased])
+
+    status = queue.status(window=10)
+
+    assert status["backlog"] == 2
+    assert status["workers"] == {"w1": 2}
+    assert status["throughput"] == 0.2
+    assert status["eta_seconds"] == 10